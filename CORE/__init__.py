@@ -6,7 +6,7 @@ Contains core service and business logic
 
 from CORE.report_service import ReportService
 from CORE.report_data import ReportDataProcessor
-from CORE.defect_analyzer import analyze_defects, calculate_resolution_days, prepare_defect_analysis_data, calculate_sla_metrics, get_defect_trends
+from CORE.defect_analyzer import analyze_defects, calculate_resolution_days, prepare_defect_analysis_data, prepare_defect_count_maps, calculate_sla_metrics, get_defect_trends
 from CORE.test_summary_prepare import prepare_test_summary_data, determine_risk_level, generate_risk_recommendation
 from CORE.defect_trend_prepare import prepare_defect_trend_analysis_data
 # Import new prepare functions
@@ -21,6 +21,7 @@ __all__ = [
     "ReportDataProcessor",
     "calculate_resolution_days",
     "prepare_defect_analysis_data",
+    "prepare_defect_count_maps",
     "calculate_sla_metrics",
     "get_defect_trends",
     "prepare_test_summary_data",
@@ -13,16 +13,38 @@ from datetime import datetime, timedelta
 from collections import defaultdict, Counter
 from typing import Dict, Any, List, Optional, Tuple, Union
 import logging
+import os
+import sys
+
+# เพิ่ม path เพื่อให้สามารถ import โมดูลอื่นๆ ได้
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from UTILS import parse_date
+from INFRASTRUCTURE.defect_table import DefectTable
+from INFRASTRUCTURE.defect_statistics import DefectStatistics
+from INFRASTRUCTURE.defect_top_index import DefectTopIndex
+from INFRASTRUCTURE.records import DEFECT_ALIASES, Defect, first_of
+from INFRASTRUCTURE.vocabulary import get_vocabulary
+from INFRASTRUCTURE.section_cache import SectionFallback
 
 # Setup logger
 logger = logging.getLogger("DefectAnalyzer")
 
-def analyze_defects(defects_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+# น้ำหนักความเสี่ยงของแต่ละ rank ความรุนแรง (rank อื่น = 0.5)
+SEVERITY_RISK_WEIGHTS = {1: 1.0, 2: 0.8, 3: 0.5, 4: 0.2, 5: 0.1}
+
+# รูปแบบวันที่ของ reported/closed date ที่ใช้คำนวณเวลาแก้ไข
+RESOLUTION_DATE_FORMATS = ("%Y-%m-%d",)
+
+Defects = Union[DefectTable, List[Dict[str, Any]]]
+# ฟังก์ชันที่ใช้เฉพาะจำนวน (ไม่ต้องการ defect รายตัว) รับสถิติรวมได้โดยตรง เช่นจาก DefectSnapshot
+DefectCounts = Union[DefectStatistics, DefectTable, List[Dict[str, Any]]]
+
+def analyze_defects(defects_data: Defects) -> Dict[str, Any]:
     """
     วิเคราะห์ข้อบกพร่อง (defects) ที่พบในระบบ เพื่อหาแนวทางแก้ไขและป้องกัน
 
     Args:
-        defects_data (List[Dict[str, Any]]): ข้อมูลข้อบกพร่องทั้งหมด
+        defects_data (Defects): ข้อมูลข้อบกพร่องทั้งหมด (DefectTable หรือ list)
 
     Returns:
         Dict[str, Any]: ผลการวิเคราะห์ข้อบกพร่อง ประกอบด้วย:
@@ -47,20 +69,24 @@ def analyze_defects(defects_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         }
 
     try:
+        # สร้างตาราง column และสถิติรวม (รอบเดียว) ครั้งเดียว แล้วใช้ร่วมกันทุกการวิเคราะห์
+        table = DefectTable.of(defects_data)
+        stats = DefectStatistics.of(table)
+
         # 1. หาข้อบกพร่องที่มีความสำคัญสูงสุด (priority/severity)
-        highest_priority_defects = _find_highest_priority_defects(defects_data)
+        highest_priority_defects = _find_highest_priority_defects(table)
 
         # 2. หาข้อบกพร่องที่เปิดค้างนานที่สุด
-        oldest_open_defects = _find_oldest_open_defects(defects_data)
+        oldest_open_defects = _find_oldest_open_defects(table)
 
         # 3. หาข้อบกพร่องที่ปิดล่าสุด
-        recently_closed_defects = _find_recently_closed_defects(defects_data)
+        recently_closed_defects = _find_recently_closed_defects(table)
 
         # 4. วิเคราะห์การกระจายของข้อบกพร่องตามโมดูล
-        module_distribution = _analyze_module_distribution(defects_data)
+        module_distribution = _analyze_module_distribution(stats)
 
         # 5. วิเคราะห์ความเร็วในการแก้ไขข้อบกพร่อง
-        defect_velocity = _calculate_defect_velocity(defects_data)
+        defect_velocity = _calculate_defect_velocity(stats)
 
         return {
             "highest_priority_defects": highest_priority_defects,
@@ -72,7 +98,7 @@ def analyze_defects(defects_data: List[Dict[str, Any]]) -> Dict[str, Any]:
 
     except Exception as e:
         logger.error(f"เกิดข้อผิดพลาดในการวิเคราะห์ข้อบกพร่อง: {str(e)}")
-        return {
+        return SectionFallback({
             "error": f"เกิดข้อผิดพลาดในการวิเคราะห์: {str(e)}",
             "highest_priority_defects": [],
             "oldest_open_defects": [],
@@ -83,7 +109,7 @@ def analyze_defects(defects_data: List[Dict[str, Any]]) -> Dict[str, Any]:
                 "weekly_velocity": [],
                 "trend": "UNKNOWN"
             }
-        }
+        })
 
 # ฟังก์ชันจาก defect_analysis.py
 def calculate_resolution_days(reported_date: str, closed_date: Optional[str], today: Optional[datetime] = None) -> Optional[int]:
@@ -100,24 +126,24 @@ def calculate_resolution_days(reported_date: str, closed_date: Optional[str], to
     """
     if not reported_date:
         return None
-    try:
-        reported = datetime.strptime(reported_date, "%Y-%m-%d")
-        if closed_date:
-            closed = datetime.strptime(closed_date, "%Y-%m-%d")
-        else:
-            closed = today or datetime.now()
-        days = (closed - reported).days
-        return days
-    except ValueError as e:
-        logger.warning(f"Failed to calculate resolution days: {e}, reported_date={reported_date}, closed_date={closed_date}")
+    # วันที่แต่ละค่าถูกแปลงเพียงครั้งเดียว (memoize ใน parse_date)
+    reported = parse_date(reported_date, RESOLUTION_DATE_FORMATS)
+    if closed_date:
+        closed = parse_date(closed_date, RESOLUTION_DATE_FORMATS)
+    else:
+        closed = today or datetime.now()
+    if reported is None or closed is None:
+        logger.warning(f"Failed to calculate resolution days: unrecognized date format, reported_date={reported_date}, closed_date={closed_date}")
         return None
+    days = (closed - reported).days
+    return days
 
-def prepare_defect_analysis_data(defects: List[Dict[str, Any]]) -> Dict[str, Any]:
+def prepare_defect_analysis_data(defects: DefectCounts) -> Dict[str, Any]:
     """
     Prepare defect analysis data for reporting
     
     Args:
-        defects (List[Dict[str, Any]]): List of defect dictionaries
+        defects (DefectCounts): DefectStatistics, DefectTable or list of defect dictionaries
         
     Returns:
         Dict[str, Any]: Analyzed defect data for reporting
@@ -132,31 +158,38 @@ def prepare_defect_analysis_data(defects: List[Dict[str, Any]]) -> Dict[str, Any
             "PEAK_DEFECT_DATE": "N/A"
         }
     
+    stats = DefectStatistics.of(defects)
+    
+    vocabulary = get_vocabulary()
+    
     # Count statistics
-    total_defects = len(defects)
-    open_defects = sum(1 for d in defects if d.get("status", "").lower() in ["open", "in progress"])
-    closed_defects = total_defects - open_defects
+    total_defects = len(stats)
+    open_defects = sum(count for defect, count in stats.group(["status"]) if vocabulary.is_open(defect.get("status")))
+    # status ที่ไม่อยู่ในคำศัพท์ไม่นับเป็นทั้งเปิดและปิด จึงนับปิดแยกแทนการลบออกจากทั้งหมด
+    closed_defects = sum(count for defect, count in stats.group(["status"]) if vocabulary.is_closed(defect.get("status")))
     closed_defect_rate = (closed_defects / total_defects) * 100 if total_defects > 0 else 0
     
-    # Calculate resolution times
-    resolution_times = []
-    for defect in defects:
-        if defect.get("status", "").lower() == "closed":
+    # Calculate resolution times (คำนวณครั้งเดียวต่อชุดวันที่ แล้วคูณด้วยจำนวน defect)
+    resolved_count = 0
+    resolution_total = 0
+    for defect, count in stats.group(["status", "reported_date", "closed_date"]):
+        if vocabulary.is_closed(defect.get("status")):
             days = calculate_resolution_days(
                 defect.get("reported_date"), 
                 defect.get("closed_date")
             )
             if days is not None:
-                resolution_times.append(days)
+                resolved_count += count
+                resolution_total += days * count
     
-    avg_resolution_days = sum(resolution_times) / len(resolution_times) if resolution_times else 0
+    avg_resolution_days = resolution_total / resolved_count if resolved_count else 0
     
     # Find reporting frequency by date
     date_counts = {}
-    for defect in defects:
+    for defect, count in stats.group(["reported_date"]):
         report_date = defect.get("reported_date")
         if report_date:
-            date_counts[report_date] = date_counts.get(report_date, 0) + 1
+            date_counts[report_date] = date_counts.get(report_date, 0) + count
     
     # Find peak date
     peak_date = "N/A"
@@ -177,12 +210,43 @@ def prepare_defect_analysis_data(defects: List[Dict[str, Any]]) -> Dict[str, Any
         "PEAK_DEFECT_DATE": peak_date
     }
 
-def calculate_sla_metrics(defects: List[Dict[str, Any]]) -> Dict[str, Any]:
+# field ที่ template นับจำนวนตามค่า -> ชื่อ count map ใน context ของรายงาน
+DEFECT_COUNT_FIELDS = {
+    "status": "DEFECT_STATUS_COUNTS",
+    "severity": "DEFECT_SEVERITY_COUNTS",
+    "module": "DEFECT_MODULE_COUNTS",
+    "page": "DEFECT_PAGE_COUNTS",
+}
+
+def prepare_defect_count_maps(defects: DefectCounts) -> Dict[str, Dict[Any, int]]:
+    """
+    Prepare exact-value count maps of the defect fields counted by the templates
+
+    template ใช้ ``DEFECT_STATUS_COUNTS|count_of('Fixed')`` แทน ``defects_data|selectattr(...)|list|length``
+    ค่าเป็นค่าดิบของ field (ไม่แปลงตัวพิมพ์) ตามลำดับที่พบครั้งแรก และ defect ที่ไม่มี field นั้นจะไม่ถูกนับ
+
+    Args:
+        defects (DefectCounts): DefectStatistics, DefectTable or list of defect dictionaries
+
+    Returns:
+        Dict[str, Dict[Any, int]]: ชื่อ count map -> {ค่า: จำนวน defect}
+    """
+    stats = DefectStatistics.of(defects)
+    count_maps = {}
+    for key, name in DEFECT_COUNT_FIELDS.items():
+        counts = {}
+        for defect, count in stats.group([key]):
+            if key in defect:
+                counts[defect[key]] = counts.get(defect[key], 0) + count
+        count_maps[name] = counts
+    return count_maps
+
+def calculate_sla_metrics(defects: DefectCounts) -> Dict[str, Any]:
     """
     Calculate SLA metrics for defects
     
     Args:
-        defects (List[Dict[str, Any]]): List of defect dictionaries
+        defects (DefectCounts): DefectStatistics, DefectTable or list of defect dictionaries
         
     Returns:
         Dict[str, Any]: SLA metrics
@@ -201,44 +265,45 @@ def calculate_sla_metrics(defects: List[Dict[str, Any]]) -> Dict[str, Any]:
             "severity_metrics": []
         }
     
-    closed_defects = [d for d in defects if d.get("status", "").lower() == "closed"]
-    total_closed = len(closed_defects)
+    stats = DefectStatistics.of(defects)
+    vocabulary = get_vocabulary()
+    closed_defects = [
+        (defect, count) for defect, count in stats.group(["status", "severity", "reported_date", "closed_date"])
+        if vocabulary.is_closed(defect.get("status"))
+    ]
+    total_closed = sum(count for _, count in closed_defects)
     
     within_sla_count = 0
     severity_metrics = []
     
-    # Group defects by severity
+    # Group defects by severity: [count, resolved count, total days, within SLA]
     severity_groups = {}
-    for defect in closed_defects:
+    for defect, count in closed_defects:
         severity = defect.get("severity", "unknown").lower()
-        if severity not in severity_groups:
-            severity_groups[severity] = []
-        severity_groups[severity].append(defect)
+        totals = severity_groups.setdefault(severity, [0, 0, 0, 0])
+        totals[0] += count
+        
+        days = calculate_resolution_days(
+            defect.get("reported_date"), 
+            defect.get("closed_date")
+        )
+        if days is not None:
+            totals[1] += count
+            totals[2] += days * count
+            if days <= sla_limits.get(severity, 7):
+                totals[3] += count
     
     # Calculate metrics for each severity
-    for severity, defect_list in severity_groups.items():
+    for severity, (group_size, resolved_count, total_days, within_sla) in severity_groups.items():
         sla_limit = sla_limits.get(severity, 7)  # Default to 7 days if severity not defined
+        within_sla_count += within_sla
         
-        within_sla = 0
-        resolution_times = []
-        
-        for defect in defect_list:
-            days = calculate_resolution_days(
-                defect.get("reported_date"), 
-                defect.get("closed_date")
-            )
-            if days is not None:
-                resolution_times.append(days)
-                if days <= sla_limit:
-                    within_sla += 1
-                    within_sla_count += 1
-        
-        avg_time = sum(resolution_times) / len(resolution_times) if resolution_times else 0
-        sla_rate = (within_sla / len(defect_list)) * 100 if defect_list else 0
+        avg_time = total_days / resolved_count if resolved_count else 0
+        sla_rate = (within_sla / group_size) * 100 if group_size else 0
         
         severity_metrics.append({
             "severity": severity.capitalize(),
-            "count": len(defect_list),
+            "count": group_size,
             "avg_resolution_days": round(avg_time, 1),
             "sla_limit_days": sla_limit,
             "within_sla_count": within_sla,
@@ -253,12 +318,12 @@ def calculate_sla_metrics(defects: List[Dict[str, Any]]) -> Dict[str, Any]:
         "severity_metrics": sorted(severity_metrics, key=lambda x: x["count"], reverse=True)
     }
 
-def get_defect_trends(defects: List[Dict[str, Any]], days: int = 30) -> Dict[str, Any]:
+def get_defect_trends(defects: DefectCounts, days: int = 30) -> Dict[str, Any]:
     """
     Get trend data for defects over a period
     
     Args:
-        defects (List[Dict[str, Any]]): List of defect dictionaries
+        defects (DefectCounts): DefectStatistics, DefectTable or list of defect dictionaries
         days (int, optional): Number of days to analyze. Defaults to 30.
         
     Returns:
@@ -286,14 +351,16 @@ def get_defect_trends(defects: List[Dict[str, Any]], days: int = 30) -> Dict[str
     closed_counts = {date: 0 for date in date_range}
     
     # Count opened and closed defects by date
-    for defect in defects:
+    stats = DefectStatistics.of(defects)
+    for defect, count in stats.group(["reported_date"]):
         reported_date = defect.get("reported_date")
         if reported_date in opened_counts:
-            opened_counts[reported_date] += 1
-        
+            opened_counts[reported_date] += count
+    
+    for defect, count in stats.group(["closed_date"]):
         closed_date = defect.get("closed_date")
         if closed_date and closed_date in closed_counts:
-            closed_counts[closed_date] += 1
+            closed_counts[closed_date] += count
     
     # Convert to lists for charting
     opened_values = [opened_counts[date] for date in date_range]
@@ -306,93 +373,69 @@ def get_defect_trends(defects: List[Dict[str, Any]], days: int = 30) -> Dict[str
     }
 
 # ฟังก์ชันจาก defect_analyzer.py (เดิม)
-def _find_highest_priority_defects(defects_data: List[Dict[str, Any]], limit: int = 10) -> List[Dict[str, Any]]:
+def _defect_priority(defect: Defect) -> Any:
+    """
+    ระดับความสำคัญของข้อบกพร่องสำหรับแสดงผลและคำนวณความเสี่ยง
+    
+    ใช้ severity แทนเมื่อไม่มี priority (ลำดับเดียวกับการเรียงใน _find_highest_priority_defects)
+    
+    Args:
+        defect (Defect): ข้อบกพร่อง
+        
+    Returns:
+        Any: priority, severity หรือ 'medium' ถ้าไม่มีทั้งสองค่า
+    """
+    priority = defect.priority if defect.priority is not None else defect.severity
+    return priority or 'medium'
+
+def _find_highest_priority_defects(table: DefectTable, limit: int = 10) -> List[Dict[str, Any]]:
     """
     หาข้อบกพร่องที่มีความสำคัญสูงสุด
     
     Args:
-        defects_data (List[Dict[str, Any]]): ข้อมูลข้อบกพร่องทั้งหมด
+        table (DefectTable): ตารางข้อบกพร่องทั้งหมด
         limit (int): จำนวนข้อบกพร่องที่ต้องการ
         
     Returns:
         List[Dict[str, Any]]: รายการข้อบกพร่องที่มีความสำคัญสูงสุด
     """
-    # สร้าง mapping สำหรับระดับความสำคัญ
-    priority_mapping = {
-        "critical": 1,
-        "high": 2,
-        "medium": 3,
-        "low": 4,
-        "trivial": 5,
-        "p1": 1,
-        "p2": 2,
-        "p3": 3,
-        "p4": 4,
-        "p5": 5,
-        "1": 1,
-        "2": 2,
-        "3": 3,
-        "4": 4,
-        "5": 5,
-        "blocker": 1,
-        "major": 2,
-        "normal": 3,
-        "minor": 4,
-        "trivial": 5
-    }
-    
-    # สถานะที่ถือว่ายังเปิดอยู่
-    open_statuses = [
-        "open", "in progress", "reopened", "new", 
-        "active", "verified", "in review", "to do",
-        "backlog"
-    ]
+    # ระดับความสำคัญและสถานะเปิดจากคำศัพท์กลาง (1 = สำคัญที่สุด, ค่าที่ไม่รู้จัก = medium)
+    vocabulary = get_vocabulary()
     
-    # คัดกรองเฉพาะข้อบกพร่องที่ยังเปิดอยู่
-    open_defects = [
-        defect for defect in defects_data 
-        if isinstance(defect, dict) and 
-        defect.get('status', '').lower() in open_statuses
-    ]
-    
-    # หากไม่มีข้อบกพร่องที่เปิดอยู่ ให้ใช้ทั้งหมด
-    if not open_defects:
-        open_defects = [defect for defect in defects_data if isinstance(defect, dict)]
+    def ranking():
+        # คัดกรองเฉพาะข้อบกพร่องที่ยังเปิดอยู่ (เก็บเป็นเลขแถว)
+        is_open = table.lookup('status', vocabulary.is_open, '')
+        open_defects = [row for row, code in enumerate(table.codes('status')) if is_open[code]]
         
-    # เรียงลำดับตามความสำคัญ
-    sorted_defects = sorted(
-        open_defects,
-        key=lambda x: priority_mapping.get(
-            str(x.get('priority', x.get('severity', 'medium'))).lower(), 
-            3  # ค่าเริ่มต้นคือ medium (3)
-        )
-    )
+        # หากไม่มีข้อบกพร่องที่เปิดอยู่ ให้ใช้ทั้งหมด
+        if not open_defects:
+            open_defects = range(len(table))
+        
+        # key ของการเรียงคือระดับความสำคัญ
+        priority_values = table.resolve(['priority', 'severity'], 'medium', vocabulary.severity_rank)
+        return open_defects, priority_values
+    
+    # เลือก limit แถวที่สำคัญที่สุดด้วย heap (ค่าที่เท่ากันเรียงตามลำดับในข้อมูล)
+    sorted_defects = DefectTopIndex.of(table).top("highest_priority", limit, ranking)
     
     # เพิ่มข้อมูลเพิ่มเติมที่จำเป็นสำหรับการวิเคราะห์
     result = []
-    for defect in sorted_defects[:limit]:
+    for row in sorted_defects:
+        defect = table.record(row)
         # ข้อมูลพื้นฐานที่ต้องมี
         defect_info = {
-            "id": defect.get('id', 'unknown'),
-            "summary": defect.get('summary', defect.get('title', 'Unknown')),
-            "priority": defect.get('priority', defect.get('severity', 'medium')),
-            "status": defect.get('status', 'unknown'),
-            "module": defect.get('module', defect.get('component', 'unknown')),
+            "id": defect.issue_id or 'unknown',
+            "summary": defect.summary or 'Unknown',
+            "priority": _defect_priority(defect),
+            "status": defect.status or 'unknown',
+            "module": defect.module or 'unknown',
         }
         
         # คำนวณอายุของข้อบกพร่อง
-        created_date_str = defect.get('created_date', defect.get('createdDate', ''))
+        created_date_str = defect.created_date
         if created_date_str:
             try:
-                date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
-                created_date = None
-                
-                for fmt in date_formats:
-                    try:
-                        created_date = datetime.strptime(created_date_str, fmt)
-                        break
-                    except ValueError:
-                        continue
+                created_date = parse_date(created_date_str)
                 
                 if created_date:
                     defect_age = (datetime.now() - created_date).days
@@ -401,10 +444,7 @@ def _find_highest_priority_defects(defects_data: List[Dict[str, Any]], limit: in
                 defect_info['age_days'] = 'unknown'
                 
         # เพิ่มเมตริกความเสี่ยง (ตามลำดับความสำคัญและอายุ)
-        priority_value = priority_mapping.get(
-            str(defect.get('priority', defect.get('severity', 'medium'))).lower(), 
-            3
-        )
+        priority_value = vocabulary.severity_rank(_defect_priority(defect))
         
         age_days = defect_info.get('age_days', 0)
         if isinstance(age_days, str):
@@ -424,223 +464,171 @@ def _find_highest_priority_defects(defects_data: List[Dict[str, Any]], limit: in
     # เรียงอีกครั้งตามคะแนนความเสี่ยง
     return sorted(result, key=lambda x: x.get('risk_score', 0), reverse=True)
 
-def _find_oldest_open_defects(defects_data: List[Dict[str, Any]], limit: int = 10) -> List[Dict[str, Any]]:
+def _find_oldest_open_defects(table: DefectTable, limit: int = 10) -> List[Dict[str, Any]]:
     """
     หาข้อบกพร่องที่เปิดค้างนานที่สุด
     
     Args:
-        defects_data (List[Dict[str, Any]]): ข้อมูลข้อบกพร่องทั้งหมด
+        table (DefectTable): ตารางข้อบกพร่องทั้งหมด
         limit (int): จำนวนข้อบกพร่องที่ต้องการ
         
     Returns:
         List[Dict[str, Any]]: รายการข้อบกพร่องที่เปิดค้างนานที่สุด
     """
-    # สถานะที่ถือว่ายังเปิดอยู่
-    open_statuses = [
-        "open", "in progress", "reopened", "new", 
-        "active", "verified", "in review", "to do",
-        "backlog"
-    ]
-    
-    # คัดกรองเฉพาะข้อบกพร่องที่ยังเปิดอยู่
-    open_defects = []
-    for defect in defects_data:
-        if isinstance(defect, dict) and defect.get('status', '').lower() in open_statuses:
-            created_date = None
-            created_date_str = defect.get('created_date', defect.get('createdDate', ''))
-            
-            if created_date_str:
-                date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
-                
-                for fmt in date_formats:
-                    try:
-                        created_date = datetime.strptime(created_date_str, fmt)
-                        break
-                    except ValueError:
-                        continue
-            
-            if created_date:
-                defect_with_age = defect.copy()
-                defect_with_age['created_date_obj'] = created_date
-                defect_with_age['age_days'] = (datetime.now() - created_date).days
-                open_defects.append(defect_with_age)
-    
-    # เรียงลำดับตามวันที่สร้าง (จากเก่าไปใหม่)
-    sorted_defects = sorted(
-        open_defects,
-        key=lambda x: x.get('created_date_obj', datetime.now()),
-    )
+    vocabulary = get_vocabulary()
+    
+    def ranking():
+        # คัดกรองเฉพาะข้อบกพร่องที่ยังเปิดอยู่และมีวันที่สร้าง (แปลงวันที่ครั้งเดียวต่อค่า)
+        is_open = table.lookup('status', vocabulary.is_open, '')
+        created_dates = table.dates(DEFECT_ALIASES['created_date'])
+        open_defects = [
+            row for row, code in enumerate(table.codes('status'))
+            if is_open[code] and created_dates[row]
+        ]
+        return open_defects, created_dates
+    
+    # เลือกตามวันที่สร้าง (จากเก่าไปใหม่) เฉพาะ limit แถวแรก
+    index = DefectTopIndex.of(table)
+    sorted_defects = index.top("oldest_open", limit, ranking)
     
     # สร้างผลลัพธ์
     result = []
-    for defect in sorted_defects[:limit]:
+    for row in sorted_defects:
+        defect = table.record(row)
         defect_info = {
-            "id": defect.get('id', 'unknown'),
-            "summary": defect.get('summary', defect.get('title', 'Unknown')),
-            "priority": defect.get('priority', defect.get('severity', 'medium')),
-            "status": defect.get('status', 'unknown'),
-            "module": defect.get('module', defect.get('component', 'unknown')),
-            "created_date": defect.get('created_date', defect.get('createdDate', 'unknown')),
-            "age_days": defect.get('age_days', 'unknown')
+            "id": defect.issue_id or 'unknown',
+            "summary": defect.summary or 'Unknown',
+            "priority": _defect_priority(defect),
+            "status": defect.status or 'unknown',
+            "module": defect.module or 'unknown',
+            "created_date": defect.created_date or 'unknown',
+            "age_days": (datetime.now() - index.key("oldest_open", row)).days
         }
         result.append(defect_info)
     
     return result
 
-def _find_recently_closed_defects(defects_data: List[Dict[str, Any]], limit: int = 10, days: int = 30) -> List[Dict[str, Any]]:
+def _find_recently_closed_defects(table: DefectTable, limit: int = 10, days: int = 30) -> List[Dict[str, Any]]:
     """
     หาข้อบกพร่องที่ปิดล่าสุด
     
     Args:
-        defects_data (List[Dict[str, Any]]): ข้อมูลข้อบกพร่องทั้งหมด
+        table (DefectTable): ตารางข้อบกพร่องทั้งหมด
         limit (int): จำนวนข้อบกพร่องที่ต้องการ
         days (int): จำนวนวันย้อนหลังที่ต้องการดู
         
     Returns:
         List[Dict[str, Any]]: รายการข้อบกพร่องที่ปิดล่าสุด
     """
-    # สถานะที่ถือว่าปิดแล้ว
-    closed_statuses = [
-        "closed", "fixed", "resolved", "completed", "done", 
-        "verified", "delivered", "released"
-    ]
-    
-    # คัดกรองเฉพาะข้อบกพร่องที่ปิดแล้ว
-    closed_defects = []
+    vocabulary = get_vocabulary()
     now = datetime.now()
     min_date = now - timedelta(days=days)
     
-    for defect in defects_data:
-        if isinstance(defect, dict) and defect.get('status', '').lower() in closed_statuses:
-            closed_date = None
-            closed_date_str = defect.get('closed_date', defect.get('closedDate', 
-                            defect.get('resolved_date', defect.get('resolvedDate', ''))))
-            
-            if not closed_date_str:
-                # ถ้าไม่มีวันที่ปิด แต่สถานะคือปิด ให้ใช้วันที่อัปเดตล่าสุด
-                closed_date_str = defect.get('updated_date', defect.get('updatedDate', ''))
-            
-            if closed_date_str:
-                date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
+    def ranking():
+        # คัดกรองเฉพาะข้อบกพร่องที่ปิดแล้วและมีวันที่ปิด (ไม่ขึ้นกับวันนี้ จึงใช้ซ้ำได้ทุกรอบ)
+        # แปลงวันที่ครั้งเดียวต่อค่า: (มีค่าวันที่หรือไม่, วันที่ที่แปลงได้)
+        parse = lambda date_str: (bool(date_str), parse_date(date_str))
+        is_closed = table.lookup('status', vocabulary.is_closed, '')
+        closed_dates = table.resolve(DEFECT_ALIASES['closed_date'], '', parse)
+        updated_dates = table.resolve(DEFECT_ALIASES['updated_date'], '', parse)
+        
+        closed_defects = []
+        effective_dates = [None] * len(table)
+        for row, code in enumerate(table.codes('status')):
+            if is_closed[code]:
+                has_date, closed_date = closed_dates[row]
                 
-                for fmt in date_formats:
-                    try:
-                        closed_date = datetime.strptime(closed_date_str, fmt)
-                        break
-                    except ValueError:
-                        continue
-            
-            if closed_date and closed_date >= min_date:
-                defect_with_close_date = defect.copy()
-                defect_with_close_date['closed_date_obj'] = closed_date
-                closed_defects.append(defect_with_close_date)
-    
-    # เรียงลำดับตามวันที่ปิด (จากใหม่ไปเก่า)
-    sorted_defects = sorted(
-        closed_defects,
-        key=lambda x: x.get('closed_date_obj', datetime.now()),
-        reverse=True
-    )
+                if not has_date:
+                    # ถ้าไม่มีวันที่ปิด แต่สถานะคือปิด ให้ใช้วันที่อัปเดตล่าสุด
+                    closed_date = updated_dates[row][1]
+                
+                if closed_date:
+                    closed_defects.append(row)
+                    effective_dates[row] = closed_date
+        return closed_defects, effective_dates
+    
+    # เรียงลำดับตามวันที่ปิด (จากใหม่ไปเก่า): defect ในช่วง days วันล่าสุดอยู่ส่วนหน้าของลำดับเสมอ
+    # จึงเลือก limit แถวแรกแล้วตัดที่เก่ากว่า min_date ออกได้โดยไม่ต้องเรียงทั้งหมด
+    index = DefectTopIndex.of(table)
+    sorted_defects = []
+    for row in index.top("recently_closed", limit, ranking, largest=True):
+        closed_date = index.key("recently_closed", row)
+        if closed_date >= min_date:
+            sorted_defects.append((row, closed_date))
     
     # สร้างผลลัพธ์
     result = []
-    for defect in sorted_defects[:limit]:
+    for row, closed_date in sorted_defects:
+        defect = table.record(row)
         defect_info = {
-            "id": defect.get('id', 'unknown'),
-            "summary": defect.get('summary', defect.get('title', 'Unknown')),
-            "priority": defect.get('priority', defect.get('severity', 'medium')),
-            "status": defect.get('status', 'unknown'),
-            "module": defect.get('module', defect.get('component', 'unknown')),
-            "closed_date": defect.get('closed_date', defect.get('closedDate', 
-                          defect.get('resolved_date', defect.get('resolvedDate', 'unknown')))),
-            "resolution": defect.get('resolution', 'fixed')
+            "id": defect.issue_id or 'unknown',
+            "summary": defect.summary or 'Unknown',
+            "priority": _defect_priority(defect),
+            "status": defect.status or 'unknown',
+            "module": defect.module or 'unknown',
+            "closed_date": defect.closed_date or 'unknown',
+            "resolution": defect.resolution or 'fixed'
         }
         
         # ถ้ามีข้อมูลวันที่สร้าง ให้คำนวณระยะเวลาในการแก้ไข
-        created_date_str = defect.get('created_date', defect.get('createdDate', ''))
+        created_date_str = defect.created_date
         if created_date_str:
-            created_date = None
-            date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
-            
-            for fmt in date_formats:
-                try:
-                    created_date = datetime.strptime(created_date_str, fmt)
-                    break
-                except ValueError:
-                    continue
+            created_date = parse_date(created_date_str)
             
-            if created_date and defect.get('closed_date_obj'):
-                resolution_days = (defect['closed_date_obj'] - created_date).days
+            if created_date and closed_date:
+                resolution_days = (closed_date - created_date).days
                 defect_info['resolution_days'] = max(0, resolution_days)
         
         result.append(defect_info)
     
     return result
 
-def _analyze_module_distribution(defects_data: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+def _analyze_module_distribution(stats: DefectStatistics) -> Dict[str, Dict[str, Any]]:
     """
     วิเคราะห์การกระจายของข้อบกพร่องตามโมดูล
     
     Args:
-        defects_data (List[Dict[str, Any]]): ข้อมูลข้อบกพร่องทั้งหมด
+        stats (DefectStatistics): สถิติข้อบกพร่องที่ใช้ร่วมกัน
         
     Returns:
         Dict[str, Dict[str, Any]]: ข้อมูลการกระจายของข้อบกพร่องตามโมดูล
     """
-    # จัดกลุ่มตามโมดูล
+    # จัดกลุ่มตามโมดูล (รองรับหลายรูปแบบของฟิลด์โมดูล) เก็บเป็น (defect บางส่วน, จำนวน)
     module_defects = defaultdict(list)
+    keys = ['module', 'component', 'area', 'status', 'priority', 'severity', *DEFECT_ALIASES['created_date']]
+    for defect, count in stats.group(keys):
+        module = defect.get('module', defect.get('component', defect.get('area', 'unknown')))
+        if not module:
+            module = 'unknown'
+        
+        module_defects[module].append((defect, count))
     
-    for defect in defects_data:
-        if isinstance(defect, dict):
-            # รองรับหลายรูปแบบของฟิลด์โมดูล
-            module = defect.get('module', defect.get('component', defect.get('area', 'unknown')))
-            if not module:
-                module = 'unknown'
-            
-            module_defects[module].append(defect)
-    
-    # สถานะที่ถือว่ายังเปิดอยู่
-    open_statuses = [
-        "open", "in progress", "reopened", "new", 
-        "active", "verified", "in review", "to do",
-        "backlog"
-    ]
+    vocabulary = get_vocabulary()
     
     # วิเคราะห์แต่ละโมดูล
     results = {}
     
     for module, defects in module_defects.items():
-        total = len(defects)
-        open_count = sum(1 for d in defects if d.get('status', '').lower() in open_statuses)
-        closed_count = total - open_count
+        total = sum(count for _, count in defects)
+        open_count = sum(count for d, count in defects if vocabulary.is_open(d.get('status')))
+        closed_count = sum(count for d, count in defects if vocabulary.is_closed(d.get('status')))
         
         # นับตามความรุนแรง
         severity_counts = Counter()
-        for defect in defects:
+        for defect, count in defects:
             severity = str(defect.get('priority', defect.get('severity', 'medium'))).lower()
-            severity_counts[severity] += 1
+            severity_counts[severity] += count
         
         # วิเคราะห์แนวโน้ม (จำนวนข้อบกพร่องในช่วง 3 เดือนล่าสุด)
         now = datetime.now()
         three_months_ago = now - timedelta(days=90)
         monthly_counts = [0, 0, 0]  # 3 เดือนล่าสุด
         
-        for defect in defects:
-            created_date_str = defect.get('created_date', defect.get('createdDate', ''))
-            if created_date_str:
-                created_date = None
-                date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
-                
-                for fmt in date_formats:
-                    try:
-                        created_date = datetime.strptime(created_date_str, fmt)
-                        break
-                    except ValueError:
-                        continue
-                
-                if created_date and created_date >= three_months_ago:
-                    month_index = min(2, (now.year - created_date.year) * 12 + (now.month - created_date.month))
-                    monthly_counts[month_index] += 1
+        for defect, count in defects:
+            created_date = parse_date(first_of(defect, DEFECT_ALIASES['created_date'], ''))
+            if created_date and created_date >= three_months_ago:
+                month_index = min(2, (now.year - created_date.year) * 12 + (now.month - created_date.month))
+                monthly_counts[month_index] += count
         
         # กำหนดแนวโน้ม
         if monthly_counts[0] > monthly_counts[1] > monthly_counts[2]:
@@ -704,31 +692,9 @@ def _calculate_module_risk_factor(total: int, open_count: int, severity_counts:
     
     # ปัจจัยจากความรุนแรง (ให้น้ำหนักกับข้อบกพร่องที่มีความรุนแรงสูง)
     severity_factor = 0
-    severity_mapping = {
-        "critical": 1.0,
-        "high": 0.8,
-        "medium": 0.5,
-        "low": 0.2,
-        "trivial": 0.1,
-        "p1": 1.0,
-        "p2": 0.8,
-        "p3": 0.5,
-        "p4": 0.2,
-        "p5": 0.1,
-        "1": 1.0,
-        "2": 0.8,
-        "3": 0.5,
-        "4": 0.2,
-        "5": 0.1,
-        "blocker": 1.0,
-        "major": 0.8,
-        "normal": 0.5,
-        "minor": 0.2,
-        "trivial": 0.1
-    }
-    
+    vocabulary = get_vocabulary()
     for severity, count in severity_counts.items():
-        weight = severity_mapping.get(severity.lower(), 0.5)
+        weight = SEVERITY_RISK_WEIGHTS.get(vocabulary.severity_rank(severity), 0.5)
         severity_factor += (count / total) * weight
     
     # รวมปัจจัยทั้งหมด (ให้น้ำหนักกับสัดส่วนที่เปิดอยู่มากกว่า)
@@ -736,88 +702,55 @@ def _calculate_module_risk_factor(total: int, open_count: int, severity_counts:
     
     return round(risk_factor, 2)
 
-def _calculate_defect_velocity(defects_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+def _calculate_defect_velocity(stats: DefectStatistics) -> Dict[str, Any]:
     """
     คำนวณความเร็วในการแก้ไขข้อบกพร่อง
     
     Args:
-        defects_data (List[Dict[str, Any]]): ข้อมูลข้อบกพร่องทั้งหมด
+        stats (DefectStatistics): สถิติข้อบกพร่องที่ใช้ร่วมกัน
         
     Returns:
         Dict[str, Any]: ข้อมูลความเร็วในการแก้ไขข้อบกพร่อง
     """
-    # สถานะที่ถือว่าปิดแล้ว
-    closed_statuses = [
-        "closed", "fixed", "resolved", "completed", "done", 
-        "verified", "delivered", "released"
-    ]
+    vocabulary = get_vocabulary()
     
-    # ข้อมูลสำหรับคำนวณเวลาเฉลี่ยในการแก้ไข
-    resolution_times = []
-    date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
+    # ข้อมูลสำหรับคำนวณเวลาเฉลี่ยในการแก้ไข (จำนวน, ผลรวมวัน)
+    resolved_count = 0
+    resolution_total = 0
     
     # ข้อมูลเปิด/ปิดรายสัปดาห์
     weekly_data = defaultdict(lambda: {"opened": 0, "closed": 0})
     now = datetime.now()
     
-    # วนลูปเพื่อวิเคราะห์ข้อบกพร่องแต่ละรายการ
-    for defect in defects_data:
-        if isinstance(defect, dict):
-            # คำนวณเวลาในการแก้ไข (เฉพาะที่ปิดแล้ว)
-            if defect.get('status', '').lower() in closed_statuses:
-                created_date_str = defect.get('created_date', defect.get('createdDate', ''))
-                closed_date_str = defect.get('closed_date', defect.get('closedDate', 
-                                    defect.get('resolved_date', defect.get('resolvedDate', ''))))
-                
-                if created_date_str and closed_date_str:
-                    created_date = None
-                    closed_date = None
-                    
-                    # พยายามแปลงวันที่สร้าง
-                    for fmt in date_formats:
-                        try:
-                            created_date = datetime.strptime(created_date_str, fmt)
-                            break
-                        except ValueError:
-                            continue
-                    
-                    # พยายามแปลงวันที่ปิด
-                    for fmt in date_formats:
-                        try:
-                            closed_date = datetime.strptime(closed_date_str, fmt)
-                            break
-                        except ValueError:
-                            continue
-                    
-                    # เพิ่มเวลาในการแก้ไข
-                    if created_date and closed_date:
-                        resolution_time = (closed_date - created_date).days
-                        if resolution_time >= 0:  # กันกรณีวันที่ผิดพลาด
-                            resolution_times.append(resolution_time)
-                            
-                            # บันทึกข้อมูลรายสัปดาห์ (ปิด)
-                            week_key = closed_date.strftime("%Y-W%U")
-                            weekly_data[week_key]["closed"] += 1
+    # วนลูปบนชุดค่าที่ไม่ซ้ำกัน (แต่ละชุดแทน defect จำนวน count รายการ)
+    keys = ['status', *DEFECT_ALIASES['created_date'], *DEFECT_ALIASES['closed_date']]
+    for defect, count in stats.group(keys):
+        created_date = parse_date(first_of(defect, DEFECT_ALIASES['created_date'], ''))
+        
+        # คำนวณเวลาในการแก้ไข (เฉพาะที่ปิดแล้ว)
+        if vocabulary.is_closed(defect.get('status')):
+            closed_date = parse_date(first_of(defect, DEFECT_ALIASES['closed_date'], ''))
             
-            # บันทึกข้อมูลรายสัปดาห์ (เปิด)
-            created_date_str = defect.get('created_date', defect.get('createdDate', ''))
-            if created_date_str:
-                created_date = None
-                for fmt in date_formats:
-                    try:
-                        created_date = datetime.strptime(created_date_str, fmt)
-                        break
-                    except ValueError:
-                        continue
-                
-                if created_date:
-                    week_key = created_date.strftime("%Y-W%U")
-                    weekly_data[week_key]["opened"] += 1
+            # เพิ่มเวลาในการแก้ไข
+            if created_date and closed_date:
+                resolution_time = (closed_date - created_date).days
+                if resolution_time >= 0:  # กันกรณีวันที่ผิดพลาด
+                    resolved_count += count
+                    resolution_total += resolution_time * count
+                    
+                    # บันทึกข้อมูลรายสัปดาห์ (ปิด)
+                    week_key = closed_date.strftime("%Y-W%U")
+                    weekly_data[week_key]["closed"] += count
+        
+        # บันทึกข้อมูลรายสัปดาห์ (เปิด)
+        if created_date:
+            week_key = created_date.strftime("%Y-W%U")
+            weekly_data[week_key]["opened"] += count
     
     # คำนวณเวลาเฉลี่ยในการแก้ไข
     avg_resolution_time = 0
-    if resolution_times:
-        avg_resolution_time = round(sum(resolution_times) / len(resolution_times), 1)
+    if resolved_count:
+        avg_resolution_time = round(resolution_total / resolved_count, 1)
     
     # แปลงข้อมูลรายสัปดาห์เป็นรายการและเรียงตามวันที่
     weekly_velocity = []
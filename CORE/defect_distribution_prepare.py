@@ -6,7 +6,7 @@ Author: Tassana Khrueawan
 Version: 1.0.0
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Union, Callable
 from collections import defaultdict
 from robot.api import logger
 import os
@@ -15,16 +15,36 @@ import sys
 # เพิ่ม path เพื่อให้สามารถ import โมดูลอื่นๆ ได้
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from UTILS import get_logger
+from INFRASTRUCTURE.defect_table import DefectTable
+from INFRASTRUCTURE.defect_statistics import DefectStatistics
 
 logger = get_logger("DefectDistributionPrepare")
 
-def prepare_defect_distribution_data(defects_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+def _count_by(stats: DefectStatistics, key: str, label: Callable[[Any], Any]) -> Dict[Any, int]:
+    """
+    นับจำนวน defect ตามค่าของ field จากสถิติรวม แล้วแปลงเป็น label ครั้งเดียวต่อค่า
+
+    Args:
+        stats (DefectStatistics): สถิติข้อบกพร่องที่ใช้ร่วมกัน
+        key (str): ชื่อ field
+        label (Callable[[Any], Any]): ฟังก์ชันแปลงค่าเป็น label (ค่าเริ่มต้นเมื่อไม่มี field คือ 'Unknown')
+
+    Returns:
+        Dict[Any, int]: จำนวนต่อ label ตามลำดับที่พบครั้งแรก
+    """
+    counts = defaultdict(int)
+    for defect, count in stats.group([key]):
+        counts[label(defect.get(key, 'Unknown'))] += count
+    return counts
+
+def prepare_defect_distribution_data(defects_data: Union[DefectTable, Iterable[Dict[str, Any]]]) -> Dict[str, Any]:
     """
     เตรียมข้อมูล Defect Distribution โดยเฉพาะ
     - วิเคราะห์การกระจายตัวของข้อบกพร่องตาม Severity, Status, Module, Page
+    - ดึงจากสถิติรวม (DefectStatistics) ของตาราง ส่วน list หรือ iterator (เช่น DefectDataLoader.iter_defects) จะถูกแปลงเป็นตารางในรอบเดียว
 
     Args:
-        defects_data (List[Dict[str, Any]]): ข้อมูลข้อบกพร่องทั้งหมด
+        defects_data (Union[DefectTable, Iterable[Dict[str, Any]]]): ข้อมูลข้อบกพร่องทั้งหมด
 
     Returns:
         Dict[str, Any]: ข้อมูล Defect Distribution สไตล์ block/summary/array
@@ -40,7 +60,10 @@ def prepare_defect_distribution_data(defects_data: List[Dict[str, Any]]) -> Dict
         "BY_PAGE": [{"PAGE": "Unknown", "COUNT": 1}]
     }
     
-    if not defects_data:
+    stats = DefectStatistics.of(defects_data)
+    total_defects = len(stats)
+    
+    if not total_defects:
         logger.warning("⚠️ ไม่มีข้อมูล defects สำหรับ Defect Distribution")
         logger.info("DEFECT_DISTRIBUTION_DATA: " + str(default_data))
         logger.info("✅ เตรียมข้อมูล Defect Distribution เรียบร้อยแล้ว (ข้อมูลว่าง)")
@@ -48,16 +71,10 @@ def prepare_defect_distribution_data(defects_data: List[Dict[str, Any]]) -> Dict
         return default_data
         
     # Collect
-    by_severity = defaultdict(int)
-    by_status = defaultdict(int)
-    by_module = defaultdict(int)
-    by_page = defaultdict(int)
-    
-    for defect in defects_data:
-        by_severity[defect.get('severity', 'Unknown').capitalize()] += 1
-        by_status[defect.get('status', 'Unknown').capitalize()] += 1
-        by_module[defect.get('module', 'Unknown')] += 1
-        by_page[defect.get('page', 'Unknown')] += 1
+    by_severity = _count_by(stats, 'severity', lambda value: value.capitalize())
+    by_status = _count_by(stats, 'status', lambda value: value.capitalize())
+    by_module = _count_by(stats, 'module', lambda value: value)
+    by_page = _count_by(stats, 'page', lambda value: value)
         
     # convert to array of dict
     arr_by_severity = [{"SEVERITY": k, "COUNT": v} for k, v in sorted(by_severity.items(), key=lambda x: x[1], reverse=True)]
@@ -91,7 +108,7 @@ def prepare_defect_distribution_data(defects_data: List[Dict[str, Any]]) -> Dict
         "BY_STATUS": arr_by_status,
         "BY_MODULE": arr_by_module,
         "BY_PAGE": arr_by_page,
-        "TOTAL_DEFECTS": len(defects_data),
+        "TOTAL_DEFECTS": total_defects,
         "MODULE_COUNT": len(arr_by_module),
         "PAGE_COUNT": len(arr_by_page)
     }
@@ -100,7 +117,7 @@ def prepare_defect_distribution_data(defects_data: List[Dict[str, Any]]) -> Dict
     
     # flat summary log
     logger.info("✅ สรุป Defect Distribution Data:")
-    logger.info(f"  TOTAL_DEFECTS: {len(defects_data)}")
+    logger.info(f"  TOTAL_DEFECTS: {total_defects}")
     logger.info(f"  MODULE_COUNT: {len(arr_by_module)}")
     logger.info(f"  PAGE_COUNT: {len(arr_by_page)}")
     logger.info("✅ เตรียมข้อมูล Defect Distribution เรียบร้อยแล้ว")
@@ -119,7 +136,7 @@ def prepare_defect_distribution_data(defects_data: List[Dict[str, Any]]) -> Dict
         "BY_STATUS": arr_by_status,
         "BY_MODULE": arr_by_module,
         "BY_PAGE": arr_by_page,
-        "TOTAL_DEFECTS": len(defects_data),
+        "TOTAL_DEFECTS": total_defects,
         "MODULE_COUNT": len(arr_by_module),
         "PAGE_COUNT": len(arr_by_page)
     }
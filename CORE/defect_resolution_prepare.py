@@ -7,8 +7,7 @@ Author: Tassana Khrueawan
 Version: 1.0.2 (Logging Style Update FIXED)
 """
 
-from typing import Dict, Any, List
-from collections import defaultdict
+from typing import Dict, Any, List, Union
 from datetime import datetime
 from robot.api import logger
 import os
@@ -17,17 +16,20 @@ import sys
 # เพิ่ม path เพื่อให้สามารถ import โมดูลอื่นๆ ได้
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from UTILS import get_logger
-from CORE.defect_analyzer import calculate_resolution_days # Import ฟังก์ชันคำนวณ
+from INFRASTRUCTURE.defect_table import DefectTable
+from INFRASTRUCTURE.defect_backend import get_backend
+from INFRASTRUCTURE.vocabulary import get_vocabulary
+from INFRASTRUCTURE.section_cache import SectionFallback
 
 logger = get_logger("DefectResolutionPrepare")
 
-def prepare_defect_resolution_time_data(defects_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+def prepare_defect_resolution_time_data(defects_data: Union[DefectTable, List[Dict[str, Any]]]) -> Dict[str, Any]:
     """
     เตรียมข้อมูล Defect Resolution Time โดยเฉพาะ
     - วิเคราะห์เวลาที่ใช้ในการแก้ไขข้อบกพร่องตาม Severity
 
     Args:
-        defects_data (List[Dict[str, Any]]): ข้อมูลข้อบกพร่องทั้งหมด
+        defects_data (Union[DefectTable, List[Dict[str, Any]]]): ข้อมูลข้อบกพร่องทั้งหมด (ตารางหรือ list)
 
     Returns:
         Dict[str, Any]: Dictionary ที่มีข้อมูล Defect Resolution Time
@@ -40,7 +42,8 @@ def prepare_defect_resolution_time_data(defects_data: List[Dict[str, Any]]) -> D
 
         logger.info("—— ผลรวม Defect Resolution Time Analysis ——")
 
-        if not defects_data:
+        table = DefectTable.of(defects_data)
+        if not table:
             logger.warning("⚠️ ไม่มีข้อมูล defects สำหรับ Defect Resolution Time")
             logger.info("✅ เตรียมข้อมูล Defect Resolution Time เรียบร้อยแล้ว (ข้อมูลว่าง)")
             return {
@@ -49,39 +52,48 @@ def prepare_defect_resolution_time_data(defects_data: List[Dict[str, Any]]) -> D
                 "details": []
             }
 
-        resolution_times_by_severity = defaultdict(list)
-        all_resolution_times = []
+        backend = get_backend()
         details = []
 
-        for defect in defects_data:
-            if defect.get('status', '').lower() in ['closed', 'fixed', 'resolved', 'completed', 'done']:
-                reported_date = defect.get('reportedDate', defect.get('created_date', ''))
-                closed_date = defect.get('closedDate', defect.get('closed_date', ''))
-                severity = str(defect.get('severity', 'Unknown')).capitalize()
-                key_sev = severity if severity in ICONS else 'Unknown'
-
-                if reported_date and closed_date:
-                    days = calculate_resolution_days(reported_date, closed_date)
-                    if days is not None:
-                        resolution_times_by_severity[key_sev].append(days)
-                        all_resolution_times.append(days)
-                        details.append({
-                            "id": defect.get("id", "-"),
-                            "title": defect.get("title", defect.get("summary", "")),
-                            "severity": key_sev,
-                            "status": defect.get("status", ""),
-                            "resolution_days": days,
-                        })
+        # คำนวณต่อค่า category ครั้งเดียว แล้วใช้รหัสของแต่ละแถวเลือกผลลัพธ์
+        is_closed = table.lookup('status', get_vocabulary().is_closed, '')
+        severity_ids = {}
+        group_of_code = [
+            severity_ids.setdefault(key_sev, len(severity_ids))
+            for key_sev in table.lookup(
+                'severity', lambda severity: str(severity).capitalize() if str(severity).capitalize() in ICONS else 'Unknown', 'Unknown'
+            )
+        ]
+        severity_keys = list(severity_ids)
+        severity_codes = table.codes('severity')
+
+        # เวลาแก้ไข = closed - reported (เฉพาะที่มีทั้งสองวันที่ในรูปแบบ YYYY-MM-DD)
+        closed_rows = backend.select(table.codes('status'), is_closed)
+        resolved_rows, all_resolution_times = backend.resolution_days(
+            closed_rows,
+            table.day_ordinals(['reportedDate', 'created_date']),
+            table.day_ordinals(['closedDate', 'closed_date'])
+        )
+
+        for row, days in zip(resolved_rows, all_resolution_times):
+            details.append({
+                "id": table.get(row, "id", "-"),
+                "title": table.get(row, "title", table.get(row, "summary", "")),
+                "severity": severity_keys[group_of_code[severity_codes[row]]],
+                "status": table.get(row, "status", ""),
+                "resolution_days": days,
+            })
 
         avg_resolution_by_severity = {}
-        for severity, times in resolution_times_by_severity.items():
-            if times:
-                avg_resolution_by_severity[severity] = round(float(sum(times)) / len(times), 2)
+        totals = backend.group_totals(severity_codes, group_of_code, resolved_rows, all_resolution_times)
+        for group, (count, total_days, _) in totals.items():
+            if count:
+                avg_resolution_by_severity[severity_keys[group]] = round(float(total_days) / count, 2)
 
         avg_resolution_overall = round(float(sum(all_resolution_times)) / len(all_resolution_times), 2) if all_resolution_times else 0
 
         total_closed = len(all_resolution_times)
-        total_defects = len(defects_data)
+        total_defects = len(table)
         closed_percent = (float(total_closed) / total_defects) * 100 if total_defects else 0.0
 
         logger.info("รวม {} | ✅ ปิดแล้ว {} ({:.1f}%) | ⏱️ เฉลี่ยการแก้ไข: {:.2f} วัน".format(
@@ -118,8 +130,9 @@ def prepare_defect_resolution_time_data(defects_data: List[Dict[str, Any]]) -> D
         }
     except Exception as e:
         logger.error("❌ เกิดข้อผิดพลาดในการเตรียม Defect Resolution Time Data: {}".format(str(e)))
-        return {
+        # ค่าแทนเมื่อเกิดข้อผิดพลาด ไม่ถูกเก็บใน section cache
+        return SectionFallback({
             "resolution_time_by_severity": {},
             "average_resolution_time_overall": 0,
             "details": []
-        }
+        })
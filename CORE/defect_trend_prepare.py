@@ -10,29 +10,33 @@ from robot.api import logger
 from datetime import datetime, timedelta
 import os
 import sys
-import json
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 from collections import defaultdict, Counter
 
 # เพิ่ม path เพื่อให้สามารถ import โมดูลอื่นๆ ได้
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from UTILS import get_logger
+from UTILS import get_logger, parse_date, chart_payload
+from INFRASTRUCTURE import DefectDataLoader, DefectTable, DefectStatistics
+from INFRASTRUCTURE.vocabulary import get_vocabulary
+from INFRASTRUCTURE.section_cache import SectionFallback
 from CORE.defect_analyzer import analyze_defects, prepare_defect_analysis_data, calculate_sla_metrics, get_defect_trends
 
 # Setup logger
 logger = get_logger("DefectTrendPrepare")
 
-def prepare_defect_trend_analysis_data(defects_data: Any = None, defects_file: str = None) -> Dict[str, Any]:
+def prepare_defect_trend_analysis_data(defects_data: Any = None, defects_file: str = None, chart_delta: bool = False) -> Dict[str, Any]:
     """
     เตรียมข้อมูล Defect Trend Analysis โดยรองรับ input ทั้ง
     - list ของ defects
     - dict ที่มีคีย์ 'defects'
     - path ไปยังไฟล์ JSON ที่เก็บข้อมูล Defects
+    - DefectTable (สถิติรวมของตารางถูกสร้างรอบเดียวและใช้ร่วมกับ prepare อื่น)
     
     Args:
-        defects_data (Any, optional): ข้อมูล defects ที่โหลดมาแล้ว (list หรือ dict ที่มีคีย์ 'defects')
+        defects_data (Any, optional): ข้อมูล defects ที่โหลดมาแล้ว (DefectTable, list หรือ dict ที่มีคีย์ 'defects')
         defects_file (str, optional): Path ไปยังไฟล์ JSON ที่เก็บข้อมูล Defects
+        chart_delta (bool, optional): เก็บ series ของกราฟแบบผลต่างจากค่าก่อนหน้า (ดู UTILS.chart_payload)
 
     Returns:
         Dict[str, Any]: Dictionary ที่มีข้อมูล Defect Trend Analysis พร้อมสำหรับใช้ใน Template
@@ -43,50 +47,21 @@ def prepare_defect_trend_analysis_data(defects_data: Any = None, defects_file: s
             defects_data = defects_data.get("defects", [])
         elif isinstance(defects_data, str) and os.path.exists(defects_data):
             # กรณีส่ง path มาแทน defects_file
-            with open(defects_data, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, dict) and "defects" in data:
-                    defects_data = data["defects"]
-                elif isinstance(data, list):
-                    defects_data = data
-                else:
-                    defects_data = []
+            defects_data = DefectDataLoader().load(defects_data)
+            if defects_data is None:
+                logger.error("❌ ไม่สามารถโหลดข้อมูล defects")
+                return {}
         elif not defects_data and defects_file:
             if not os.path.exists(defects_file):
                 logger.error(f"❌ ไม่พบไฟล์ defects data: {defects_file}")
                 return {}
-                
-            try:
-                with open(defects_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # รองรับหลากหลายรูปแบบข้อมูล
-                if isinstance(data, list):
-                    defects_data = data
-                elif isinstance(data, dict):
-                    if "defects" in data and isinstance(data["defects"], list):
-                        defects_data = data["defects"]
-                    else:
-                        # หาคีย์แรกที่เป็น list
-                        for key, value in data.items():
-                            if isinstance(value, list) and value:
-                                defects_data = value
-                                break
-                        
-                        if not defects_data:
-                            # แปลง dict เป็น list of dict items
-                            defects_data = []
-                            for key, value in data.items():
-                                if isinstance(value, dict):
-                                    value['id'] = key
-                                    defects_data.append(value)
-                                else:
-                                    defects_data.append({'id': key, 'data': value})
-                
-                logger.info(f"⏳ โหลดข้อมูล defects จาก: {defects_file} (จำนวน {len(defects_data)} รายการ)")
-            except Exception as e:
-                logger.error(f"❌ ไม่สามารถโหลดข้อมูล defects: {str(e)}")
+            
+            # โหลดผ่าน DefectDataLoader (dataset cache) ซึ่งรองรับหลากหลายรูปแบบข้อมูล
+            defects_data = DefectDataLoader().load(defects_file)
+            if defects_data is None:
+                logger.error(f"❌ ไม่สามารถโหลดข้อมูล defects: {defects_file}")
                 return {}
+            logger.info(f"⏳ โหลดข้อมูล defects จาก: {defects_file} (จำนวน {len(defects_data)} รายการ)")
         
         if not defects_data:
             logger.warning("⚠️ ไม่มีข้อมูล defects สำหรับการเตรียม Defect Trend Analysis")
@@ -95,46 +70,49 @@ def prepare_defect_trend_analysis_data(defects_data: Any = None, defects_file: s
         # 2. เตรียมข้อมูล Defect Trend Analysis
         logger.info(f"⏳ เริ่มเตรียมข้อมูลแนวโน้มข้อบกพร่อง... (จำนวน {len(defects_data)} รายการ)")
         
+        # สร้างตารางและสถิติรวมครั้งเดียว (อ่านทุก defect รอบเดียว) แล้วทุกส่วนดึงจากผลลัพธ์เดียวกัน
+        table = DefectTable.of(defects_data)
+        stats = DefectStatistics.of(table)
+        
         # นับจำนวนตามสถานะจริงในข้อมูล
         status_counter = Counter()
         statuses_original = set()
-        for defect in defects_data:
+        for defect, count in stats.group(["status"]):
             status = (defect.get("status", "") or "").strip()
             statuses_original.add(status)
             display_status = status  # ใช้ค่าตามที่มีในข้อมูลจริง
-            status_counter[display_status] += 1
+            status_counter[display_status] += count
         
         # คำนวณเมตริกจากข้อมูล defects (ไม่จำเป็นต้องมี test metrics สำหรับวิเคราะห์ trend)
-        defect_metrics = calculate_defect_metrics(defects_data, 0)
+        defect_metrics = calculate_defect_metrics(table, 0)
         
         # วิเคราะห์ข้อมูล defects เชิงลึก
-        defect_analysis = analyze_defects(defects_data)
+        defect_analysis = analyze_defects(table)
         
         # ข้อมูล defect trend
-        defect_trend_data = get_defect_trends(defects_data, days=56)  # 8 สัปดาห์ = 56 วัน
+        defect_trend_data = get_defect_trends(table, days=56)  # 8 สัปดาห์ = 56 วัน
         
-        # สถานะที่ถือว่ายังเปิดอยู่
-        open_statuses = ['open', 'in progress', 'reopened', 'new', 'ready to test', 'implementation complete']
-        closed_statuses = ['closed', 'fixed', 'resolved', 'completed', 'done']
+        # สถานะเปิด/ปิดจากคำศัพท์กลาง (แปลงค่าดิบแต่ละค่าครั้งเดียว)
+        vocabulary = get_vocabulary()
         
-        # นับจำนวนข้อบกพร่องที่ยังเปิดอยู่และปิดแล้ว
-        total_defects = len(defects_data)
+        # นับจำนวนข้อบกพร่องที่ยังเปิดอยู่และปิดแล้วตามสถานะ (กติกาเดียวกับ calculate_defect_metrics และตัวนับ open อื่นในส่วนนี้)
+        total_defects = len(stats)
         total_defects_open = 0
         total_defects_closed = 0
         
-        for defect in defects_data:
-            status = (defect.get('status', '') or '').strip().lower()
-            if status in closed_statuses or defect.get('closedDate'):
-                total_defects_closed += 1
-            else:
-                total_defects_open += 1
+        for defect, count in stats.group(['status']):
+            if vocabulary.is_closed(defect.get('status')):
+                total_defects_closed += count
+            elif vocabulary.is_open(defect.get('status')):
+                total_defects_open += count
         
         # วันที่พบข้อบกพร่องมากที่สุด
+        created_groups = stats.group(['createDate', 'created_date', 'reportedDate'])
         defect_by_date = {}
-        for defect in defects_data:
+        for defect, count in created_groups:
             create_date = defect.get('createDate', defect.get('created_date', defect.get('reportedDate', '')))
             if create_date:
-                defect_by_date[create_date] = defect_by_date.get(create_date, 0) + 1
+                defect_by_date[create_date] = defect_by_date.get(create_date, 0) + count
         
         peak_defect_date = max(defect_by_date.items(), key=lambda x: x[1], default=('N/A', 0))
         
@@ -143,12 +121,12 @@ def prepare_defect_trend_analysis_data(defects_data: Any = None, defects_file: s
         
         # จำนวนข้อบกพร่องตามความรุนแรง
         severity_counts = defaultdict(int)
-        for defect in defects_data:
+        for defect, count in stats.group(['severity']):
             severity = defect.get('severity', 'Unknown')
-            severity_counts[severity] += 1
+            severity_counts[severity] += count
         
         # จำนวนข้อบกพร่องที่ยังเปิดอยู่ตามความรุนแรง
-        critical_open_count = sum(1 for d in defects_data if d.get('severity', '').lower() in ['critical', 'p1', '1'] and d.get('status', '').lower() in open_statuses)
+        critical_open_count = sum(count for d, count in stats.group(['severity', 'status']) if vocabulary.is_critical(d.get('severity')) and vocabulary.is_open(d.get('status')))
         
         # สัดส่วนข้อบกพร่องที่ยังเปิดอยู่
         open_defect_ratio = (total_defects_open / total_defects) * 100 if total_defects > 0 else 0
@@ -156,30 +134,24 @@ def prepare_defect_trend_analysis_data(defects_data: Any = None, defects_file: s
         # สัดส่วนข้อบกพร่องวิกฤตที่ยังเปิดอยู่
         critical_open_ratio = (critical_open_count / total_defects_open) * 100 if total_defects_open > 0 else 0
         
-        # อายุเฉลี่ยของข้อบกพร่องที่ยังเปิดอยู่
-        open_defect_ages = []
-        for defect in defects_data:
-            if defect.get('status', '').lower() in open_statuses:
+        # อายุเฉลี่ยของข้อบกพร่องที่ยังเปิดอยู่ (จำนวน, ผลรวมอายุ)
+        open_defect_count = 0
+        open_defect_age_total = 0
+        for defect, count in stats.group(['status', 'createDate', 'created_date', 'reportedDate']):
+            if vocabulary.is_open(defect.get('status')):
                 create_date = defect.get('createDate', defect.get('created_date', defect.get('reportedDate', '')))
                 if create_date:
                     try:
-                        date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
-                        create_date_obj = None
+                        create_date_obj = parse_date(create_date)
                         
-                        for fmt in date_formats:
-                            try:
-                                create_date_obj = datetime.strptime(create_date, fmt)
-                                break
-                            except ValueError:
-                                continue
-                                
                         if create_date_obj:
                             age_days = (datetime.now() - create_date_obj).days
-                            open_defect_ages.append(age_days)
+                            open_defect_count += count
+                            open_defect_age_total += age_days * count
                     except ValueError:
                         pass
         
-        avg_open_defect_age = sum(open_defect_ages) / len(open_defect_ages) if open_defect_ages else 0
+        avg_open_defect_age = open_defect_age_total / open_defect_count if open_defect_count else 0
         avg_open_age_ratio = min(100, (avg_open_defect_age / 30) * 100) if avg_open_defect_age > 0 else 0  # เทียบกับ 30 วัน
         
         # อัตราการปิดข้อบกพร่อง
@@ -190,19 +162,21 @@ def prepare_defect_trend_analysis_data(defects_data: Any = None, defects_file: s
         module_defect_counts = defaultdict(int)
         module_open_defect_counts = defaultdict(int)
         
-        for defect in defects_data:
+        for defect, count in stats.group(['module', 'status']):
             module = defect.get('module', 'Unknown')
-            module_defect_counts[module] += 1
-            if defect.get('status', '').lower() in open_statuses:
-                module_open_defect_counts[module] += 1
+            module_defect_counts[module] += count
+            if vocabulary.is_open(defect.get('status')):
+                module_open_defect_counts[module] += count
         
         # โมดูลที่มีข้อบกพร่องเปิดมากที่สุด
         module_with_most_open_defects = max(module_open_defect_counts.items(), key=lambda x: x[1], default=('N/A', 0))
         
-        # แปลงข้อมูล trend เป็น JSON string สำหรับ JavaScript
-        defect_trend_labels = json.dumps(defect_trend_data.get('labels', []))
-        defect_trend_opened = json.dumps(defect_trend_data.get('opened', []))
-        defect_trend_closed = json.dumps(defect_trend_data.get('closed', []))
+        # ข้อมูลกราฟแบบ columnar สำหรับ JavaScript (serialize ครั้งเดียวตอน render)
+        defect_trend_chart = chart_payload(
+            defect_trend_data.get('labels', []),
+            {"opened": defect_trend_data.get('opened', []), "closed": defect_trend_data.get('closed', [])},
+            delta=chart_delta
+        )
         
         # สร้าง combined structure สำหรับ log
         defect_trend_labels_list = defect_trend_data.get('labels', [])
@@ -217,56 +191,43 @@ def prepare_defect_trend_analysis_data(defects_data: Any = None, defects_file: s
             for i, d in enumerate(defect_trend_labels_list)
         ]
 
-        # ตรวจสอบความรุนแรงที่ใช้เวลาแก้ไขเฉลี่ยมากที่สุด
-        severity_resolution_times = defaultdict(list)
-        for defect in defects_data:
-            if defect.get('status', '').lower() in ['closed', 'fixed', 'resolved', 'completed', 'done']:
+        # ตรวจสอบความรุนแรงที่ใช้เวลาแก้ไขเฉลี่ยมากที่สุด (จำนวน, ผลรวมวัน ต่อความรุนแรง)
+        severity_resolution_times = defaultdict(lambda: [0, 0])
+        keys = ['status', 'severity', 'createDate', 'created_date', 'reportedDate', 'closedDate', 'closed_date']
+        for defect, count in stats.group(keys):
+            if vocabulary.is_closed(defect.get('status')):
                 severity = defect.get('severity', 'Unknown')
                 create_date = defect.get('createDate', defect.get('created_date', defect.get('reportedDate', '')))
                 close_date = defect.get('closedDate', defect.get('closed_date', ''))
                 
                 if create_date and close_date:
                     try:
-                        date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
-                        create_date_obj = None
-                        close_date_obj = None
-                        
-                        for fmt in date_formats:
-                            try:
-                                create_date_obj = datetime.strptime(create_date, fmt)
-                                break
-                            except ValueError:
-                                continue
-                                
-                        for fmt in date_formats:
-                            try:
-                                close_date_obj = datetime.strptime(close_date, fmt)
-                                break
-                            except ValueError:
-                                continue
+                        create_date_obj = parse_date(create_date)
+                        close_date_obj = parse_date(close_date)
                         
                         if create_date_obj and close_date_obj:
                             resolution_days = (close_date_obj - create_date_obj).days
-                            severity_resolution_times[severity].append(resolution_days)
+                            severity_resolution_times[severity][0] += count
+                            severity_resolution_times[severity][1] += resolution_days * count
                     except ValueError:
                         pass
         
         # หาเวลาเฉลี่ยในการแก้ไขตามความรุนแรง
         avg_time_by_severity = {}
-        for severity, times in severity_resolution_times.items():
-            if times:
-                avg_time_by_severity[severity] = sum(times) / len(times)
+        for severity, (count, total_days) in severity_resolution_times.items():
+            if count:
+                avg_time_by_severity[severity] = total_days / count
         
         # ความรุนแรงที่ใช้เวลาแก้ไขเฉลี่ยมากที่สุด
         severity_for_avg_time = max(avg_time_by_severity.items(), key=lambda x: x[1], default=('N/A', 0))
         
         # Defect time ranges - หาวันที่เก่าที่สุดและล่าสุดที่มีการสร้าง defect
         first_defect = min((d.get('createDate', d.get('created_date', d.get('reportedDate', '9999-12-31'))) 
-                           for d in defects_data if d.get('createDate') or d.get('created_date') or d.get('reportedDate')), 
+                           for d, _ in created_groups if d.get('createDate') or d.get('created_date') or d.get('reportedDate')), 
                            default='N/A')
         
         last_defect = max((d.get('createDate', d.get('created_date', d.get('reportedDate', '0000-01-01'))) 
-                           for d in defects_data if d.get('createDate') or d.get('created_date') or d.get('reportedDate')), 
+                           for d, _ in created_groups if d.get('createDate') or d.get('created_date') or d.get('reportedDate')), 
                            default='N/A')
         
         # สร้างข้อมูล defect_trend_data
@@ -301,9 +262,7 @@ def prepare_defect_trend_analysis_data(defects_data: Any = None, defects_file: s
             'CLOSURE_RATE_RATIO': round(closure_rate_ratio, 1),
             
             # ข้อมูล trend สำหรับกราฟ
-            'DEFECT_TREND_LABELS': defect_trend_labels,
-            'DEFECT_TREND_OPENED': defect_trend_opened,
-            'DEFECT_TREND_CLOSED': defect_trend_closed,
+            'DEFECT_TREND_CHART': defect_trend_chart,
             'DEFECT_TREND_COMBINED': defect_trend_combined_data,
             
             # ข้อมูลช่วงเวลา
@@ -329,7 +288,7 @@ def prepare_defect_trend_analysis_data(defects_data: Any = None, defects_file: s
         # Flat key-value summary (mimic prepare_test_summary_data style)
         logger.info("✅ สรุป Defect Trend Analysis Data:")
         for k, v in defect_trend_result.items():
-            if k in ["DEFECT_TREND_LABELS", "DEFECT_TREND_OPENED", "DEFECT_TREND_CLOSED"]:
+            if k == "DEFECT_TREND_CHART":
                 # ข้ามการแสดงผลอาร์เรย์แยกกัน
                 continue
             elif k not in ['defect_metrics', 'defect_analysis', 'STATUS_COUNTS', 'DEFECT_TREND_COMBINED']:
@@ -342,18 +301,21 @@ def prepare_defect_trend_analysis_data(defects_data: Any = None, defects_file: s
 
         logger.info("✅ เสร็จสิ้นการเตรียม Defect Trend Analysis Data")
         
+        # เมตริกหรือการวิเคราะห์ที่คำนวณไม่สำเร็จเป็นค่าแทน: ผลลัพธ์ทั้ง section จึงไม่ถูกเก็บใน section cache
+        if isinstance(defect_metrics, SectionFallback) or isinstance(defect_analysis, SectionFallback):
+            return SectionFallback(defect_trend_result)
         return defect_trend_result
         
     except Exception as e:
         logger.error(f"❌ เกิดข้อผิดพลาดในการเตรียม Defect Trend Analysis Data: {str(e)}")
         return {}
 
-def calculate_defect_metrics(defect_data: List[Dict[str, Any]], total_tests: int = 0) -> Dict[str, Any]:
+def calculate_defect_metrics(defect_data: Union[DefectTable, List[Dict[str, Any]]], total_tests: int = 0) -> Dict[str, Any]:
     """
     คำนวณเมตริกต่างๆ เกี่ยวกับข้อบกพร่อง (defects) ที่จำเป็นสำหรับการวิเคราะห์แนวโน้ม
 
     Args:
-        defect_data (List[Dict[str, Any]]): ข้อมูลข้อบกพร่องทั้งหมด
+        defect_data (Union[DefectTable, List[Dict[str, Any]]]): ข้อมูลข้อบกพร่องทั้งหมด (ตารางหรือ list)
         total_tests (int): จำนวนข้อทดสอบทั้งหมด (ใช้สำหรับคำนวณ defect density)
 
     Returns:
@@ -371,28 +333,28 @@ def calculate_defect_metrics(defect_data: List[Dict[str, Any]], total_tests: int
         }
 
     try:
-        # นับจำนวนข้อบกพร่องทั้งหมด
-        total_defects = len(defect_data)
+        # สถิติรวมของตาราง (ใช้ร่วมกับทุก prepare)
+        stats = DefectStatistics.of(defect_data)
         
-        # สถานะที่ถือว่าเปิดอยู่และปิดแล้ว
-        open_statuses = ['open', 'in progress', 'reopened', 'new']
-        closed_statuses = ['closed', 'fixed', 'resolved', 'completed', 'done']
+        # นับจำนวนข้อบกพร่องทั้งหมด
+        total_defects = len(stats)
         
-        # นับตามสถานะ
-        open_defects = sum(1 for d in defect_data if d.get('status', '').lower() in open_statuses)
-        closed_defects = sum(1 for d in defect_data if d.get('status', '').lower() in closed_statuses)
+        # นับตามสถานะ (สถานะเปิด/ปิดจากคำศัพท์กลาง)
+        vocabulary = get_vocabulary()
+        open_defects = sum(count for d, count in stats.group(['status']) if vocabulary.is_open(d.get('status')))
+        closed_defects = sum(count for d, count in stats.group(['status']) if vocabulary.is_closed(d.get('status')))
         
         # คำนวณ defect density
         defect_density = calculate_defect_density(total_defects, total_tests)
         
         # เวลาเฉลี่ยในการแก้ไข
-        avg_resolution_time = calculate_avg_resolution_time(defect_data)
+        avg_resolution_time = calculate_avg_resolution_time(stats)
         
         # อัตราการเข้ามาของข้อบกพร่อง (ช่วง 30 วันล่าสุด)
-        defect_arrival_rate = calculate_defect_arrival_rate(defect_data)
+        defect_arrival_rate = calculate_defect_arrival_rate(stats)
         
         # อัตราการปิดข้อบกพร่อง (ช่วง 30 วันล่าสุด)
-        defect_close_rate = calculate_defect_close_rate(defect_data)
+        defect_close_rate = calculate_defect_close_rate(stats)
         
         return {
             'total_defects': total_defects,
@@ -406,7 +368,7 @@ def calculate_defect_metrics(defect_data: List[Dict[str, Any]], total_tests: int
     
     except Exception as e:
         logger.error(f"❌ เกิดข้อผิดพลาดในการคำนวณเมตริกข้อบกพร่อง: {str(e)}")
-        return {
+        return SectionFallback({
             'total_defects': 0,
             'open_defects': 0,
             'closed_defects': 0,
@@ -414,7 +376,7 @@ def calculate_defect_metrics(defect_data: List[Dict[str, Any]], total_tests: int
             'avg_resolution_time': 0,
             'defect_arrival_rate': 0,
             'defect_close_rate': 0
-        }
+        })
 
 def calculate_defect_density(total_defects: int, code_size: Optional[int] = None) -> float:
     """
@@ -436,61 +398,52 @@ def calculate_defect_density(total_defects: int, code_size: Optional[int] = None
     
     return round(density, 2)
 
-def calculate_avg_resolution_time(defect_data: List[Dict[str, Any]]) -> float:
+def calculate_avg_resolution_time(defect_data: Union[DefectStatistics, DefectTable, List[Dict[str, Any]]]) -> float:
     """
     คำนวณเวลาเฉลี่ยในการแก้ไขข้อบกพร่อง
     
     Args:
-        defect_data (List[Dict[str, Any]]): ข้อมูลข้อบกพร่องทั้งหมด
+        defect_data (Union[DefectStatistics, DefectTable, List[Dict[str, Any]]]): สถิติรวม หรือข้อมูลข้อบกพร่องทั้งหมด
         
     Returns:
         float: เวลาเฉลี่ยในการแก้ไข (วัน)
     """
-    resolution_times = []
-    date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
+    stats = _statistics(defect_data)
+    resolved_count = 0
+    resolution_total = 0
     
-    for defect in defect_data:
-        if defect.get('status', '').lower() in ['closed', 'fixed', 'resolved', 'completed', 'done']:
+    vocabulary = get_vocabulary()
+    keys = ['status', 'created_date', 'createdDate', 'reportedDate', 'closed_date', 'closedDate']
+    for defect, count in stats.group(keys):
+        if vocabulary.is_closed(defect.get('status')):
             created_date_str = defect.get('created_date', defect.get('createdDate', defect.get('reportedDate', '')))
             closed_date_str = defect.get('closed_date', defect.get('closedDate', ''))
             
             if created_date_str and closed_date_str:
-                created_date = None
-                closed_date = None
-                
                 # แปลงวันที่สร้าง
-                for fmt in date_formats:
-                    try:
-                        created_date = datetime.strptime(created_date_str, fmt)
-                        break
-                    except ValueError:
-                        continue
+                created_date = parse_date(created_date_str)
                 
                 # แปลงวันที่ปิด
-                for fmt in date_formats:
-                    try:
-                        closed_date = datetime.strptime(closed_date_str, fmt)
-                        break
-                    except ValueError:
-                        continue
+                closed_date = parse_date(closed_date_str)
                 
                 # คำนวณระยะเวลาในการแก้ไข
                 if created_date and closed_date:
                     resolution_time = max(0, (closed_date - created_date).days)
-                    resolution_times.append(resolution_time)
+                    resolved_count += count
+                    resolution_total += resolution_time * count
     
     # คำนวณค่าเฉลี่ย
-    if resolution_times:
-        return round(sum(resolution_times) / len(resolution_times), 2)
+    if resolved_count:
+        return round(resolution_total / resolved_count, 2)
     else:
         return 0
 
-def calculate_defect_arrival_rate(defect_data: List[Dict[str, Any]], period_days: int = 30) -> float:
+def calculate_defect_arrival_rate(defect_data: Union[DefectStatistics, DefectTable, List[Dict[str, Any]]], period_days: int = 30) -> float:
     """
     คำนวณอัตราการเข้ามาของข้อบกพร่องในช่วงเวลาที่กำหนด
     
     Args:
-        defect_data (List[Dict[str, Any]]): ข้อมูลข้อบกพร่องทั้งหมด
+        defect_data (Union[DefectStatistics, DefectTable, List[Dict[str, Any]]]): สถิติรวม หรือข้อมูลข้อบกพร่องทั้งหมด
         period_days (int): ช่วงเวลาย้อนหลังที่ต้องการวิเคราะห์ (วัน)
         
     Returns:
@@ -499,25 +452,16 @@ def calculate_defect_arrival_rate(defect_data: List[Dict[str, Any]], period_days
     now = datetime.now()
     start_date = now - timedelta(days=period_days)
     
-    # รูปแบบวันที่ที่อาจพบในข้อมูล
-    date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
-    
-    # นับจำนวนข้อบกพร่องใหม่ในช่วงเวลาที่กำหนด
+    # นับจำนวนข้อบกพร่องใหม่ในช่วงเวลาที่กำหนด (ช่วงเวลาถูกใช้ตอนดึงข้อมูล ไม่ได้เก็บในสถิติ)
     new_defects_count = 0
     
-    for defect in defect_data:
+    for defect, count in _statistics(defect_data).group(['created_date', 'createdDate', 'reportedDate']):
         created_date_str = defect.get('created_date', defect.get('createdDate', defect.get('reportedDate', '')))
         if created_date_str:
-            created_date = None
-            for fmt in date_formats:
-                try:
-                    created_date = datetime.strptime(created_date_str, fmt)
-                    break
-                except ValueError:
-                    continue
+            created_date = parse_date(created_date_str)
             
             if created_date and created_date >= start_date:
-                new_defects_count += 1
+                new_defects_count += count
     
     # คำนวณอัตราต่อวัน
     if period_days > 0:
@@ -525,12 +469,12 @@ def calculate_defect_arrival_rate(defect_data: List[Dict[str, Any]], period_days
     else:
         return 0
 
-def calculate_defect_close_rate(defect_data: List[Dict[str, Any]], period_days: int = 30) -> float:
+def calculate_defect_close_rate(defect_data: Union[DefectStatistics, DefectTable, List[Dict[str, Any]]], period_days: int = 30) -> float:
     """
     คำนวณอัตราการปิดข้อบกพร่องในช่วงเวลาที่กำหนด
     
     Args:
-        defect_data (List[Dict[str, Any]]): ข้อมูลข้อบกพร่องทั้งหมด
+        defect_data (Union[DefectStatistics, DefectTable, List[Dict[str, Any]]]): สถิติรวม หรือข้อมูลข้อบกพร่องทั้งหมด
         period_days (int): ช่วงเวลาย้อนหลังที่ต้องการวิเคราะห์ (วัน)
         
     Returns:
@@ -539,29 +483,29 @@ def calculate_defect_close_rate(defect_data: List[Dict[str, Any]], period_days:
     now = datetime.now()
     start_date = now - timedelta(days=period_days)
     
-    # รูปแบบวันที่ที่อาจพบในข้อมูล
-    date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
-    
     # นับจำนวนข้อบกพร่องที่ปิดในช่วงเวลาที่กำหนด
     closed_defects_count = 0
     
-    for defect in defect_data:
-        if defect.get('status', '').lower() in ['closed', 'fixed', 'resolved', 'completed', 'done']:
+    vocabulary = get_vocabulary()
+    for defect, count in _statistics(defect_data).group(['status', 'closed_date', 'closedDate']):
+        if vocabulary.is_closed(defect.get('status')):
             closed_date_str = defect.get('closed_date', defect.get('closedDate', ''))
             if closed_date_str:
-                closed_date = None
-                for fmt in date_formats:
-                    try:
-                        closed_date = datetime.strptime(closed_date_str, fmt)
-                        break
-                    except ValueError:
-                        continue
+                closed_date = parse_date(closed_date_str)
                 
                 if closed_date and closed_date >= start_date:
-                    closed_defects_count += 1
+                    closed_defects_count += count
     
     # คำนวณอัตราต่อวัน
     if period_days > 0:
         return round(closed_defects_count / period_days, 2)
     else:
-        return 0 
+        return 0
+
+def _statistics(defect_data: Union[DefectStatistics, DefectTable, List[Dict[str, Any]]]) -> DefectStatistics:
+    """
+    คืนสถิติรวมของข้อมูล (ถ้าได้รับ DefectStatistics อยู่แล้วให้ใช้เลย)
+    """
+    if isinstance(defect_data, DefectStatistics):
+        return defect_data
+    return DefectStatistics.of(defect_data)
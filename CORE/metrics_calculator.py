@@ -17,7 +17,9 @@ import os
 import math
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from UTILS import get_logger
+from UTILS import get_logger, parse_date
+from INFRASTRUCTURE.vocabulary import get_vocabulary
+from INFRASTRUCTURE.section_cache import SectionFallback
 
 logger = get_logger("MetricsCalculator")
 
@@ -153,7 +155,7 @@ def calculate_test_metrics(test_data: List[Dict[str, Any]]) -> Dict[str, Any]:
     
     except Exception as e:
         logger.error(f"เกิดข้อผิดพลาดในการคำนวณเมตริกการทดสอบ: {str(e)}")
-        return {
+        return SectionFallback({
             'error': f"เกิดข้อผิดพลาดในการคำนวณ: {str(e)}",
             'total_tests': 0,
             'pass_rate': 0,
@@ -163,7 +165,7 @@ def calculate_test_metrics(test_data: List[Dict[str, Any]]) -> Dict[str, Any]:
             'actual_progress': 0,
             'risk_level': 'HIGH',
             'test_coverage': 0
-        }
+        })
 
 def calculate_defect_metrics(defect_data: List[Dict[str, Any]], total_tests: int = 0) -> Dict[str, Any]:
     """
@@ -195,13 +197,12 @@ def calculate_defect_metrics(defect_data: List[Dict[str, Any]], total_tests: int
         # นับจำนวนข้อบกพร่องทั้งหมด
         total_defects = len(defect_data)
         
-        # สถานะที่ถือว่าเปิดอยู่และปิดแล้ว
-        open_statuses = ['open', 'in progress', 'reopened', 'new']
-        closed_statuses = ['closed', 'fixed', 'resolved', 'completed', 'done']
+        # สถานะที่ถือว่าเปิดอยู่และปิดแล้วจากคำศัพท์กลาง
+        vocabulary = get_vocabulary()
         
         # นับตามสถานะ
-        open_defects = sum(1 for d in defect_data if d.get('status', '').lower() in open_statuses)
-        closed_defects = sum(1 for d in defect_data if d.get('status', '').lower() in closed_statuses)
+        open_defects = sum(1 for d in defect_data if vocabulary.is_open(d.get('status')))
+        closed_defects = sum(1 for d in defect_data if vocabulary.is_closed(d.get('status')))
         
         # คำนวณ defect density
         defect_density = _calculate_defect_density(total_defects)
@@ -239,7 +240,7 @@ def calculate_defect_metrics(defect_data: List[Dict[str, Any]], total_tests: int
     
     except Exception as e:
         logger.error(f"เกิดข้อผิดพลาดในการคำนวณเมตริกข้อบกพร่อง: {str(e)}")
-        return {
+        return SectionFallback({
             'error': f"เกิดข้อผิดพลาดในการคำนวณ: {str(e)}",
             'total_defects': 0,
             'open_defects': 0,
@@ -251,7 +252,7 @@ def calculate_defect_metrics(defect_data: List[Dict[str, Any]], total_tests: int
             'avg_resolution_time': 0,
             'defect_arrival_rate': 0,
             'defect_close_rate': 0
-        }
+        })
 
 def _calculate_expected_progress() -> float:
     """
@@ -474,9 +475,7 @@ def _calculate_defect_trends(defect_data: List[Dict[str, Any]], period_days: int
     """
     now = datetime.now()
     start_date = now - timedelta(days=period_days)
-    
-    # รูปแบบวันที่ที่อาจพบในข้อมูล
-    date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
+    vocabulary = get_vocabulary()
     
     # เตรียมข้อมูลสำหรับช่วงเวลาที่กำหนด (ทุกสัปดาห์)
     trends = []
@@ -493,28 +492,16 @@ def _calculate_defect_trends(defect_data: List[Dict[str, Any]], period_days: int
             # ตรวจสอบวันที่สร้าง
             created_date_str = defect.get('created_date', defect.get('createdDate', defect.get('created_at', '')))
             if created_date_str:
-                created_date = None
-                for fmt in date_formats:
-                    try:
-                        created_date = datetime.strptime(created_date_str, fmt)
-                        break
-                    except ValueError:
-                        continue
+                created_date = parse_date(created_date_str)
                 
                 if created_date and week_start <= created_date < week_end:
                     opened_count += 1
             
             # ตรวจสอบวันที่ปิด
-            if defect.get('status', '').lower() in ['closed', 'fixed', 'resolved', 'completed', 'done']:
+            if vocabulary.is_closed(defect.get('status')):
                 closed_date_str = defect.get('closed_date', defect.get('closedDate', defect.get('resolved_date', '')))
                 if closed_date_str:
-                    closed_date = None
-                    for fmt in date_formats:
-                        try:
-                            closed_date = datetime.strptime(closed_date_str, fmt)
-                            break
-                        except ValueError:
-                            continue
+                    closed_date = parse_date(closed_date_str)
                     
                     if closed_date and week_start <= closed_date < week_end:
                         closed_count += 1
@@ -544,32 +531,19 @@ def _calculate_avg_resolution_time(defect_data: List[Dict[str, Any]]) -> float:
         float: เวลาเฉลี่ยในการแก้ไข (วัน)
     """
     resolution_times = []
-    date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
+    vocabulary = get_vocabulary()
     
     for defect in defect_data:
-        if defect.get('status', '').lower() in ['closed', 'fixed', 'resolved', 'completed', 'done']:
+        if vocabulary.is_closed(defect.get('status')):
             created_date_str = defect.get('created_date', defect.get('createdDate', ''))
             closed_date_str = defect.get('closed_date', defect.get('closedDate', defect.get('resolved_date', '')))
             
             if created_date_str and closed_date_str:
-                created_date = None
-                closed_date = None
-                
                 # แปลงวันที่สร้าง
-                for fmt in date_formats:
-                    try:
-                        created_date = datetime.strptime(created_date_str, fmt)
-                        break
-                    except ValueError:
-                        continue
+                created_date = parse_date(created_date_str)
                 
                 # แปลงวันที่ปิด
-                for fmt in date_formats:
-                    try:
-                        closed_date = datetime.strptime(closed_date_str, fmt)
-                        break
-                    except ValueError:
-                        continue
+                closed_date = parse_date(closed_date_str)
                 
                 # คำนวณระยะเวลาในการแก้ไข
                 if created_date and closed_date:
@@ -596,22 +570,13 @@ def _calculate_defect_arrival_rate(defect_data: List[Dict[str, Any]], period_day
     now = datetime.now()
     start_date = now - timedelta(days=period_days)
     
-    # รูปแบบวันที่ที่อาจพบในข้อมูล
-    date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
-    
     # นับจำนวนข้อบกพร่องใหม่ในช่วงเวลาที่กำหนด
     new_defects_count = 0
     
     for defect in defect_data:
         created_date_str = defect.get('created_date', defect.get('createdDate', defect.get('created_at', '')))
         if created_date_str:
-            created_date = None
-            for fmt in date_formats:
-                try:
-                    created_date = datetime.strptime(created_date_str, fmt)
-                    break
-                except ValueError:
-                    continue
+            created_date = parse_date(created_date_str)
             
             if created_date and created_date >= start_date:
                 new_defects_count += 1
@@ -636,23 +601,15 @@ def _calculate_defect_close_rate(defect_data: List[Dict[str, Any]], period_days:
     now = datetime.now()
     start_date = now - timedelta(days=period_days)
     
-    # รูปแบบวันที่ที่อาจพบในข้อมูล
-    date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y"]
-    
     # นับจำนวนข้อบกพร่องที่ปิดในช่วงเวลาที่กำหนด
     closed_defects_count = 0
+    vocabulary = get_vocabulary()
     
     for defect in defect_data:
-        if defect.get('status', '').lower() in ['closed', 'fixed', 'resolved', 'completed', 'done']:
+        if vocabulary.is_closed(defect.get('status')):
             closed_date_str = defect.get('closed_date', defect.get('closedDate', defect.get('resolved_date', '')))
             if closed_date_str:
-                closed_date = None
-                for fmt in date_formats:
-                    try:
-                        closed_date = datetime.strptime(closed_date_str, fmt)
-                        break
-                    except ValueError:
-                        continue
+                closed_date = parse_date(closed_date_str)
                 
                 if closed_date and closed_date >= start_date:
                     closed_defects_count += 1
@@ -15,6 +15,7 @@ from collections import defaultdict
 # เพิ่ม path เพื่อให้สามารถ import โมดูลอื่นๆ ได้
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from UTILS import get_logger
+from INFRASTRUCTURE.records import TestModule
 
 logger = get_logger("ModuleTestingPrepare")
 
@@ -88,19 +89,15 @@ def prepare_module_testing_status_data(test_data: Dict[str, Any]) -> Dict[str, A
     total_in_progress = 0
     total_not_started = 0
 
-    # ประมวลผลข้อมูลแต่ละโมดูล
-    for module in modules_data:
-        name = module.get('name', 'Unknown Module')
-        cases = module.get('testCases', {})
-        
-        # แปลงค่าเป็น int เพื่อป้องกันปัญหาการคำนวณ
-        total = int(cases.get('total', 0))
-        passed = int(cases.get('passed', 0))
-        failed = int(cases.get('failed', 0))
-        blocked = int(cases.get('blocked', cases.get('block', 0)))
-        in_progress = int(cases.get('inProgress', 0))
-        
-        not_started = int(cases.get('notStarted', total - passed - failed - blocked - in_progress))
+    # ประมวลผลข้อมูลแต่ละโมดูล (decode เป็น TestModule: alias และการแปลงเป็น int ทำครั้งเดียวตอน decode)
+    for module in map(TestModule.from_dict, modules_data):
+        name = module.name
+        total = module.total
+        passed = module.passed
+        failed = module.failed
+        blocked = module.blocked
+        in_progress = module.in_progress
+        not_started = module.not_started
         if total <= 0:
             logger.warning(f"⚠️ โมดูล '{name}' มีจำนวน test case ทั้งหมดเป็น 0 หรือติดลบ")
             total = max(1, passed + failed + blocked + in_progress + not_started)
@@ -6,7 +6,7 @@ Author: Tassana Khrueawan
 Version: 1.0.1 (Logging Style Update)
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
 from datetime import datetime
 from robot.api import logger
 import os
@@ -14,17 +14,23 @@ import sys
 
 # เพิ่ม path เพื่อให้สามารถ import โมดูลอื่นๆ ได้
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from UTILS import get_logger
+from UTILS import get_logger, parse_date
+from INFRASTRUCTURE.defect_table import DefectTable
+from INFRASTRUCTURE.defect_top_index import DefectTopIndex
+from INFRASTRUCTURE.section_cache import SectionFallback
 
 logger = get_logger("RecentDefectsPrepare")
 
-def prepare_recent_defects_data(defects_data: List[Dict[str, Any]], limit: int = 15) -> Dict[str, Any]:
+# รูปแบบวันที่ของ reportedDate ที่รองรับ (เพิ่ม format อื่นๆ ถ้าจำเป็น)
+RECENT_DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y")
+
+def prepare_recent_defects_data(defects_data: Union[DefectTable, List[Dict[str, Any]]], limit: int = 15) -> Dict[str, Any]:
     """
     เตรียมข้อมูล Recent Defects โดยเฉพาะ
     - แสดงข้อบกพร่องล่าสุดพร้อมรายละเอียด (เรียงตามวันที่ reported ล่าสุด)
 
     Args:
-        defects_data (List[Dict[str, Any]]): ข้อมูลข้อบกพร่องทั้งหมด
+        defects_data (Union[DefectTable, List[Dict[str, Any]]]): ข้อมูลข้อบกพร่องทั้งหมด (ตารางหรือ list)
         limit (int): จำนวนข้อบกพร่องล่าสุดที่ต้องการแสดง
 
     Returns:
@@ -44,47 +50,41 @@ def prepare_recent_defects_data(defects_data: List[Dict[str, Any]], limit: int =
         }
         logger.info("—— ผลรวม Recent Defects ——")
 
-        if not defects_data:
+        table = DefectTable.of(defects_data)
+        if not table:
             logger.warning("⚠️ ไม่มีข้อมูล defects สำหรับ Recent Defects")
             logger.info("✅ เตรียมข้อมูล Recent Defects เรียบร้อยแล้ว (ข้อมูลว่าง)")
             return {"recent_defects": []}
             
-        # ฟังก์ชันช่วยแปลงวันที่
-        def parse_date(date_str):
+        # ฟังก์ชันช่วยแปลงวันที่ (แต่ละข้อความถูก strptime ครั้งเดียวผ่าน parse_date)
+        def to_datetime(date_str):
             if not date_str:
                 return None
-            for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y"): # เพิ่ม format อื่นๆ ถ้าจำเป็น
-                try:
-                    return datetime.strptime(date_str, fmt)
-                except ValueError:
-                    pass
-            logger.warning(f"ไม่สามารถแปลงวันที่: {date_str}")
-            return None
+            date_obj = parse_date(date_str, RECENT_DATE_FORMATS)
+            if date_obj is None:
+                logger.warning(f"ไม่สามารถแปลงวันที่: {date_str}")
+            return date_obj
 
-        # เพิ่ม reported_date_obj เพื่อใช้เรียงลำดับ
-        defects_with_date = []
-        for defect in defects_data:
-            reported_date_str = defect.get('reportedDate', defect.get('created_date', ''))
-            reported_date_obj = parse_date(reported_date_str)
-            defect_copy = defect.copy()
-            defect_copy['reported_date_obj'] = reported_date_obj if reported_date_obj else datetime.min
-            defects_with_date.append(defect_copy)
-                
-        # เรียงลำดับตามวันที่ reported (ล่าสุดมาก่อน)
-        sorted_defects = sorted(defects_with_date, key=lambda x: x['reported_date_obj'], reverse=True)
-        
-        # เลือกตามจำนวน limit และจัดรูปแบบข้อมูล
+        # แปลงวันที่ reported ครั้งเดียวต่อค่า (ล่าสุดมาก่อน ค่าที่เท่ากันเรียงตามลำดับในข้อมูล)
+        def ranking():
+            reported_date_objs = table.resolve(
+                ['reportedDate', 'created_date'], '', lambda date_str: to_datetime(date_str) or datetime.min
+            )
+            return range(len(table)), reported_date_objs
+
+        # เลือกเฉพาะ limit แถวด้วย heap จาก top-N index ที่ใช้ร่วมกันของตาราง แล้วจัดรูปแบบข้อมูล
         recent_defects_list = []
-        for defect in sorted_defects[:limit]:
-            sev = str(defect.get('severity', 'Unknown')).capitalize()
-            status = str(defect.get('status', 'Unknown')).capitalize()
+        for row in DefectTopIndex.of(table).top("recent", limit, ranking, largest=True):
+            defect = table.record(row)
+            sev = str(defect.severity or 'Unknown').capitalize()
+            status = str(defect.status or 'Unknown').capitalize()
             recent_defect = {
-                'id': defect.get('issueId', defect.get('id', 'N/A')),
-                'description': defect.get('description', 'No description'),
+                'id': defect.issue_id or 'N/A',
+                'description': defect.description or 'No description',
                 'severity': sev,
                 'status': status,
-                'module': defect.get('module', 'Unknown'),
-                'reportedDate': defect.get('reportedDate', 'N/A'),
+                'module': defect.module or 'Unknown',
+                'reportedDate': defect.reported_date or 'N/A',
                 # สามารถเพิ่ม field อื่นๆ ที่ต้องการแสดงใน template ได้
             }
             recent_defects_list.append(recent_defect)
@@ -135,4 +135,5 @@ def prepare_recent_defects_data(defects_data: List[Dict[str, Any]], limit: int =
         return {"recent_defects": recent_defects_list}
     except Exception as e:
         logger.error("❌ เกิดข้อผิดพลาดในการเตรียม Recent Defects Data: {}".format(str(e)))
-        return {"recent_defects": []}
+        # ค่าแทนเมื่อเกิดข้อผิดพลาด ไม่ถูกเก็บใน section cache
+        return SectionFallback({"recent_defects": []})
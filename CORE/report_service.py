@@ -9,16 +9,18 @@ Core business logic for QA Report generation
 import os
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-import json
 
-from INFRASTRUCTURE import TestDataLoader, DefectDataLoader, HTMLRenderer, config
-from UTILS import get_logger, clear_cache
+from INFRASTRUCTURE import TestDataLoader, DefectDataLoader, HTMLRenderer, config, dataset_cache, DefectTable, DefectRows, DefectStatistics, DefectSnapshot
+from UTILS import get_logger, clear_cache, JSONDecodeError, json_loads
 from CORE.report_data import ReportDataProcessor
-from CORE.defect_analyzer import prepare_defect_analysis_data, calculate_sla_metrics, get_defect_trends
+from CORE.defect_analyzer import prepare_defect_analysis_data, prepare_defect_count_maps, calculate_sla_metrics, get_defect_trends
 
 # Setup logger
 logger = get_logger("ReportService")
 
+# field ของ defect ที่ template ใช้แสดงรายการ defect (DEFECT_ROWS)
+DEFECT_ROW_FIELDS = ("issueId", "module", "page", "severity", "status", "description", "reportedDate", "closedDate")
+
 class ReportService:
     """
     Core service for QA Report generation
@@ -151,6 +153,7 @@ class ReportService:
         Clear all cached data
         """
         clear_cache()
+        dataset_cache.invalidate()
         logger.info("Cache cleared successfully")
     
     def _process_defects_data(self) -> None:
@@ -160,19 +163,34 @@ class ReportService:
         if not self.defects_data:
             return
         
-        # Add raw defects data to report
-        self.report_data["defects_data"] = self.defects_data
+        table = DefectTable.from_records(self.defects_data)
+        
+        # template ได้ defect เป็น view แบบ lazy ที่มีเฉพาะ field ที่ตารางใช้ (ไม่ใช่ list ของ dict ดิบทั้งชุด)
+        self.report_data["DEFECT_ROWS"] = DefectRows(table, DEFECT_ROW_FIELDS)
+        if config.defect_table_mode in ("inline", "sidecar"):
+            # ตารางรายการ defect ถูกสร้างใน browser จากข้อมูลแบบ column แทนการ render ทุกแถวเป็น HTML
+            self.report_data["DEFECT_TABLE_DATA"] = table.to_columns(DEFECT_ROW_FIELDS)
+        
+        # ทุกส่วนด้านล่างดึงจากสถิติรวมชุดเดียวกัน: ปรับจาก snapshot ด้วย delta ของ export ใหม่ (ถ้าตั้งค่าไว้)
+        # หรือนับจากตารางในรอบเดียว (single pass)
+        if config.defect_snapshot_file:
+            stats = DefectSnapshot(config.defect_snapshot_file).attach(table)
+        else:
+            stats = DefectStatistics.of(table)
         
         # Basic defect statistics from defect_analysis module
-        defect_stats = prepare_defect_analysis_data(self.defects_data)
+        defect_stats = prepare_defect_analysis_data(stats)
         self.report_data.update(defect_stats)
         
+        # จำนวนตาม status/severity/module/page สำหรับ template (แทนการนับจากรายการ defect ตอน render)
+        self.report_data.update(prepare_defect_count_maps(stats))
+        
         # SLA metrics
-        sla_data = calculate_sla_metrics(self.defects_data)
+        sla_data = calculate_sla_metrics(stats)
         self.report_data["sla_metrics"] = sla_data
         
         # Trend data for last 30 days
-        trend_data = get_defect_trends(self.defects_data, days=30)
+        trend_data = get_defect_trends(stats, days=30)
         self.report_data["defect_trends"] = trend_data
     
     def _prepare_final_report_data(self) -> None:
@@ -191,10 +209,10 @@ class ReportService:
             if isinstance(value, str) and value.startswith('{') and value.endswith('}'):
                 try:
                     # พยายามแปลงกลับเป็น dictionary
-                    dict_value = json.loads(value)
+                    dict_value = json_loads(value)
                     if isinstance(dict_value, dict):
                         self.report_data[key] = dict_value
-                except (json.JSONDecodeError, ValueError):
+                except (JSONDecodeError, ValueError):
                     # ถ้าแปลงไม่ได้ให้เก็บเป็น string ไว้
                     pass
             
@@ -202,9 +220,9 @@ class ReportService:
             if key in ['trendAnalysis', 'defect_analysis', 'summary'] and isinstance(value, str):
                 try:
                     # พยายามแปลงจาก JSON string เป็น object
-                    dict_value = json.loads(value)
+                    dict_value = json_loads(value)
                     self.report_data[key] = dict_value
-                except (json.JSONDecodeError, ValueError):
+                except (JSONDecodeError, ValueError):
                     # ถ้าแปลงไม่ได้ให้ใช้ empty dictionary แทน
                     self.report_data[key] = {}
         
@@ -17,6 +17,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from UTILS import get_logger, format_datetime_thai, calculate_sprint_days
 from CORE.metrics_calculator import calculate_test_metrics
+from INFRASTRUCTURE import dataset_cache, SectionFallback
 
 # Setup logger
 logger = get_logger("TestSummaryPrepare")
@@ -29,9 +30,7 @@ def prepare_test_summary_data(test_data: Dict[str, Any] = None, data_file: str =
                 return {}
                 
             try:
-                import json
-                with open(data_file, 'r', encoding='utf-8') as f:
-                    test_data = json.load(f)
+                test_data = dataset_cache.read_json(data_file)
                 logger.info(f"โหลดข้อมูล test data จาก: {data_file}")
             except Exception as e:
                 logger.error(f"ไม่สามารถโหลดข้อมูล test data: {str(e)}")
@@ -120,6 +119,9 @@ def prepare_test_summary_data(test_data: Dict[str, Any] = None, data_file: str =
         for k, v in test_summary_data.items():
             logger.info(f"  {k}: {v}")
         
+        # เมตริกที่คำนวณไม่สำเร็จเป็นค่าแทน: ผลลัพธ์ทั้ง section จึงไม่ถูกเก็บใน section cache
+        if isinstance(test_metrics, SectionFallback):
+            return SectionFallback(test_summary_data)
         return test_summary_data
         
     except Exception as e:
@@ -6,8 +6,7 @@ Author: Tassana Khrueawan
 Version: 1.1.1 (Separate logs for daily defect and analysis summary)
 """
 
-import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
 from robot.api import logger
 import os
 import sys
@@ -15,7 +14,9 @@ from collections import defaultdict
 
 # เพิ่ม path เพื่อให้สามารถ import โมดูลอื่นๆ ได้
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from UTILS import get_logger
+from UTILS import get_logger, chart_payload
+from INFRASTRUCTURE import DefectDataLoader, DefectTable, DefectStatistics
+from INFRASTRUCTURE.records import TrendPoint
 
 logger = get_logger("TestTrendPrepare")
 
@@ -30,16 +31,14 @@ def load_defects_from_file(defect_json_path="DATA/DEFECT.json"):
     if not os.path.exists(abspath):
         logger.warn(f"⚠️ ไม่พบไฟล์ DEFECT.json: {abspath}")
         return []
-    try:
-        with open(abspath, encoding="utf-8") as f:
-            data = json.load(f)
-        # รูปแบบ: {"defects": [ ... ]}
-        return data.get("defects", []) if isinstance(data, dict) else data
-    except Exception as e:
-        logger.error(f"❌ โหลด DEFECT.json ผิดพลาด: {e}")
+    # ใช้ DefectDataLoader (dataset cache) เพื่อไม่ต้อง parse ไฟล์เดิมซ้ำ
+    defects = DefectDataLoader().load(abspath)
+    if defects is None:
+        logger.error(f"❌ โหลด DEFECT.json ผิดพลาด: {abspath}")
         return []
+    return defects
 
-def prepare_test_trend_analysis_data(test_data: Dict[str, Any], defect_data: List[dict]=None, defect_json_path="DATA/DEFECT.json") -> Dict[str, Any]:
+def prepare_test_trend_analysis_data(test_data: Dict[str, Any], defect_data: Union[DefectTable, List[dict]]=None, defect_json_path="DATA/DEFECT.json", chart_delta: bool = False) -> Dict[str, Any]:
     logger.info('────────────────────────────────────────────────────────────────────')
     logger.info("[TEST TREND] Test Trend Analysis Summary")
     
@@ -68,58 +67,72 @@ def prepare_test_trend_analysis_data(test_data: Dict[str, Any], defect_data: Lis
         trend_analysis['INSIGHTS'] = {}
         
     trend_data_list = trend_analysis.get('DATA', [])
-    trend_labels = json.dumps([item.get('DATE', '') for item in trend_data_list])
-    trend_executed = json.dumps([item.get('TEST_CASES_EXECUTED', 0) for item in trend_data_list])
-    trend_passed = json.dumps([item.get('TEST_CASES_PASSED', 0) for item in trend_data_list])
-    trend_failed = json.dumps([item.get('TEST_CASES_FAILED', 0) for item in trend_data_list]) 
-    trend_blocked = json.dumps([item.get('TEST_CASES_BLOCKED', 0) for item in trend_data_list])
-    trend_in_progress = json.dumps([item.get('TEST_CASES_IN_PROGRESS', 0) for item in trend_data_list])
-    trend_not_started = json.dumps([item.get('TEST_CASES_NOT_STARTED', 0) for item in trend_data_list])
-    trend_coverage = json.dumps([item.get('TEST_COVERAGE', 0) for item in trend_data_list])
+    # decode แต่ละวันเป็น TrendPoint ครั้งเดียว แทนการเรียก .get ซ้ำในทุกผลรวมด้านล่าง
+    trend_points = [TrendPoint.from_dict(item) for item in trend_data_list]
 
     if defect_data is None:
         defect_data = load_defects_from_file(defect_json_path)
 
+    # histogram รายวันจากสถิติรวม (ใช้ร่วมกับ prepare ฝั่ง defect)
+    stats = DefectStatistics.of(defect_data)
     daily_open = defaultdict(int)
     daily_closed = defaultdict(int)
-    for defect in defect_data:
+    for defect, count in stats.group(["reportedDate"]):
         reported_date = defect.get("reportedDate")
-        closed_date = defect.get("closedDate")
         if reported_date:
-            daily_open[reported_date] += 1
+            daily_open[reported_date] += count
+    for defect, count in stats.group(["closedDate"]):
+        closed_date = defect.get("closedDate")
         if closed_date:
-            daily_closed[closed_date] += 1
+            daily_closed[closed_date] += count
 
     # summary ต่อวัน
     per_day_defects_summary = []
-    for d in trend_data_list:
-        date = d.get("DATE")
+    for d, point in zip(trend_data_list, trend_points):
+        date = point.date
         open_cnt = daily_open.get(date, 0)
         close_cnt = daily_closed.get(date, 0)
         d["DEFECTS_OPENED"] = open_cnt
         d["DEFECTS_CLOSED"] = close_cnt
         per_day_defects_summary.append({
             "TEST_TREND_DATE": date,
-            "TEST_TREND_EXECUTED": d.get("TEST_CASES_EXECUTED", 0),
-            "TEST_TREND_PASSED": d.get("TEST_CASES_PASSED", 0),
-            "TEST_TREND_FAILED": d.get("TEST_CASES_FAILED", 0),
-            "TEST_TREND_BLOCKED": d.get("TEST_CASES_BLOCKED", 0),
-            "TEST_TREND_IN_PROGRESS": d.get("TEST_CASES_IN_PROGRESS", 0),
-            "TEST_TREND_NOT_STARTED": d.get("TEST_CASES_NOT_STARTED", 0),
+            "TEST_TREND_EXECUTED": point.executed,
+            "TEST_TREND_PASSED": point.passed,
+            "TEST_TREND_FAILED": point.failed,
+            "TEST_TREND_BLOCKED": point.blocked,
+            "TEST_TREND_IN_PROGRESS": point.in_progress,
+            "TEST_TREND_NOT_STARTED": point.not_started,
             "DEFECT_TREND_OPENED": open_cnt,
             "DEFECT_TREND_CLOSED": close_cnt,
         })
 
+    # ข้อมูลกราฟแบบ columnar: แกนวันที่ร่วมกันและ array ของแต่ละ series (serialize ครั้งเดียวตอน render)
+    trend_chart = chart_payload(
+        [item.get('DATE', '') for item in trend_data_list],
+        {
+            "executed": [point.executed for point in trend_points],
+            "passed": [point.passed for point in trend_points],
+            "failed": [point.failed for point in trend_points],
+            "blocked": [point.blocked for point in trend_points],
+            "in_progress": [point.in_progress for point in trend_points],
+            "not_started": [point.not_started for point in trend_points],
+            "coverage": [point.coverage for point in trend_points],
+            "defects_opened": [item["DEFECT_TREND_OPENED"] for item in per_day_defects_summary],
+            "defects_closed": [item["DEFECT_TREND_CLOSED"] for item in per_day_defects_summary],
+        },
+        delta=chart_delta
+    )
+
     logger.info("—— ผลรวม Test Trend & Defect ในแต่ละวัน (JSON-style) ——")
     logger.info(f"TEST_TREND_DATA: {per_day_defects_summary}")
     
     total_days = len(trend_data_list)
-    total_test_cases = sum(item.get('TEST_CASES_EXECUTED', 0) for item in trend_data_list)
-    total_passed_cases = sum(item.get('TEST_CASES_PASSED', 0) for item in trend_data_list)
-    total_failed_cases = sum(item.get('TEST_CASES_FAILED', 0) for item in trend_data_list)
-    total_blocked_cases = sum(item.get('TEST_CASES_BLOCKED', 0) for item in trend_data_list)
-    total_in_progress_cases = sum(item.get('TEST_CASES_IN_PROGRESS', 0) for item in trend_data_list)
-    total_not_started_cases = sum(item.get('TEST_CASES_NOT_STARTED', 0) for item in trend_data_list)
+    total_test_cases = sum(point.executed for point in trend_points)
+    total_passed_cases = sum(point.passed for point in trend_points)
+    total_failed_cases = sum(point.failed for point in trend_points)
+    total_blocked_cases = sum(point.blocked for point in trend_points)
+    total_in_progress_cases = sum(point.in_progress for point in trend_points)
+    total_not_started_cases = sum(point.not_started for point in trend_points)
     
     # หา pass rate
     pass_rate = 0.0
@@ -127,17 +140,17 @@ def prepare_test_trend_analysis_data(test_data: Dict[str, Any], defect_data: Lis
         pass_rate = (total_passed_cases / total_test_cases) * 100
     
     # หา date range
-    dates = [item.get('DATE') for item in trend_data_list if item.get('DATE')]
+    dates = [point.date for point in trend_points if point.date]
     first_date = min(dates) if dates else "-"
     last_date = max(dates) if dates else "-"
     
     # หาวันที่มีการ execute สูงสุด
     highest_executed = 0
     best_day = "-"
-    for item in trend_data_list:
-        if item.get('TEST_CASES_EXECUTED', 0) > highest_executed:
+    for item, point in zip(trend_data_list, trend_points):
+        if point.executed > highest_executed:
             best_day = item.get('DATE', "-")
-            highest_executed = item.get('TEST_CASES_EXECUTED', 0)
+            highest_executed = point.executed
 
     # ดึงข้อมูลเพิ่มเติมจาก trend_analysis
     totals = trend_analysis.get('TOTALS', {})
@@ -196,14 +209,7 @@ def prepare_test_trend_analysis_data(test_data: Dict[str, Any], defect_data: Lis
     # สร้าง dictionary สำหรับส่งกลับ
     result = {
         "TREND_ANALYSIS": trend_analysis, # เก็บ object ทั้งหมดไว้เพื่อใช้ในเทมเพลต
-        "TEST_TREND_LABELS": trend_labels,
-        "TEST_TREND_EXECUTED": trend_executed,
-        "TEST_TREND_PASSED": trend_passed,
-        "TEST_TREND_FAILED": trend_failed,
-        "TEST_TREND_BLOCKED": trend_blocked,
-        "TEST_TREND_IN_PROGRESS": trend_in_progress,
-        "TEST_TREND_NOT_STARTED": trend_not_started,
-        "TEST_TREND_COVERAGE": trend_coverage,
+        "TEST_TREND_CHART": trend_chart,
         "TEST_TREND_DATA": per_day_defects_summary,
         "TREND_ANALYSIS_TOTAL_DAYS": total_days,
         "TREND_ANALYSIS_TOTAL_TEST_CASES": total_test_cases,
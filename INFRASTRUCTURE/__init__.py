@@ -6,7 +6,16 @@ from INFRASTRUCTURE.test_data_loader import TestDataLoader
 from INFRASTRUCTURE.defect_data_loader import DefectDataLoader
 from INFRASTRUCTURE.html_renderer import HTMLRenderer
 from INFRASTRUCTURE.config import ReportConfig
+from INFRASTRUCTURE.dataset_cache import DatasetCache, dataset_cache
+from INFRASTRUCTURE.defect_table import DefectTable, DefectRows
+from INFRASTRUCTURE.defect_statistics import DefectStatistics
+from INFRASTRUCTURE.defect_top_index import DefectTopIndex
+from INFRASTRUCTURE.defect_snapshot import DefectSnapshot
+from INFRASTRUCTURE.section_cache import SectionCache, SectionFallback
+from INFRASTRUCTURE.asset_bundler import AssetBundler
+from INFRASTRUCTURE.records import Defect, TestModule, TrendPoint
+from INFRASTRUCTURE.vocabulary import Vocabulary, get_vocabulary
 
 config = ReportConfig()
 
-__all__ = ["TestDataLoader", "DefectDataLoader", "config", "HTMLRenderer"] 
\ No newline at end of file
+__all__ = ["TestDataLoader", "DefectDataLoader", "config", "HTMLRenderer", "DatasetCache", "dataset_cache", "DefectTable", "DefectRows", "DefectStatistics", "DefectTopIndex", "DefectSnapshot", "SectionCache", "SectionFallback", "AssetBundler", "Defect", "TestModule", "TrendPoint", "Vocabulary", "get_vocabulary"] 
\ No newline at end of file
@@ -0,0 +1,503 @@
+# INFRASTRUCTURE/asset_bundler.py
+
+"""
+Asset Bundler
+Offline report bundle: third-party assets served from vendored copies instead of CDNs
+
+template ดึง Tailwind, Alpine, Chart.js, Popper/Tippy, ApexCharts, boxicons, remixicon และ font จาก CDN
+ซึ่งทำให้หน้าแรกแสดงช้า และเปิดไม่ได้บนเครื่องที่ไม่มี internet
+คำสั่ง vendor ดาวน์โหลดไฟล์เหล่านี้ (รวม font/รูปที่ CSS อ้างถึง) มาเก็บใน directory เดียวพร้อม manifest.json
+(URL -> ชื่อไฟล์) ตอนสร้างรายงาน HTML ที่ render แล้วถูกแก้ระหว่าง stream ลงไฟล์ตาม ReportConfig.asset_mode:
+
+- "cdn"    ไม่แก้ไข (ค่าเริ่มต้น)
+- "inline" ฝังเนื้อหาของ asset ลงในหน้า (script/style หรือ data: URI) ได้ไฟล์ HTML เดียวที่เปิดได้ offline
+- "shared" คัดลอก asset ไปที่ <output dir>/assets/<ชื่อ>.<hash ของเนื้อหา>.<นามสกุล> ครั้งเดียว
+           รายงานทุกไฟล์ใน directory เดียวกันอ้างถึงไฟล์ชุดเดียวกัน (ไฟล์ที่มีอยู่แล้วไม่ถูกเขียนซ้ำ)
+
+asset ที่อ้างด้วย path ภายใน template directory (เช่น assets/js/main.js) ถูกรวมด้วยเช่นกัน
+asset เดียวกันที่ถูกอ้างซ้ำในหน้าเดียวกันถูกใส่ครั้งเดียว
+
+วิธีใช้ (จาก root ของโปรเจกต์ ต้องต่อ internet):
+    python -m INFRASTRUCTURE.asset_bundler build/vendor
+"""
+
+import argparse
+import base64
+import hashlib
+import mimetypes
+import os
+import re
+import sys
+import threading
+import urllib.request
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+
+from UTILS import get_logger, json_load_file, json_dump_file
+
+# Setup logger
+logger = get_logger("AssetBundler")
+
+MANIFEST_NAME = "manifest.json"
+
+# ค่าของ ReportConfig.asset_mode ที่แก้ไข HTML
+BUNDLE_MODES = ("inline", "shared")
+
+# ชื่อ directory ข้างรายงานที่เก็บ asset ในโหมด "shared"
+SHARED_ASSET_DIR = "assets"
+
+# asset จาก CDN ที่ template ใช้ (URL -> ชื่อไฟล์ใน vendor directory)
+VENDOR_ASSETS: Dict[str, str] = {
+    "https://fonts.bunny.net/css?family=figtree:400,500,600&display=swap": "figtree.css",
+    "https://unpkg.com/boxicons@2.1.4/css/boxicons.min.css": "boxicons.min.css",
+    "https://cdn.jsdelivr.net/npm/remixicon@3.5.0/fonts/remixicon.css": "remixicon.css",
+    "https://unpkg.com/@alpinejs/focus@3.x.x/dist/cdn.min.js": "alpinejs-focus.min.js",
+    "https://unpkg.com/alpinejs@3.x.x/dist/cdn.min.js": "alpinejs.min.js",
+    "https://cdn.tailwindcss.com": "tailwindcss.js",
+    "https://cdn.jsdelivr.net/npm/chart.js@3.9.1/dist/chart.min.js": "chart-3.9.1.min.js",
+    "https://unpkg.com/@popperjs/core@2.11.6/dist/umd/popper.min.js": "popper-2.11.6.min.js",
+    "https://unpkg.com/tippy.js@6.3.7/dist/tippy-bundle.umd.min.js": "tippy-bundle.umd.min.js",
+    "https://cdn.jsdelivr.net/npm/apexcharts": "apexcharts.min.js",
+    "https://unpkg.com/@popperjs/core@2": "popper-2.min.js",
+    "https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.min.js": "chart-4.4.1.umd.min.js",
+    "https://fonts.googleapis.com/css2?family=Inter:wght@100;200;300;400;500;600;700;800;900&display=swap": "inter-100-900.css",
+    "https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap": "inter-300-700.css",
+}
+
+# Google Fonts ส่ง CSS ตาม User-Agent (ต้องเป็น browser สมัยใหม่จึงได้ woff2)
+VENDOR_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+# MIME type ของ data: URI (mimetypes ของบางระบบไม่รู้จัก font)
+ASSET_MIME_TYPES = {
+    ".js": "text/javascript",
+    ".css": "text/css",
+    ".woff2": "font/woff2",
+    ".woff": "font/woff",
+    ".ttf": "font/ttf",
+    ".eot": "application/vnd.ms-fontobject",
+    ".svg": "image/svg+xml",
+}
+
+# tag/คำสั่งที่อ้างถึง asset ใน HTML ที่ render แล้ว
+# (รวม <script>/<style> เพื่อรู้ว่าข้อความอยู่ใน HTML, script หรือ CSS)
+HTML_TOKEN = re.compile(r"""
+    (?P<script_src><script\b(?P<script_before>[^>]*?)\s+src=(?P<sq>["'])(?P<script_url>[^"']+)(?P=sq)(?P<script_after>[^>]*)>\s*</script\s*>)
+  | (?P<link><link\b[^>]*>)
+  | (?P<open><(?P<open_tag>script|style)\b[^>]*>)
+  | (?P<close></(?P<close_tag>script|style)\s*>)
+  | (?P<write>document\.write\((?P<wq>["'])<script\ src="(?P<write_url>[^"]+)"><\\/script>(?P=wq)\))
+  | (?P<import>@import\s+url\((?P<iq>["']?)(?P<import_url>[^"')]+)(?P=iq)\)\s*;)
+""", re.IGNORECASE | re.VERBOSE)
+
+# attribute ของ tag (เช่น <link rel="stylesheet" href='...'>)
+TAG_ATTRIBUTE = re.compile(r"""([\w-]+)\s*=\s*(["'])(.*?)\2""")
+
+# url(...) ใน CSS
+CSS_URL = re.compile(r"""url\(\s*(["']?)([^"')]+)\1\s*\)""")
+
+# asset ที่ประมวลผลแล้ว (key = โหมด, path, mtime, ขนาด) -> (ชื่อไฟล์ที่มี hash, เนื้อหา, ไฟล์ที่อ้างถึง)
+_assets: Dict[Tuple[str, str, float, int], Tuple[str, bytes, Tuple[Tuple[str, bytes], ...]]] = {}
+_assets_lock = threading.Lock()
+
+
+def asset_mime_type(name: str) -> str:
+    """
+    Return the MIME type of an asset file name
+
+    Args:
+        name (str): File name
+
+    Returns:
+        str: MIME type (application/octet-stream if unknown)
+    """
+    ext = os.path.splitext(name)[1].lower()
+    return ASSET_MIME_TYPES.get(ext) or mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+def load_manifest(vendor_dir: str) -> Dict[str, str]:
+    """
+    Read the manifest of a vendor directory
+
+    Args:
+        vendor_dir (str): Directory created by ``vendor_assets``
+
+    Returns:
+        Dict[str, str]: URL -> file name in ``vendor_dir`` (empty if missing or unreadable)
+    """
+    try:
+        manifest = json_load_file(os.path.join(vendor_dir, MANIFEST_NAME))
+        return manifest if isinstance(manifest, dict) else {}
+    except Exception as e:
+        logger.warning(f"Vendored assets not available in {vendor_dir}: {str(e)}")
+        return {}
+
+
+def _download(url: str) -> bytes:
+    """Fetch a URL"""
+    request = urllib.request.Request(url, headers={"User-Agent": VENDOR_USER_AGENT})
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return response.read()
+
+
+def vendor_assets(vendor_dir: str, assets: Optional[Dict[str, str]] = None) -> int:
+    """
+    Download the CDN assets of the templates, and the files their CSS refers to, into a directory
+
+    Args:
+        vendor_dir (str): Output directory (an existing manifest is extended)
+        assets (Optional[Dict[str, str]]): URL -> file name (default: ``VENDOR_ASSETS``)
+
+    Returns:
+        int: Number of downloaded files
+    """
+    if assets is None:
+        assets = VENDOR_ASSETS
+    os.makedirs(vendor_dir, exist_ok=True)
+    manifest = load_manifest(vendor_dir) if os.path.exists(os.path.join(vendor_dir, MANIFEST_NAME)) else {}
+    used = {name: url for url, name in manifest.items()}
+
+    def store(url: str, name: str, content: bytes) -> None:
+        with open(os.path.join(vendor_dir, name), 'wb') as f:
+            f.write(content)
+        manifest[url] = name
+        used[name] = url
+        logger.debug(f"Vendored {url} -> {name}")
+
+    count = 0
+    for url, name in assets.items():
+        content = _download(url)
+        store(url, name, content)
+        count += 1
+        if not name.endswith(".css"):
+            continue
+
+        # font/รูปที่ CSS อ้างถึง (เก็บตาม URL ที่ไม่รวม #fragment)
+        for match in CSS_URL.finditer(content.decode('utf-8', errors='replace')):
+            ref = match.group(2).strip()
+            if ref.startswith("data:"):
+                continue
+            ref_url = urldefrag(urljoin(url, ref))[0]
+            if ref_url in manifest:
+                continue
+            ref_name = os.path.basename(urlparse(ref_url).path) or "asset"
+            if used.get(ref_name, ref_url) != ref_url:
+                ref_name = f"{hashlib.sha1(ref_url.encode()).hexdigest()[:8]}-{ref_name}"
+            store(ref_url, ref_name, _download(ref_url))
+            count += 1
+
+    json_dump_file(manifest, os.path.join(vendor_dir, MANIFEST_NAME), pretty=True)
+
+    logger.info(f"Vendored {count} assets into {vendor_dir}")
+    return count
+
+
+class AssetBundler:
+    """
+    Rewrites the asset references of a rendered page to vendored copies (inlined or shared)
+    """
+
+    def __init__(self, mode: str, template_dir: str, output_dir: str, vendor_dir: Optional[str] = None):
+        """
+        Initialize asset bundler for one report
+
+        Args:
+            mode (str): "inline" or "shared"
+            template_dir (str): Directory of the templates (base of relative asset paths)
+            output_dir (str): Directory of the report (the shared assets go to its assets/ directory)
+            vendor_dir (Optional[str]): Directory created by ``vendor_assets`` (None = only template assets)
+        """
+        self.mode = mode
+        self.template_dir = os.path.abspath(template_dir)
+        self.asset_dir = os.path.join(output_dir, SHARED_ASSET_DIR)
+        self.vendor_dir = os.path.abspath(vendor_dir) if vendor_dir else None
+        self.manifest = load_manifest(vendor_dir) if vendor_dir else {}
+        self._sources = {os.path.join(self.vendor_dir, name): url for url, name in self.manifest.items()} if vendor_dir else {}
+        # asset ที่ใส่ในหน้าแล้ว (ชื่อไฟล์ที่มี hash) และ URL ที่ไม่มีสำเนา (เตือนครั้งเดียว)
+        self._included: Set[str] = set()
+        self._missing: Set[str] = set()
+        # ตำแหน่งปัจจุบันของ stream: None (HTML), "script" หรือ "style"
+        self._raw: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, template_dir: str, output_file: str) -> Optional["AssetBundler"]:
+        """
+        Create a bundler for ReportConfig.asset_mode
+
+        Args:
+            template_dir (str): Directory of the templates
+            output_file (str): Path of the report
+
+        Returns:
+            Optional[AssetBundler]: Bundler, or None when assets stay on the CDNs
+        """
+        from INFRASTRUCTURE import config
+        mode = config.asset_mode
+        if mode not in BUNDLE_MODES:
+            if mode != "cdn":
+                logger.warning(f"Unknown asset_mode {mode!r}, linking assets from the CDNs")
+            return None
+        return cls(mode, template_dir, os.path.dirname(os.path.abspath(output_file)), config.asset_vendor_dir)
+
+    def _resolve(self, ref: str, base: Optional[str] = None) -> Optional[str]:
+        """
+        Return the file of an asset reference (vendored copy of a URL, or a local file)
+
+        Args:
+            ref (str): URL or relative path (without #fragment)
+            base (Optional[str]): URL or file the reference is relative to (None = template directory)
+
+        Returns:
+            Optional[str]: Path of the file, or None if there is no local copy
+        """
+        if base is not None and urlparse(base).scheme in ("http", "https"):
+            ref = urljoin(base, ref)
+        if ref.startswith("//"):
+            ref = f"https:{ref}"
+
+        scheme = urlparse(ref).scheme
+        if scheme in ("http", "https"):
+            name = self.manifest.get(ref)
+            if name is None:
+                if ref not in self._missing:
+                    self._missing.add(ref)
+                    logger.warning(f"Asset is not vendored, keeping the CDN link: {ref}")
+                return None
+            return os.path.join(self.vendor_dir, name)
+        if scheme:
+            return None  # data:, javascript: ฯลฯ
+
+        # path ภายใน template directory (หรือ vendor directory สำหรับ CSS ที่ vendor ไว้) เท่านั้น
+        root = os.path.dirname(base) if base is not None else self.template_dir
+        path = os.path.normpath(os.path.join(root, *urlparse(ref).path.split("/")))
+        roots = [self.template_dir] + ([self.vendor_dir] if self.vendor_dir else [])
+        if not any(os.path.commonpath([path, allowed]) == allowed for allowed in roots):
+            return None
+        return path if os.path.isfile(path) else None
+
+    def _asset(self, path: str) -> Tuple[str, bytes, Tuple[Tuple[str, bytes], ...]]:
+        """
+        Return the content-hashed file name, the content and the dependencies of an asset
+
+        The url() references of a stylesheet are rewritten first (to data: URIs or
+        to the names of their shared copies), so the hash covers the files it refers to.
+
+        Args:
+            path (str): File of the asset
+
+        Returns:
+            Tuple: (<stem>.<hash>.<ext>, content, shared files the content refers to as (name, content))
+        """
+        stat = os.stat(path)
+        key = (self.mode, path, stat.st_mtime, stat.st_size)
+        with _assets_lock:
+            asset = _assets.get(key)
+        if asset is not None:
+            return asset
+
+        with open(path, 'rb') as f:
+            content = f.read()
+        dependencies: List[Tuple[str, bytes]] = []
+        stem, ext = os.path.splitext(os.path.basename(path))
+        if ext.lower() == ".css":
+            base = self._sources.get(path, path)
+
+            def css_url(match: "re.Match") -> str:
+                ref, fragment = urldefrag(match.group(2).strip())
+                ref_path = self._resolve(ref, base)
+                if ref_path is None:
+                    if urlparse(base).scheme in ("http", "https") and not urlparse(ref).scheme:
+                        # ไฟล์ที่ไม่ได้ vendor: อ้าง URL เต็ม เพราะ stylesheet ไม่ได้อยู่ที่เดิมแล้ว
+                        return f"url({urljoin(base, match.group(2).strip())})"
+                    return match.group(0)
+                name, ref_content, ref_dependencies = self._asset(ref_path)
+                if self.mode == "inline":
+                    url = self._data_uri(name, ref_content)
+                else:
+                    url = name  # อยู่ใน assets/ เดียวกับ stylesheet
+                    dependencies.append((name, ref_content))
+                    dependencies.extend(ref_dependencies)
+                return f"url({url}{'#' + fragment if fragment else ''})"
+
+            content = CSS_URL.sub(css_url, content.decode('utf-8', errors='replace')).encode('utf-8')
+
+        asset = (f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}", content, tuple(dependencies))
+        with _assets_lock:
+            _assets[key] = asset
+        return asset
+
+    @staticmethod
+    def _data_uri(name: str, content: bytes) -> str:
+        """Return a base64 data: URI"""
+        return f"data:{asset_mime_type(name)};base64,{base64.b64encode(content).decode('ascii')}"
+
+    def _publish(self, name: str, content: bytes) -> None:
+        """Write a shared asset once (the name holds the content hash, so an existing file is up to date)"""
+        target = os.path.join(self.asset_dir, name)
+        if os.path.exists(target):
+            return
+        os.makedirs(self.asset_dir, exist_ok=True)
+        temp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, target)
+        logger.debug(f"Published shared asset: {target}")
+
+    def _reference(self, path: str) -> str:
+        """
+        Return the URL that replaces a reference to an asset
+
+        Args:
+            path (str): File of the asset
+
+        Returns:
+            str: data: URI ("inline") or path of the shared copy relative to the report ("shared")
+        """
+        name, content, dependencies = self._asset(path)
+        if self.mode == "inline":
+            return self._data_uri(name, content)
+        for dependency, dependency_content in dependencies:
+            self._publish(dependency, dependency_content)
+        self._publish(name, content)
+        return f"{SHARED_ASSET_DIR}/{name}"
+
+    def _text(self, path: str, tag: str) -> str:
+        """Return the content of an asset escaped for a <script> or <style> element"""
+        text = self._asset(path)[1].decode('utf-8', errors='replace')
+        text = re.sub(f"</({tag})", r"<\\/\1", text, flags=re.IGNORECASE)
+        return text.replace("<!--", "<\\!--") if tag == "script" else text
+
+    def _once(self, path: str) -> bool:
+        """Return True the first time an asset is included in the page"""
+        name = self._asset(path)[0]
+        if name in self._included:
+            return False
+        self._included.add(name)
+        return True
+
+    def _script_tag(self, match: "re.Match") -> str:
+        """Rewrite <script src="..."></script>"""
+        path = self._resolve(urldefrag(match.group("script_url"))[0])
+        if path is None:
+            return match.group(0)
+        if not self._once(path):
+            return ""
+
+        before, after = match.group("script_before"), match.group("script_after")
+        if self.mode == "shared" or re.search(r"\b(defer|async)\b", before + after, re.IGNORECASE):
+            # defer/async มีผลเฉพาะ script ที่มี src จึงฝังเป็น data: URI
+            return f'<script{before} src="{self._reference(path)}"{after}></script>'
+        return f"<script{before}{after}>{self._text(path, 'script')}</script>"
+
+    def _link_tag(self, match: "re.Match") -> str:
+        """Rewrite <link rel="stylesheet" href="..."> and drop preconnect hints"""
+        tag = match.group(0)
+        attributes = {key.lower(): value for key, _, value in TAG_ATTRIBUTE.findall(tag)}
+        rel = attributes.get("rel", "").lower()
+        href = attributes.get("href")
+        if not href:
+            return tag
+        if rel in ("preconnect", "dns-prefetch"):
+            return ""
+        if rel != "stylesheet":
+            return tag
+
+        path = self._resolve(urldefrag(href)[0])
+        if path is None:
+            return tag
+        if not self._once(path):
+            return ""
+        if self.mode == "shared":
+            return tag.replace(href, self._reference(path), 1)
+        return f"<style>{self._text(path, 'style')}</style>"
+
+    def _import(self, match: "re.Match") -> str:
+        """Rewrite @import url(...); inside a <style> element"""
+        path = self._resolve(urldefrag(match.group("import_url"))[0])
+        if path is None:
+            return match.group(0)
+        if not self._once(path):
+            return ""
+        if self.mode == "shared":
+            return f"@import url('{self._reference(path)}');"
+        return self._text(path, "style")
+
+    def _write(self, match: "re.Match") -> str:
+        """Rewrite document.write('<script src="..."><\\/script>') inside a script"""
+        path = self._resolve(urldefrag(match.group("write_url"))[0])
+        if path is None:
+            return match.group(0)
+        quote = match.group("wq")
+        return f'document.write({quote}<script src="{self._reference(path)}"><\\/script>{quote})'
+
+    def _rewrite_token(self, match: "re.Match") -> str:
+        """Rewrite one token according to where it appears (HTML, script or style)"""
+        kind = match.lastgroup
+        if self._raw is not None:
+            if kind == "close" and match.group("close_tag").lower() == self._raw:
+                self._raw = None
+            elif kind == "script_src" and self._raw == "script":
+                self._raw = None  # </script> ในข้อความก็ปิด script
+            elif kind == "write" and self._raw == "script":
+                return self._write(match)
+            elif kind == "import" and self._raw == "style":
+                return self._import(match)
+            return match.group(0)
+
+        if kind == "script_src":
+            return self._script_tag(match)
+        if kind == "link":
+            return self._link_tag(match)
+        if kind == "open":
+            self._raw = match.group("open_tag").lower()
+        return match.group(0)
+
+    def rewrite(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Rewrite the asset references of a page streamed in chunks
+
+        Chunks are joined into whole lines before rewriting (a tag never spans lines
+        in the templates), so memory stays bounded by the longest line.
+
+        Args:
+            chunks (Iterable[str]): Rendered page (e.g. ``Template.generate``)
+
+        Yields:
+            str: Rewritten page
+        """
+        pending = ""
+        for chunk in chunks:
+            # str() เพราะ chunk อาจเป็น Markup (การต่อ str กับ Markup จะ escape ฝั่ง str)
+            pending += str(chunk)
+            end = pending.rfind("\n") + 1
+            if end:
+                yield HTML_TOKEN.sub(self._rewrite_token, pending[:end])
+                pending = pending[end:]
+        if pending:
+            yield HTML_TOKEN.sub(self._rewrite_token, pending)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Command line entry point
+
+    Args:
+        argv (Optional[Sequence[str]]): Arguments (default: sys.argv[1:])
+
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(description="Download the CDN assets of the QA report templates for offline reports")
+    parser.add_argument("vendor_dir", help="Output directory for the vendored assets")
+    args = parser.parse_args(argv)
+
+    try:
+        count = vendor_assets(args.vendor_dir)
+    except Exception as e:
+        logger.error(f"Failed to vendor assets: {str(e)}")
+        return 1
+    print(f"Vendored {count} assets into {args.vendor_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
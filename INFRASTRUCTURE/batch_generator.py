@@ -0,0 +1,285 @@
+# INFRASTRUCTURE/batch_generator.py
+
+"""
+Batch Generator
+Generates the QA reports of many projects in a process pool from one manifest
+
+QAReportLibrary2 เก็บ data_file / defects_file / template ของโปรเจกต์เดียวเป็น state ของ instance
+จึงต้องรัน robot หนึ่งครั้งต่อโปรเจกต์ module นี้รับ manifest ของงาน (test data, defect data, output directory)
+แล้วส่งแต่ละงานเข้า process pool โดยแต่ละงานใช้ QAReportLibrary2 ของตัวเอง (Setup -> Prepare -> Generate)
+
+template ถูก precompile (ดู template_precompiler) ครั้งเดียวต่อ template directory ก่อนเริ่ม แล้วทุก worker
+โหลด module ชุดเดียวกัน แต่ละ worker สร้าง Jinja environment ครั้งเดียวและใช้ซ้ำกับทุกงานที่ได้รับ
+ค่าใน ReportConfig ของ process หลักถูกส่งต่อให้ worker (ยกเว้น render_workers ซึ่งเป็น 0 เพราะงานคือหน่วยขนานแล้ว)
+
+งานที่ล้มเหลวไม่กระทบงานอื่น: ผลของแต่ละงานมี status ("success" / "failed"), path ของรายงาน,
+error และเวลาที่ใช้ (วินาที) เรียงตามลำดับใน manifest
+
+manifest เป็นไฟล์ JSON (หรือ list) ของงาน แต่ละงานเป็น object หรือ [data_file, defects_file, output_dir]:
+    [
+        {"name": "alpha", "data_file": "alpha/TEST.json", "defects_file": "alpha/DEFECT.json",
+         "output_dir": "REPORT/alpha", "template": "TEMPLATES/base.html"},
+        ["beta/TEST.json", null, "REPORT/beta"]
+    ]
+path ที่ไม่ใช่ absolute ในไฟล์ manifest อ้างอิงจาก directory ของไฟล์ manifest
+
+วิธีใช้ (จาก root ของโปรเจกต์):
+    python -m INFRASTRUCTURE.batch_generator projects.json --template TEMPLATES/base.html --workers 8
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from UTILS import get_logger, json_load_file
+from INFRASTRUCTURE.template_precompiler import load_precompiled, precompile_templates
+
+# Setup logger
+logger = get_logger("BatchGenerator")
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# template ที่ใช้เมื่อทั้งงานและการเรียกไม่ได้ระบุ
+DEFAULT_TEMPLATE = os.path.join(_PROJECT_ROOT, "TEMPLATES", "base.html")
+
+# ค่า ReportConfig ที่ worker ไม่รับจาก process หลัก
+_WORKER_OVERRIDES = {"render_workers": 0}
+
+
+@dataclass
+class BatchJob:
+    """
+    One project of a batch
+    """
+
+    __slots__ = ("name", "data_file", "defects_file", "output_dir", "template_path")
+
+    name: str
+    data_file: str
+    defects_file: Optional[str]
+    output_dir: str
+    template_path: str
+
+
+def load_manifest(manifest: Union[str, Sequence[Any]], template_path: Optional[str] = None) -> List[BatchJob]:
+    """
+    Return the jobs of a manifest
+
+    Args:
+        manifest (Union[str, Sequence[Any]]): Path of a JSON manifest, or its list of jobs
+        template_path (Optional[str]): Template of the jobs that do not name one (None = TEMPLATES/base.html)
+
+    Returns:
+        List[BatchJob]: Jobs with absolute paths, in manifest order
+    """
+    base_dir = os.getcwd()
+    if isinstance(manifest, str):
+        base_dir = os.path.dirname(os.path.abspath(manifest))
+        manifest = json_load_file(manifest)
+    if not isinstance(manifest, (list, tuple)):
+        raise ValueError("Manifest must be a list of jobs")
+
+    def resolve(path: Optional[str]) -> Optional[str]:
+        return os.path.abspath(os.path.join(base_dir, path)) if path else None
+
+    jobs = []
+    for index, entry in enumerate(manifest, 1):
+        if isinstance(entry, dict):
+            name = entry.get("name")
+            data_file, defects_file = entry.get("data_file"), entry.get("defects_file")
+            output_dir, template = entry.get("output_dir"), entry.get("template")
+        elif isinstance(entry, (list, tuple)) and len(entry) == 3:
+            name, template = None, None
+            data_file, defects_file, output_dir = entry
+        else:
+            raise ValueError(f"Job {index}: expected an object or [data_file, defects_file, output_dir]")
+        if not data_file or not output_dir:
+            raise ValueError(f"Job {index}: data_file and output_dir are required")
+
+        output_dir = resolve(output_dir)
+        jobs.append(BatchJob(
+            name or os.path.basename(output_dir),
+            resolve(data_file),
+            resolve(defects_file),
+            output_dir,
+            resolve(template) or os.path.abspath(template_path or DEFAULT_TEMPLATE),
+        ))
+
+    # ชื่อไฟล์รายงานมี timestamp ระดับวินาที งานที่ใช้ output directory เดียวกันอาจเขียนทับกัน
+    output_dirs = [job.output_dir for job in jobs]
+    duplicates = sorted({path for path in output_dirs if output_dirs.count(path) > 1})
+    if duplicates:
+        raise ValueError(f"Jobs must have distinct output directories: {duplicates}")
+    return jobs
+
+
+def _precompile(template_dirs: Sequence[str], build_dir: str) -> Dict[str, Optional[str]]:
+    """
+    Precompile each template directory once
+
+    Args:
+        template_dirs (Sequence[str]): Distinct template directories of the jobs
+        build_dir (str): Directory for the compiled modules (one sub-directory per template directory)
+
+    Returns:
+        Dict[str, Optional[str]]: template directory -> precompiled directory (None = compile from source)
+    """
+    from INFRASTRUCTURE import config
+    precompiled = {}
+    for template_dir in template_dirs:
+        # ใช้ของที่ precompile ไว้แล้วใน config ถ้าตรงกับ template directory นี้
+        if config.precompiled_template_dir and load_precompiled(template_dir, config.precompiled_template_dir):
+            precompiled[template_dir] = config.precompiled_template_dir
+            continue
+        target_dir = os.path.join(build_dir, hashlib.sha1(template_dir.encode('utf-8')).hexdigest()[:12])
+        try:
+            precompile_templates(template_dir, target_dir)
+            precompiled[template_dir] = target_dir
+        except Exception as e:
+            logger.warning(f"Failed to precompile {template_dir}, workers compile from source: {str(e)}")
+            precompiled[template_dir] = None
+    return precompiled
+
+
+def _init_worker(settings: Dict[str, Any]) -> None:
+    """
+    Apply the ReportConfig of the parent process in a worker process
+
+    Args:
+        settings (Dict[str, Any]): ReportConfig fields
+    """
+    from INFRASTRUCTURE import config
+    for key, value in settings.items():
+        setattr(config, key, value)
+
+
+def _run_job(job: BatchJob, precompiled_dir: Optional[str]) -> Dict[str, Any]:
+    """
+    Generate the report of one job (errors are returned, not raised)
+
+    Args:
+        job (BatchJob): Job to run
+        precompiled_dir (Optional[str]): Precompiled templates of the job's template directory
+
+    Returns:
+        Dict[str, Any]: name, status, report, error, seconds
+    """
+    from INFRASTRUCTURE import config
+    from QAReportLibrary2 import QAReportLibrary2
+
+    started = time.perf_counter()
+    result = {"name": job.name, "status": "failed", "report": "", "error": None, "seconds": 0.0}
+    try:
+        config.precompiled_template_dir = precompiled_dir
+        library = QAReportLibrary2()
+        library.setup_qa_report(job.data_file, job.template_path, job.output_dir, job.defects_file)
+        library.prepare_report_data()
+        report = library.generate_report(job.output_dir)
+        if report:
+            result.update(status="success", report=report)
+        else:
+            result["error"] = "Report generation failed (see the log)"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {str(e)}"
+        logger.debug(traceback.format_exc())
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def generate_reports(manifest: Union[str, Sequence[Any]], template_path: Optional[str] = None,
+                     workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Generate the reports of every job of a manifest in a process pool
+
+    Args:
+        manifest (Union[str, Sequence[Any]]): Path of a JSON manifest, or its list of jobs
+        template_path (Optional[str]): Template of the jobs that do not name one (None = TEMPLATES/base.html)
+        workers (Optional[int]): Worker processes (None = ReportConfig.batch_workers, 0 = CPU count, 1 = in process)
+
+    Returns:
+        List[Dict[str, Any]]: Result of each job in manifest order (name, status, report, error, seconds)
+    """
+    from INFRASTRUCTURE import config
+    jobs = load_manifest(manifest, template_path)
+    if not jobs:
+        logger.warning("Manifest has no jobs")
+        return []
+    if workers is None:
+        workers = config.batch_workers
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+
+    started = time.perf_counter()
+    build_dir = tempfile.mkdtemp(prefix="qa_report_batch_")
+    try:
+        precompiled = _precompile(sorted({os.path.dirname(job.template_path) for job in jobs}), build_dir)
+        precompiled_dirs = [precompiled[os.path.dirname(job.template_path)] for job in jobs]
+        logger.info(f"Generating {len(jobs)} reports with {workers} worker(s)")
+
+        if workers <= 1:
+            saved = config.precompiled_template_dir
+            try:
+                results = [_run_job(job, precompiled_dir) for job, precompiled_dir in zip(jobs, precompiled_dirs)]
+            finally:
+                config.precompiled_template_dir = saved
+        else:
+            settings = dict(vars(config), **_WORKER_OVERRIDES)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(settings,)) as executor:
+                futures = [executor.submit(_run_job, job, precompiled_dir)
+                           for job, precompiled_dir in zip(jobs, precompiled_dirs)]
+                results = []
+                for job, future in zip(jobs, futures):
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        # worker ตาย (เช่น หน่วยความจำไม่พอ) ระหว่างงานนี้
+                        results.append({"name": job.name, "status": "failed", "report": "",
+                                        "error": f"{type(e).__name__}: {str(e)}", "seconds": 0.0})
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+    for result in results:
+        if result["status"] == "success":
+            logger.info(f"[{result['name']}] {result['report']} ({result['seconds']}s)")
+        else:
+            logger.error(f"[{result['name']}] {result['error']} ({result['seconds']}s)")
+    failed = sum(1 for result in results if result["status"] != "success")
+    logger.info(f"Generated {len(results) - failed}/{len(results)} reports in {time.perf_counter() - started:.2f}s")
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Command line entry point
+
+    Args:
+        argv (Optional[Sequence[str]]): Arguments (default: sys.argv[1:])
+
+    Returns:
+        int: Exit code (1 if a job failed)
+    """
+    parser = argparse.ArgumentParser(description="Generate the QA reports of every project of a manifest")
+    parser.add_argument("manifest", help="JSON list of {name, data_file, defects_file, output_dir, template} jobs")
+    parser.add_argument("--template", help="Template of the jobs that do not name one (default: TEMPLATES/base.html)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    try:
+        results = generate_reports(args.manifest, args.template, args.workers)
+    except Exception as e:
+        logger.error(f"Failed to run the batch: {str(e)}")
+        return 1
+    for result in results:
+        print(f"{result['status']:<8} {result['seconds']:>8.2f}s  {result['name']}  {result['report'] or result['error']}")
+    return 0 if all(result["status"] == "success" for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -33,6 +33,60 @@ class ReportConfig:
     enable_caching: bool = True
     cache_duration: int = 3600  # 1 hour in seconds
     
+    # Defect status / severity vocabulary (None = defaults in INFRASTRUCTURE.vocabulary):
+    # {"open": [...], "in_review": [...], "closed": [...]} and {level: [...]} ordered from the most severe
+    status_vocabulary: Optional[Dict[str, List[str]]] = None
+    severity_vocabulary: Optional[Dict[str, List[str]]] = None
+    
+    # Incremental defect statistics (None = recompute from every export)
+    defect_snapshot_file: Optional[str] = None
+    
+    # On-disk cache of prepared report sections (None = disabled)
+    section_cache_dir: Optional[str] = None
+    
+    # Compiled Jinja template (bytecode) cache directory (None = per-user temp directory)
+    template_cache_dir: Optional[str] = None
+    
+    # Templates precompiled into Python modules (see INFRASTRUCTURE.template_precompiler)
+    precompiled_template_dir: Optional[str] = None
+    
+    # Write the rendered report gzip-compressed (qa_report_*.html.gz)
+    compress_report: bool = False
+    
+    # Worker processes for parallel section rendering (0 or 1 = render in process)
+    render_workers: int = 0
+    
+    # Worker processes for batch generation of many projects (0 = CPU count, 1 = one job at a time in process)
+    batch_workers: int = 0
+    
+    # Cache of rendered section fragments (None = disabled)
+    fragment_cache_dir: Optional[str] = None
+    
+    # Rows of the defect list: "html" (rendered into the page), "inline" (columnar JSON in the page,
+    # rendered by the browser page by page) or "sidecar" (the same JSON in <report>.defects.js)
+    defect_table_mode: str = "html"
+    
+    # Chart series stored as differences from the previous value (smaller payload for long trends)
+    chart_delta_encoding: bool = False
+    
+    # Third-party assets (Tailwind, Alpine, Chart.js, icon fonts): "cdn" (linked from the CDNs), "inline"
+    # (vendored copies embedded in the page) or "shared" (one content-hashed copy in <output dir>/assets/)
+    asset_mode: str = "cdn"
+    
+    # Tailwind CSS built by INFRASTRUCTURE.tailwind_builder (None = Tailwind Play CDN script)
+    tailwind_css_file: Optional[str] = None
+    
+    # Vendored assets for "inline"/"shared" (see INFRASTRUCTURE.asset_bundler; None = template assets only)
+    asset_vendor_dir: Optional[str] = None
+    
+    # JSON library for every read and write: "auto" (orjson, msgspec or ujson if installed, else the
+    # standard library) or one of UTILS.JSON_BACKENDS
+    json_backend: str = "auto"
+    
+    # Decode defect exports with a schema of the fields the report uses (see DefectDataLoader.DEFECT_FIELDS);
+    # the other fields are skipped while parsing when msgspec is installed
+    json_schema_decode: bool = False
+    
     # Logging configuration
     log_level: str = 'INFO'
     log_to_file: bool = False
@@ -0,0 +1,166 @@
+# INFRASTRUCTURE/dataset_cache.py
+
+"""
+Dataset Cache
+Shared parse-once store for the JSON inputs of a report run
+
+ทุก keyword และทุก prepare function อ่าน TEST_SUMERY.json / DEFECT.json ผ่าน object เดียวกันนี้
+ไฟล์แต่ละไฟล์จะถูก parse เพียงครั้งเดียว (key = path, mtime, size) และถูก invalidate เมื่อไฟล์เปลี่ยน
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from UTILS import get_logger, json_load_file
+
+# Setup logger
+logger = get_logger("DatasetCache")
+
+FileSignature = Tuple[str, int, int]
+
+
+class DatasetCache:
+    """
+    Parse-once cache for JSON data files keyed by (path, mtime, size)
+    """
+
+    def __init__(self):
+        """Initialize dataset cache"""
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def signature(file_path: str) -> FileSignature:
+        """
+        Build the cache signature of a file
+
+        Args:
+            file_path (str): Path to data file
+
+        Returns:
+            FileSignature: (absolute path, mtime in ns, size in bytes)
+        """
+        abspath = os.path.abspath(file_path)
+        stat = os.stat(abspath)
+        return abspath, stat.st_mtime_ns, stat.st_size
+
+    def _entry(self, file_path: str) -> Dict[str, Any]:
+        """
+        Return the cache entry of a file, dropping it if the file has changed
+        """
+        sig = self.signature(file_path)
+        entry = self._entries.get(sig[0])
+        if entry is None or entry["signature"] != sig:
+            if entry is not None:
+                logger.info(f"Data file changed, invalidating cache: {sig[0]}")
+            entry = {"signature": sig, "derived": {}}
+            self._entries[sig[0]] = entry
+        return entry
+
+    def read_json(self, file_path: str) -> Any:
+        """
+        Parse a JSON file once per (path, mtime, size)
+
+        Args:
+            file_path (str): Path to JSON file
+
+        Returns:
+            Any: Parsed JSON document (shared, do not mutate unless intended)
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            JSONDecodeError: If the file is not valid JSON
+        """
+        with self._lock:
+            entry = self._entry(file_path)
+            if "data" not in entry:
+                entry["data"] = json_load_file(entry["signature"][0])
+                logger.info(f"Parsed data file: {entry['signature'][0]}")
+            return entry["data"]
+
+    def derive(self, file_path: str, name: str, builder: Callable[[Any], Any]) -> Any:
+        """
+        Build (once) a value derived from a parsed JSON file
+
+        The derived value shares the file signature, so it is rebuilt only
+        when the underlying file changes.
+
+        Args:
+            file_path (str): Path to JSON file
+            name (str): Name of the derived value (e.g. "defects")
+            builder (Callable[[Any], Any]): Function that builds the value from the parsed document
+
+        Returns:
+            Any: Derived value
+        """
+        with self._lock:
+            entry = self._entry(file_path)
+            derived = entry["derived"]
+            if name not in derived:
+                derived[name] = builder(self.read_json(file_path))
+            return derived[name]
+
+    def decode(self, file_path: str, name: str, decoder: Callable[[bytes], Any]) -> Any:
+        """
+        Decode (once) a JSON file with its own decoder instead of the shared parse
+
+        ใช้กับ decode ที่เลือกเฉพาะบาง field (เช่น json_decode_records) ซึ่งถูกกว่าการ parse ทั้งเอกสาร
+        ผลลัพธ์ใช้ signature เดียวกับไฟล์ จึงถูกสร้างใหม่เมื่อไฟล์เปลี่ยนเท่านั้น
+
+        Args:
+            file_path (str): Path to JSON file
+            name (str): Name of the decoded value (e.g. "defects:schema")
+            decoder (Callable[[bytes], Any]): Function that decodes the raw file content
+
+        Returns:
+            Any: Decoded value
+        """
+        with self._lock:
+            entry = self._entry(file_path)
+            derived = entry["derived"]
+            if name not in derived:
+                with open(entry["signature"][0], 'rb') as f:
+                    derived[name] = decoder(f.read())
+                logger.info(f"Decoded data file ({name}): {entry['signature'][0]}")
+            return derived[name]
+
+    def build(self, file_path: str, name: str, builder: Callable[[str], Any]) -> Any:
+        """
+        Build (once) a value straight from a file, without the shared parse
+
+        ใช้กับค่าที่สร้างจากการอ่านไฟล์แบบ stream (เช่น DefectTable จาก DefectDataLoader.iter_defects)
+        เอกสารทั้งหมดจึงไม่ต้องอยู่ในหน่วยความจำ ผลลัพธ์ใช้ signature เดียวกับไฟล์ จึงถูกสร้างใหม่เมื่อไฟล์เปลี่ยนเท่านั้น
+
+        Args:
+            file_path (str): Path to data file
+            name (str): Name of the built value (e.g. "defect_table")
+            builder (Callable[[str], Any]): Function that builds the value from the absolute file path
+
+        Returns:
+            Any: Built value
+        """
+        with self._lock:
+            entry = self._entry(file_path)
+            derived = entry["derived"]
+            if name not in derived:
+                derived[name] = builder(entry["signature"][0])
+                logger.info(f"Built data file ({name}): {entry['signature'][0]}")
+            return derived[name]
+
+    def invalidate(self, file_path: Optional[str] = None) -> None:
+        """
+        Drop cached data for one file or for every file
+
+        Args:
+            file_path (Optional[str]): Path to data file, or None to clear everything
+        """
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(file_path), None)
+
+
+# Shared instance used by every loader, keyword and prepare function
+dataset_cache = DatasetCache()
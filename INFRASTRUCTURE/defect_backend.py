@@ -0,0 +1,256 @@
+# INFRASTRUCTURE/defect_backend.py
+
+"""
+Defect Backend
+Batch kernels over DefectTable columns, with an optional NumPy implementation
+
+ถ้า import NumPy ได้จะเลือก NumpyBackend อัตโนมัติ (bincount / unique แทนการวนลูปทีละแถว)
+ถ้าไม่มี NumPy จะใช้ PythonBackend ซึ่งให้ผลลัพธ์เหมือนกันทุกไบต์
+ทุก method คืนค่าเป็น type มาตรฐานของ Python (dict, list, int) เพื่อให้ analyzer ไม่ต้องรู้ว่าใช้ backend ใด
+"""
+
+from array import array
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from UTILS import get_logger
+
+try:
+    import numpy as np
+except ImportError:  # NumPy เป็น dependency เสริม
+    np = None
+
+# Setup logger
+logger = get_logger("DefectBackend")
+
+GroupTotals = Dict[int, Tuple[int, int, int]]
+
+
+class PythonBackend:
+    """
+    Pure-Python kernels (reference implementation)
+    """
+
+    name = "python"
+
+    def count(self, codes: array) -> Dict[int, int]:
+        """
+        Count rows per code, in first-occurrence (= ascending code) order
+
+        Args:
+            codes (array): Code column of a DefectTable
+
+        Returns:
+            Dict[int, int]: code -> number of rows
+        """
+        return dict(Counter(codes))
+
+    def select(self, codes: array, flags: Sequence[Any]) -> List[int]:
+        """
+        Return the rows whose code is flagged
+
+        Args:
+            codes (array): Code column
+            flags (Sequence[Any]): Truthy flag per code
+
+        Returns:
+            List[int]: Row indices in ascending order
+        """
+        return [row for row, code in enumerate(codes) if flags[code]]
+
+    def resolution_days(self, rows: Sequence[int], reported: array, closed: array,
+                        today: Optional[int] = None) -> Tuple[List[int], List[int]]:
+        """
+        Compute resolution days (closed - reported) for the given rows
+
+        Day ordinals follow DefectTable.day_ordinals: 0 = empty, -1 = not parseable.
+        Rows without a reported date or with an unparseable date are dropped;
+        rows without a closed date use ``today`` (or are dropped if it is None).
+
+        Args:
+            rows (Sequence[int]): Candidate rows
+            reported (array): Reported day ordinal per row
+            closed (array): Closed day ordinal per row
+            today (Optional[int]): Day ordinal used for rows that are still open
+
+        Returns:
+            Tuple[List[int], List[int]]: (rows kept, resolution days) in row order
+        """
+        kept_rows = []
+        days = []
+        for row in rows:
+            reported_day = reported[row]
+            closed_day = closed[row]
+            if reported_day <= 0 or closed_day < 0:
+                continue
+            if closed_day == 0:
+                if today is None:
+                    continue
+                closed_day = today
+            kept_rows.append(row)
+            days.append(closed_day - reported_day)
+        return kept_rows, days
+
+    def group_totals(self, codes: array, group_of_code: Sequence[int], rows: Sequence[int],
+                     values: Sequence[int], limits: Optional[Sequence[int]] = None) -> GroupTotals:
+        """
+        Aggregate integer values per group of the given rows
+
+        Args:
+            codes (array): Code column that defines the groups
+            group_of_code (Sequence[int]): Group id of each code
+            rows (Sequence[int]): Rows to aggregate
+            values (Sequence[int]): One value per row in ``rows``
+            limits (Optional[Sequence[int]]): Per-group limit for the "within" count
+
+        Returns:
+            GroupTotals: group id -> (count, sum, count of values <= limit), in first-occurrence order
+        """
+        totals: Dict[int, List[int]] = {}
+        for row, value in zip(rows, values):
+            group = group_of_code[codes[row]]
+            entry = totals.get(group)
+            if entry is None:
+                entry = totals[group] = [0, 0, 0]
+            entry[0] += 1
+            entry[1] += value
+            if limits is not None and value <= limits[group]:
+                entry[2] += 1
+        return {group: tuple(entry) for group, entry in totals.items()}
+
+    def combinations(self, columns: Sequence[Sequence[int]],
+                     weights: Optional[Sequence[int]] = None) -> Dict[Tuple[int, ...], int]:
+        """
+        Count each distinct combination of codes across several columns
+
+        Args:
+            columns (Sequence[Sequence[int]]): Code columns of equal length
+            weights (Optional[Sequence[int]]): Weight per row (1 if not given)
+
+        Returns:
+            Dict[Tuple[int, ...], int]: combination -> total weight, in first-occurrence order
+        """
+        if weights is None:
+            return dict(Counter(zip(*columns)))
+        totals: Dict[Tuple[int, ...], int] = {}
+        for cell, weight in zip(zip(*columns), weights):
+            totals[cell] = totals.get(cell, 0) + weight
+        return totals
+
+
+class NumpyBackend(PythonBackend):
+    """
+    NumPy kernels (bincount / unique over whole columns)
+    """
+
+    name = "numpy"
+
+    @staticmethod
+    def _ints(values: Sequence[int]) -> "np.ndarray":
+        if isinstance(values, array):
+            return np.frombuffer(values, dtype=np.uint32 if values.typecode == 'I' else np.int32).astype(np.int64)
+        return np.asarray(values, dtype=np.int64)
+
+    def count(self, codes: array) -> Dict[int, int]:
+        if not len(codes):
+            return {}
+        counts = np.bincount(self._ints(codes))
+        present = np.flatnonzero(counts)
+        return dict(zip(present.tolist(), counts[present].tolist()))
+
+    def select(self, codes: array, flags: Sequence[Any]) -> List[int]:
+        if not len(codes):
+            return []
+        mask = np.asarray([bool(flag) for flag in flags], dtype=bool)[self._ints(codes)]
+        return np.flatnonzero(mask).tolist()
+
+    def resolution_days(self, rows: Sequence[int], reported: array, closed: array,
+                        today: Optional[int] = None) -> Tuple[List[int], List[int]]:
+        rows_np = self._ints(rows)
+        if not len(rows_np):
+            return [], []
+        reported_days = self._ints(reported)[rows_np]
+        closed_days = self._ints(closed)[rows_np]
+        if today is not None:
+            closed_days = np.where(closed_days == 0, today, closed_days)
+        keep = (reported_days > 0) & (closed_days > 0)
+        return rows_np[keep].tolist(), (closed_days[keep] - reported_days[keep]).tolist()
+
+    def group_totals(self, codes: array, group_of_code: Sequence[int], rows: Sequence[int],
+                     values: Sequence[int], limits: Optional[Sequence[int]] = None) -> GroupTotals:
+        if not len(rows):
+            return {}
+        groups = np.asarray(group_of_code, dtype=np.int64)[self._ints(codes)[self._ints(rows)]]
+        values_np = self._ints(values)
+        # เรียง group ตามลำดับที่พบครั้งแรก แล้วรวมด้วย bincount
+        labels, first_index, inverse = np.unique(groups, return_index=True, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(labels))
+        sums = np.bincount(inverse, weights=values_np, minlength=len(labels))
+        within = np.zeros(len(labels))
+        if limits is not None:
+            inside = values_np <= np.asarray(limits, dtype=np.int64)[groups]
+            within = np.bincount(inverse, weights=inside, minlength=len(labels))
+        return {
+            int(labels[i]): (int(counts[i]), int(sums[i]), int(within[i]))
+            for i in np.argsort(first_index, kind="stable").tolist()
+        }
+
+    def combinations(self, columns: Sequence[Sequence[int]],
+                     weights: Optional[Sequence[int]] = None) -> Dict[Tuple[int, ...], int]:
+        if not columns or not len(columns[0]):
+            return {}
+        matrix = np.stack([self._ints(column) for column in columns], axis=1)
+        # รวมรหัสทีละ column เป็นเลขเดียว (mixed radix) ถ้าใกล้เกิน int64 ให้ย่อเลขด้วย unique ก่อน
+        keys = np.zeros(len(matrix), dtype=np.int64)
+        size = 1
+        for column in matrix.T:
+            radix = int(column.max()) + 1
+            if size * radix >= 2 ** 62:
+                _, keys = np.unique(keys, return_inverse=True)
+                keys = keys.reshape(-1).astype(np.int64)
+                size = int(keys.max()) + 1
+            keys = keys * radix + column
+            size *= radix
+        _, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        totals = np.bincount(inverse, weights=None if weights is None else self._ints(weights))
+        order = np.argsort(first_index, kind="stable")
+        cells = matrix[first_index[order]].tolist()
+        return dict(zip(map(tuple, cells), totals[order].astype(np.int64).tolist()))
+
+
+_BACKENDS = {"python": PythonBackend}
+if np is not None:
+    _BACKENDS["numpy"] = NumpyBackend
+
+_backend: PythonBackend = (NumpyBackend if np is not None else PythonBackend)()
+
+
+def get_backend() -> PythonBackend:
+    """
+    Return the active backend (NumPy when importable, otherwise pure Python)
+    """
+    return _backend
+
+
+def set_backend(name: str = "auto") -> PythonBackend:
+    """
+    Select the backend used by the defect analyzers
+
+    Args:
+        name (str): "numpy", "python" or "auto"
+
+    Returns:
+        PythonBackend: The active backend
+
+    Raises:
+        ValueError: If the backend is unknown or NumPy is not installed
+    """
+    global _backend
+    if name == "auto":
+        name = "numpy" if np is not None else "python"
+    if name not in _BACKENDS:
+        raise ValueError(f"Backend not available: {name}")
+    _backend = _BACKENDS[name]()
+    logger.info(f"Defect compute backend: {name}")
+    return _backend
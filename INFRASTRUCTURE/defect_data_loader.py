@@ -5,20 +5,37 @@ Defect Data Loader
 Responsible for loading defect data JSON files
 """
 
-import json
 import os
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator
 
-from UTILS import get_logger
+from UTILS import get_logger, JSONDecodeError, json_loads, json_decode_records
+from INFRASTRUCTURE.dataset_cache import dataset_cache
+from INFRASTRUCTURE.json_stream import JsonStream, DEFAULT_CHUNK_SIZE
+from INFRASTRUCTURE.defect_table import DefectTable, DATE_FIELDS
+from INFRASTRUCTURE.defect_statistics import STAT_FIELDS
 
 # Setup logger
 logger = get_logger("DefectDataLoader")
 
+# field ของ defect ที่รายงานใช้ (schema ของ decode เมื่อเปิด ReportConfig.json_schema_decode)
+DEFECT_FIELDS = tuple(dict.fromkeys(
+    ("id", "issueId", "title", "summary", "description", "resolution") + STAT_FIELDS + DATE_FIELDS
+))
+
 class DefectDataLoader:
     """
     Loader for Defect Data JSON Files
     """
 
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initialize defect data loader
+        
+        Args:
+            chunk_size (int): Characters read per chunk in streaming mode
+        """
+        self.chunk_size = chunk_size
+
     def load(self, file_path: str) -> Optional[List[Dict[str, Any]]]:
         """
         Load and parse defect data JSON file
@@ -34,49 +51,210 @@ class DefectDataLoader:
             return None
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                logger.info(f"Defect data loaded successfully from: {file_path}")
-            
-            # รองรับหลากหลายรูปแบบข้อมูล
-            # 1. ถ้าเป็น list อยู่แล้ว ให้ใช้เลย
-            if isinstance(data, list):
-                return data
-                
-            # 2. ถ้าเป็น dict และมี key "defects" ให้ใช้ค่าของ key นี้
-            if isinstance(data, dict):
-                if "defects" in data and isinstance(data["defects"], list):
-                    return data["defects"]
-                    
-                # 3. ถ้าไม่มี key "defects" แต่มี key อื่นๆ ที่เป็น list ให้เลือก key แรกที่เป็น list
-                for key, value in data.items():
-                    if isinstance(value, list) and value:
-                        logger.info(f"Using '{key}' field as defects data")
-                        return value
-                        
-                # 4. ถ้าไม่มี key ที่เป็น list ให้แปลงเป็น list แต่ละ item เป็น dict
-                if data:
-                    # แปลง dict เป็น list of dict items
-                    defects_list = []
-                    for key, value in data.items():
-                        if isinstance(value, dict):
-                            # ถ้า value เป็น dict ก็เพิ่ม key เข้าไปในนั้น
-                            value['id'] = key
-                            defects_list.append(value)
-                        else:
-                            # ถ้า value ไม่ใช่ dict ก็สร้าง dict ใหม่
-                            defects_list.append({'id': key, 'data': value})
-                    if defects_list:
-                        logger.info(f"Converted dictionary to list of {len(defects_list)} defects")
-                        return defects_list
+            # parse ไฟล์เพียงครั้งเดียวต่อ (path, mtime, size) และใช้ผลลัพธ์ร่วมกันทุก keyword
+            if self._schema_decode():
+                defects = dataset_cache.decode(file_path, "defects:schema", self.decode_schema)
+            else:
+                defects = dataset_cache.derive(file_path, "defects", self.normalize)
+            logger.info(f"Defect data loaded successfully from: {file_path}")
+            return defects
             
-            # ถ้าไม่ตรงกับรูปแบบใดเลย ให้ warning และส่งค่า list ว่างกลับไป
-            logger.warning(f"Defect data should be a list: {file_path}")
-            return []
-            
-        except json.JSONDecodeError as e:
+        except JSONDecodeError as e:
             logger.error(f"Failed to parse JSON from {file_path}: {str(e)}")
             return None
         except Exception as e:
             logger.error(f"Unexpected error while loading defect data: {str(e)}")
             return None
+
+    def load_table(self, file_path: str) -> Optional[DefectTable]:
+        """
+        Load defect data as a columnar DefectTable
+        
+        The table is built once per file version and shared through the dataset cache.
+        Defects are streamed into the table with ``iter_defects``, so the parsed
+        export is never held in memory as a whole (with ReportConfig.json_schema_decode
+        the table is built from the schema-decoded defects, which are not cached themselves).
+        
+        Args:
+            file_path (str): Path to defect data JSON file
+        
+        Returns:
+            Optional[DefectTable]: Defect table or None if failed
+        """
+        if not os.path.exists(file_path):
+            logger.error(f"Defect data file not found: {file_path}")
+            return None
+        
+        try:
+            # แปลงวันที่ทุกค่าครั้งเดียวตอนสร้างตาราง แล้วทุก analyzer ใช้ผลลัพธ์ร่วมกัน
+            if self._schema_decode():
+                return dataset_cache.decode(
+                    file_path, "defect_table:schema",
+                    lambda data: DefectTable.from_records(self.decode_schema(data)).normalize_dates()
+                )
+            return dataset_cache.build(
+                file_path, "defect_table", lambda path: DefectTable.from_records(self.iter_defects(path)).normalize_dates()
+            )
+        except JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON from {file_path}: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error while building defect table: {str(e)}")
+            return None
+
+    def iter_defects(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream defects from a JSON file one at a time
+        
+        Walks the defect array incrementally so peak memory does not grow
+        with the size of the export. Supports the same layouts as ``load``:
+        a bare list, the "defects" key, the first non-empty list-valued key,
+        and a dict of defects keyed by id.
+        
+        Args:
+            file_path (str): Path to defect data JSON file
+        
+        Yields:
+            Dict[str, Any]: One defect at a time
+        
+        Raises:
+            JSONDecodeError: If the file is not valid JSON
+        """
+        if not os.path.exists(file_path):
+            logger.error(f"Defect data file not found: {file_path}")
+            return
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            stream = JsonStream(f, self.chunk_size)
+            first = stream.peek()
+            
+            # 1. ถ้าเป็น list อยู่แล้ว ให้ใช้เลย
+            if first == "[":
+                for _ in stream.iter_array():
+                    yield stream.decode_value()
+                return
+            
+            if first != "{":
+                logger.warning(f"Defect data should be a list: {file_path}")
+                return
+            
+            # 2. ถ้ามี key "defects" ที่เป็น list ให้ stream key นี้ทันที
+            #    ระหว่างทางจดจำ key แรกที่เป็น list ที่ไม่ว่างไว้เป็นทางเลือกสำรอง
+            fallback_key = None
+            has_members = False
+            for key in stream.iter_object():
+                has_members = True
+                if stream.peek() != "[":
+                    stream.skip_value()
+                    continue
+                if key == "defects":
+                    for _ in stream.iter_array():
+                        yield stream.decode_value()
+                    return
+                non_empty = False
+                for _ in stream.iter_array():
+                    non_empty = True
+                    stream.skip_value()
+                if non_empty and fallback_key is None:
+                    fallback_key = key
+        
+        if not has_members:
+            logger.warning(f"Defect data should be a list: {file_path}")
+            return
+        
+        # รอบที่สอง: อ่านไฟล์อีกครั้งเพื่อ stream ข้อมูลตามรูปแบบสำรอง
+        with open(file_path, 'r', encoding='utf-8') as f:
+            stream = JsonStream(f, self.chunk_size)
+            
+            # 3. ใช้ key แรกที่เป็น list
+            if fallback_key is not None:
+                logger.info(f"Using '{fallback_key}' field as defects data")
+                for key in stream.iter_object():
+                    if key != fallback_key:
+                        stream.skip_value()
+                        continue
+                    for _ in stream.iter_array():
+                        yield stream.decode_value()
+                    return
+                return
+            
+            # 4. แปลง dict เป็น list of dict items
+            logger.info("Converting dictionary members to defects")
+            for key in stream.iter_object():
+                value = stream.decode_value()
+                if isinstance(value, dict):
+                    value['id'] = key
+                    yield value
+                else:
+                    yield {'id': key, 'data': value}
+
+    @staticmethod
+    def _schema_decode() -> bool:
+        """Return ReportConfig.json_schema_decode"""
+        from INFRASTRUCTURE import config
+        return config.json_schema_decode
+
+    @classmethod
+    def decode_schema(cls, data: bytes) -> List[Dict[str, Any]]:
+        """
+        Decode a defect export keeping only DEFECT_FIELDS of each defect
+        
+        Args:
+            data (bytes): Content of the defect data JSON file
+        
+        Returns:
+            List[Dict[str, Any]]: Defect list (as ``normalize``)
+        """
+        # 1. list หรือ 2. key "defects": ข้าม field ที่รายงานไม่ใช้ตั้งแต่ตอน parse
+        defects = json_decode_records(data, DEFECT_FIELDS, "defects")
+        if defects is not None:
+            return defects
+        # รูปแบบอื่น (key แรกที่เป็น list, dict ของ defect): decode ทั้งเอกสารแล้ว normalize ตามปกติ
+        return cls.normalize(json_loads(data))
+
+    @staticmethod
+    def normalize(data: Any) -> List[Dict[str, Any]]:
+        """
+        Normalize a parsed defect document into a list of defects
+        
+        Args:
+            data (Any): Parsed JSON document
+        
+        Returns:
+            List[Dict[str, Any]]: Defect list (empty if the format is not recognized)
+        """
+        # รองรับหลากหลายรูปแบบข้อมูล
+        # 1. ถ้าเป็น list อยู่แล้ว ให้ใช้เลย
+        if isinstance(data, list):
+            return data
+            
+        # 2. ถ้าเป็น dict และมี key "defects" ให้ใช้ค่าของ key นี้
+        if isinstance(data, dict):
+            if "defects" in data and isinstance(data["defects"], list):
+                return data["defects"]
+                
+            # 3. ถ้าไม่มี key "defects" แต่มี key อื่นๆ ที่เป็น list ให้เลือก key แรกที่เป็น list
+            for key, value in data.items():
+                if isinstance(value, list) and value:
+                    logger.info(f"Using '{key}' field as defects data")
+                    return value
+                    
+            # 4. ถ้าไม่มี key ที่เป็น list ให้แปลงเป็น list แต่ละ item เป็น dict
+            if data:
+                # แปลง dict เป็น list of dict items
+                defects_list = []
+                for key, value in data.items():
+                    if isinstance(value, dict):
+                        # ถ้า value เป็น dict ก็เพิ่ม key เข้าไปในนั้น
+                        value['id'] = key
+                        defects_list.append(value)
+                    else:
+                        # ถ้า value ไม่ใช่ dict ก็สร้าง dict ใหม่
+                        defects_list.append({'id': key, 'data': value})
+                if defects_list:
+                    logger.info(f"Converted dictionary to list of {len(defects_list)} defects")
+                    return defects_list
+        
+        # ถ้าไม่ตรงกับรูปแบบใดเลย ให้ warning และส่งค่า list ว่างกลับไป
+        logger.warning("Defect data should be a list")
+        return []
@@ -0,0 +1,225 @@
+# INFRASTRUCTURE/defect_snapshot.py
+
+"""
+Defect Snapshot
+Persisted defect statistics refreshed with only the delta of each new export
+
+สถิติรวม (DefectStatistics) ของ export ก่อนหน้าถูกบันทึกเป็นไฟล์ JSON พร้อม cell และ hash ของเนื้อหาของแต่ละ issueId
+เมื่อได้ export ใหม่ จะเทียบ hash ทีละ issueId แล้วปรับเฉพาะส่วนที่เปลี่ยน: defect ที่ hash เท่าเดิมใช้ cell เดิม
+(ไม่ต้อง intern field สถิติใหม่) ส่วน defect ใหม่ถูกเพิ่ม, defect ที่เนื้อหาเปลี่ยนถูกคำนวณ cell ใหม่และย้าย cell
+และ defect ที่หายไปถูกลบ ตัวนับ, ผลรวมเวลาแก้ไข, SLA และ histogram รายวันทั้งหมดเป็น projection ของ cell
+จึงถูกต้องตามไปด้วย category ที่ไม่มี defect ใช้แล้วถูกตัดออกก่อนบันทึก snapshot จึงไม่โตขึ้นเรื่อยๆ
+และ snapshot ถูกเขียนใหม่เฉพาะเมื่อมีการเปลี่ยนแปลง
+
+``attach`` ทำให้สถิติที่ได้จาก snapshot เป็นสถิติรวมของ DefectTable (``DefectStatistics.of``)
+ทุก prepare ที่รับตารางนั้นจึงใช้สถิติจาก snapshot โดยไม่ต้องรู้จัก snapshot
+
+ถ้า export ไม่มี issueId ครบหรือมี issueId ซ้ำ จะนับใหม่ทั้งหมดจาก export นั้น (full rebuild)
+ลำดับ cell ของ snapshot เป็นลำดับที่ถูกเพิ่มเข้า snapshot ครั้งแรก ซึ่งอาจต่างจากลำดับในไฟล์ใหม่
+เมื่อมีค่าที่เท่ากัน (เช่นวันที่ peak ที่มีจำนวนเท่ากัน)
+"""
+
+import hashlib
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from UTILS import get_logger, json_load_file, json_dump_file
+from INFRASTRUCTURE.defect_table import DefectTable
+from INFRASTRUCTURE.defect_statistics import DefectStatistics, Cell
+
+# Setup logger
+logger = get_logger("DefectSnapshot")
+
+SNAPSHOT_VERSION = 2
+
+# issueId -> (hash ของเนื้อหา, cell)
+Issues = Dict[Any, Tuple[str, Cell]]
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """
+    Return the hash of a defect's content (any change of any field changes it)
+
+    Args:
+        record (Dict[str, Any]): Defect dictionary
+
+    Returns:
+        str: Short hex digest
+    """
+    return hashlib.blake2b(repr(record).encode('utf-8'), digest_size=8).hexdigest()
+
+
+class DefectSnapshot:
+    """
+    Defect statistics persisted on disk and updated by issueId delta
+    """
+
+    def __init__(self, snapshot_path: str, id_key: str = "issueId"):
+        """
+        Initialize snapshot
+
+        Args:
+            snapshot_path (str): Path to the snapshot JSON file
+            id_key (str): Field that identifies a defect across exports
+        """
+        self.snapshot_path = snapshot_path
+        self.id_key = id_key
+        self.last_delta: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the saved state (statistics and the content hash and cell of every issueId)
+
+        Returns:
+            Optional[Dict[str, Any]]: {"statistics": DefectStatistics, "issues": {issueId: (hash, cell)}}
+            or None if there is no usable snapshot
+        """
+        if not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            data = json_load_file(self.snapshot_path)
+            if data.get("version") != SNAPSHOT_VERSION or data.get("id_key") != self.id_key:
+                logger.info(f"Defect snapshot format changed, rebuilding: {self.snapshot_path}")
+                return None
+            stats = DefectStatistics.from_dict(data["statistics"])
+            issues = data["issues"]
+            cells = [tuple(cell) for cell in issues["cells"]]
+            return {
+                "statistics": stats,
+                "issues": dict(zip(issues["ids"], zip(issues["hashes"], map(cells.__getitem__, issues["cell_index"])))),
+            }
+        except Exception as e:
+            logger.warning(f"Cannot read defect snapshot {self.snapshot_path}, rebuilding: {str(e)}")
+            return None
+
+    def save(self, stats: DefectStatistics, issues: Issues) -> None:
+        """
+        Write the state to disk (atomically, through a temporary file)
+
+        Args:
+            stats (DefectStatistics): Statistics to save
+            issues (Issues): Content hash and cell of every issueId
+        """
+        # เก็บแบบ column: issueId (คง type เดิม เพราะ key ของ JSON object เป็น str เสมอ), hash
+        # และ index ใน list ของ cell ที่ไม่ซ้ำ (จำนวน cell น้อยกว่าจำนวน issue มาก)
+        cell_index: Dict[Cell, int] = {}
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "id_key": self.id_key,
+            "statistics": stats.to_dict(),
+            "issues": {
+                "ids": list(issues),
+                "hashes": [digest for digest, _ in issues.values()],
+                "cell_index": [cell_index.setdefault(cell, len(cell_index)) for _, cell in issues.values()],
+                "cells": [list(cell) for cell in cell_index],
+            },
+        }
+        directory = os.path.dirname(os.path.abspath(self.snapshot_path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.snapshot_path}.tmp"
+        json_dump_file(data, temp_path)
+        os.replace(temp_path, self.snapshot_path)
+
+    def refresh(self, defects: Optional[Iterable[Any]]) -> DefectStatistics:
+        """
+        Apply a new export to the saved statistics and save the result
+
+        Args:
+            defects (Optional[Iterable[Any]]): List or iterator of defects of the new export
+                (rows that are not dicts are skipped, as in DefectTable)
+
+        Returns:
+            DefectStatistics: Statistics of the new export
+        """
+        with self._lock:
+            state = self.load()
+            if state is None:
+                stats, old_issues = DefectStatistics(), {}
+            else:
+                stats, old_issues = state["statistics"], state["issues"]
+
+            # รอบเดียวบน export ใหม่: hash ของแต่ละ defect และ cell เฉพาะ defect ที่ใหม่หรือเนื้อหาเปลี่ยน
+            cells = []
+            new_issues: Issues = {}
+            complete = True
+            inserted = updated = unchanged = 0
+            for record in defects or ():
+                if not isinstance(record, dict):
+                    continue
+                digest = content_hash(record)
+                issue_id = record.get(self.id_key)
+                try:
+                    old = old_issues.get(issue_id) if issue_id is not None else None
+                    if issue_id is None or issue_id in new_issues:
+                        complete = False
+                except TypeError:
+                    old = None
+                    complete = False
+                if old is not None and old[0] == digest:
+                    cell = old[1]
+                    unchanged += 1
+                else:
+                    cell = stats.cell(record)
+                    if old is None:
+                        inserted += 1
+                    elif old[1] != cell:
+                        updated += 1
+                    else:
+                        unchanged += 1
+                cells.append(cell)
+                if complete:
+                    new_issues[issue_id] = (digest, cell)
+
+            if not complete or state is None:
+                if not complete:
+                    logger.warning(f"Defects without a unique '{self.id_key}', rebuilding statistics from the export")
+                stats.clear()
+                for cell in cells:
+                    stats.add_cell(cell)
+                self.last_delta = {"inserted": len(cells), "updated": 0, "deleted": len(old_issues), "unchanged": 0}
+            else:
+                for issue_id, (digest, cell) in new_issues.items():
+                    old = old_issues.get(issue_id)
+                    if old is None:
+                        stats.add_cell(cell)
+                    elif old[1] != cell:
+                        stats.remove_cell(old[1])
+                        stats.add_cell(cell)
+                deleted = 0
+                for issue_id, (digest, old_cell) in old_issues.items():
+                    if issue_id not in new_issues:
+                        stats.remove_cell(old_cell)
+                        deleted += 1
+                self.last_delta = {"inserted": inserted, "updated": updated, "deleted": deleted, "unchanged": unchanged}
+
+            logger.info(
+                "Defect snapshot delta: +{inserted} ~{updated} -{deleted} (unchanged {unchanged})".format(**self.last_delta)
+            )
+            # export ที่ไม่มี issueId ครบใช้เป็นฐานของ delta ครั้งถัดไปไม่ได้ จึงคง snapshot เดิมไว้
+            if complete and (state is None or new_issues != old_issues):
+                # ตัด category ที่ไม่มี defect ใช้แล้ว (เช่นสถานะหรือวันที่ของ defect ที่ถูกลบ) แล้วแปลง cell ตามรหัสใหม่
+                remap = stats.compact()
+                if remap is not None:
+                    new_issues = {
+                        issue_id: (digest, tuple(mapping[code] for mapping, code in zip(remap, cell)))
+                        for issue_id, (digest, cell) in new_issues.items()
+                    }
+                self.save(stats, new_issues)
+            return stats
+
+    def attach(self, table: DefectTable) -> DefectStatistics:
+        """
+        Refresh the snapshot from a table and share the result as the table's statistics
+
+        The snapshot is refreshed once per table: later ``DefectStatistics.of(table)``
+        calls (e.g. from the prepare functions) return the same statistics.
+
+        Args:
+            table (DefectTable): Defect table of the new export
+
+        Returns:
+            DefectStatistics: Statistics of the table
+        """
+        return table.derive("statistics", lambda source: self.refresh(source.rows()))
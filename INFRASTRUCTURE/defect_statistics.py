@@ -0,0 +1,309 @@
+# INFRASTRUCTURE/defect_statistics.py
+
+"""
+Defect Statistics
+Fused single-pass statistics shared by every defect prepare function
+
+ตารางข้อบกพร่องถูกอ่านเพียงรอบเดียว: นับจำนวน defect ต่อชุดค่า (combination) ของทุก field
+ที่ prepare ฝั่ง defect ใช้ (status, severity, module, page, วันที่ต่างๆ) เก็บเป็น "cell" พร้อมจำนวน
+จากนั้นแต่ละ prepare ดึงเฉพาะส่วนที่ต้องการ (projection) ด้วย ``group`` ซึ่งรวม cell ตาม field
+ที่ระบุ โดยไม่ต้องวนลูปบน defect ทั้งหมดซ้ำอีก
+
+ผลลัพธ์ของ ``group`` เป็น dict ของ defect บางส่วน (เฉพาะ field ที่ขอ) พร้อมจำนวน
+โค้ดเดิมที่ใช้ ``defect.get(...)`` จึงใช้ได้เหมือนเดิมเพียงคูณด้วยจำนวน และลำดับเป็นไปตาม
+การพบครั้งแรกในข้อมูล เหมือนการวนลูปบน list of dict
+
+สถิติปรับปรุงทีละ defect ได้ (``add`` / ``remove``) และบันทึกเป็น JSON ได้ (``to_dict`` / ``from_dict``)
+เพื่อให้ DefectSnapshot นำ delta ของ export ใหม่มาปรับใช้โดยไม่ต้องคำนวณใหม่ทั้งหมด
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from UTILS import get_logger
+from INFRASTRUCTURE.defect_table import DefectTable, MISSING
+from INFRASTRUCTURE.defect_backend import get_backend
+
+# Setup logger
+logger = get_logger("DefectStatistics")
+
+# field ทั้งหมดที่ prepare ฝั่ง defect ใช้คำนวณสถิติ (รวม alias ของวันที่)
+STAT_FIELDS = (
+    "status", "severity", "priority", "module", "component", "area", "page",
+    "createDate", "created_date", "createdDate", "created_at", "reportedDate", "reported_date",
+    "closedDate", "closed_date", "resolved_date", "resolvedDate",
+)
+
+Cell = Tuple[int, ...]
+Group = List[Tuple[Dict[str, Any], int]]
+
+
+class DefectStatistics:
+    """
+    Counts of defects per combination of statistic fields, built in one pass
+    """
+
+    def __init__(self, table: Optional[DefectTable] = None):
+        """
+        Build the statistics of a defect table (empty statistics if no table is given)
+
+        Args:
+            table (Optional[DefectTable]): Defect table
+        """
+        self._position = {key: position for position, key in enumerate(STAT_FIELDS)}
+        self._categories: List[List[Any]] = [[] for _ in STAT_FIELDS]
+        self._index: List[Dict[Any, int]] = [{} for _ in STAT_FIELDS]
+        self._missing: List[Optional[int]] = [None] * len(STAT_FIELDS)
+        self._cells: Dict[Cell, int] = {}
+        self._columns: Optional[Tuple[List[array], array]] = None
+        self._groups: Dict[Tuple[str, ...], Group] = {}
+        self.total = 0
+
+        if table is not None:
+            for position, key in enumerate(STAT_FIELDS):
+                self._load_categories(position, table.categories(key))
+            # รอบเดียวบนทุกแถว: จำนวน defect ต่อชุดรหัสของทุก field
+            self._cells = table.crosstab(STAT_FIELDS)
+            self.total = len(table)
+        logger.debug(f"Defect statistics: {self.total} defects in {len(self._cells)} cells")
+
+    @classmethod
+    def of(cls, defects: Union["DefectStatistics", DefectTable, Iterable[Any], None]) -> "DefectStatistics":
+        """
+        Return the statistics of ``defects``, shared by everyone who asks for the same table
+
+        Args:
+            defects (Union[DefectStatistics, DefectTable, Iterable[Any], None]): Statistics, table or defect records
+
+        Returns:
+            DefectStatistics: Statistics of the table
+        """
+        if isinstance(defects, cls):
+            return defects
+        return DefectTable.of(defects).derive("statistics", cls)
+
+    def __len__(self) -> int:
+        return self.total
+
+    def _load_categories(self, position: int, values: Sequence[Any]) -> None:
+        """
+        Replace the categories of one field, rebuilding its intern index
+        """
+        categories = self._categories[position] = list(values)
+        index = self._index[position] = {}
+        self._missing[position] = None
+        for code, value in enumerate(categories):
+            if value is MISSING:
+                self._missing[position] = code
+                continue
+            try:
+                index.setdefault((type(value), value), code)
+            except TypeError:
+                pass
+
+    def _intern(self, position: int, record: Dict[str, Any]) -> int:
+        """
+        Return the code of one field of ``record``, adding a category if needed
+        (same rules as ``DefectTable``: values are told apart by type, MISSING when the key is absent)
+        """
+        categories = self._categories[position]
+        key = STAT_FIELDS[position]
+        if key not in record:
+            code = self._missing[position]
+            if code is None:
+                code = self._missing[position] = len(categories)
+                categories.append(MISSING)
+            return code
+
+        value = record[key]
+        index = self._index[position]
+        try:
+            token = (type(value), value)
+            code = index.get(token)
+        except TypeError:
+            token = None
+            code = None
+        if code is None:
+            code = len(categories)
+            categories.append(value)
+            if token is not None:
+                index[token] = code
+        return code
+
+    def cell(self, record: Dict[str, Any]) -> Cell:
+        """
+        Return the codes of a defect's statistic fields (the cell it is counted in)
+
+        Args:
+            record (Dict[str, Any]): Defect dictionary
+
+        Returns:
+            Cell: One code per field of ``STAT_FIELDS``
+        """
+        return tuple(self._intern(position, record) for position in range(len(STAT_FIELDS)))
+
+    def add_cell(self, cell: Cell, count: int = 1) -> None:
+        """
+        Count ``count`` more defects in a cell
+
+        Args:
+            cell (Cell): Cell from ``cell``
+            count (int): Number of defects
+        """
+        self._cells[cell] = self._cells.get(cell, 0) + count
+        self.total += count
+        self._changed()
+
+    def remove_cell(self, cell: Cell, count: int = 1) -> None:
+        """
+        Count ``count`` fewer defects in a cell (the cell is dropped when it reaches zero)
+
+        Args:
+            cell (Cell): Cell from ``cell``
+            count (int): Number of defects
+        """
+        remaining = self._cells.get(cell, 0) - count
+        if remaining < 0:
+            raise ValueError(f"Cannot remove {count} defects from a cell that holds {remaining + count}")
+        if remaining:
+            self._cells[cell] = remaining
+        else:
+            self._cells.pop(cell, None)
+        self.total -= count
+        self._changed()
+
+    def add(self, record: Dict[str, Any]) -> Cell:
+        """
+        Count one more defect
+
+        Returns:
+            Cell: The cell the defect was counted in
+        """
+        cell = self.cell(record)
+        self.add_cell(cell)
+        return cell
+
+    def remove(self, record: Dict[str, Any]) -> Cell:
+        """
+        Count one fewer defect (the record must have been added before)
+
+        Returns:
+            Cell: The cell the defect was removed from
+        """
+        cell = self.cell(record)
+        self.remove_cell(cell)
+        return cell
+
+    def clear(self) -> None:
+        """Drop every count (interned categories are kept)"""
+        self._cells = {}
+        self.total = 0
+        self._changed()
+
+    def compact(self) -> Optional[List[List[int]]]:
+        """
+        Drop the categories that no cell references any more (e.g. after defects were removed)
+
+        Codes are renumbered in their original order, so cells saved elsewhere
+        must be translated with the returned mapping.
+
+        Returns:
+            Optional[List[List[int]]]: Old code -> new code per field (-1 = dropped), or None if nothing was dropped
+        """
+        used = [set(column) for column in zip(*self._cells)] or [set() for _ in STAT_FIELDS]
+        if all(len(codes) == len(categories) for codes, categories in zip(used, self._categories)):
+            return None
+        remap = []
+        for position, categories in enumerate(self._categories):
+            mapping = [-1] * len(categories)
+            kept = []
+            for code, value in enumerate(categories):
+                if code in used[position]:
+                    mapping[code] = len(kept)
+                    kept.append(value)
+            self._load_categories(position, kept)
+            remap.append(mapping)
+        self._cells = {
+            tuple(mapping[code] for mapping, code in zip(remap, cell)): count for cell, count in self._cells.items()
+        }
+        self._changed()
+        return remap
+
+    def _changed(self) -> None:
+        """Drop projections computed from the previous counts"""
+        self._columns = None
+        self._groups.clear()
+
+    def group(self, keys: Sequence[str]) -> Group:
+        """
+        Return the distinct combinations of ``keys`` with the number of defects that have them
+
+        Each combination is a partial defect dictionary that only holds the
+        requested keys the defect actually has, so ``dict.get`` with defaults
+        behaves exactly as on the original record.
+
+        Args:
+            keys (Sequence[str]): Fields from ``STAT_FIELDS``
+
+        Returns:
+            Group: List of (partial defect, count) in first-occurrence order
+        """
+        keys = tuple(keys)
+        group = self._groups.get(keys)
+        if group is None:
+            if self._columns is None:
+                cell_codes = [array('I', column) for column in zip(*self._cells)] or [array('I') for _ in STAT_FIELDS]
+                self._columns = (cell_codes, array('I', self._cells.values()))
+            cell_codes, cell_counts = self._columns
+            positions = [self._position[key] for key in keys]
+            counts = get_backend().combinations([cell_codes[position] for position in positions], cell_counts)
+            categories = [self._categories[position] for position in positions]
+            group = self._groups[keys] = [
+                ({key: values[code] for key, values, code in zip(keys, categories, cell) if values[code] is not MISSING}, count)
+                for cell, count in counts.items()
+            ]
+        return group
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the statistics as JSON-serializable data (see ``from_dict``)
+
+        Returns:
+            Dict[str, Any]: Fields, categories, MISSING codes and cells with their counts
+        """
+        return {
+            "fields": list(STAT_FIELDS),
+            "categories": [
+                [None if value is MISSING else value for value in categories]
+                for categories in self._categories
+            ],
+            "missing": list(self._missing),
+            "cells": [list(cell) + [count] for cell, count in self._cells.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DefectStatistics":
+        """
+        Rebuild statistics saved with ``to_dict``
+
+        Args:
+            data (Dict[str, Any]): Saved statistics
+
+        Returns:
+            DefectStatistics: Statistics with the saved counts
+
+        Raises:
+            ValueError: If the data was saved with other statistic fields
+        """
+        if tuple(data.get("fields", ())) != STAT_FIELDS:
+            raise ValueError("Saved defect statistics use different fields")
+        stats = cls()
+        for position, (categories, missing) in enumerate(zip(data["categories"], data["missing"])):
+            if missing is not None:
+                categories = list(categories)
+                categories[missing] = MISSING
+            stats._load_categories(position, categories)
+        width = len(STAT_FIELDS)
+        stats._cells = {tuple(row[:width]): row[width] for row in data["cells"]}
+        stats.total = sum(stats._cells.values())
+        return stats
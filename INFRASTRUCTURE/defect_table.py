@@ -0,0 +1,495 @@
+# INFRASTRUCTURE/defect_table.py
+
+"""
+Defect Table
+Columnar, interned representation of a defect list built once by the loader
+
+แต่ละ field ของ defect ถูกเก็บเป็น column ของรหัส (array ของ unsigned int) ชี้ไปยังค่าที่ intern ไว้
+ค่าเดียวกัน (เช่น severity "High") จึงถูกเก็บเพียงครั้งเดียว และ analyzer สามารถคำนวณบนรหัส
+แทนการเรียก dict.get กับทุกแถว ส่วน field ที่เป็นข้อความยาว (description, title, summary) เก็บเป็น list ตรงๆ
+
+รหัสของแต่ละ column ถูกกำหนดตามลำดับที่พบค่านั้นครั้งแรก (รวมถึงค่า "ไม่มี key")
+การนับตามรหัส (เรียงจากรหัสน้อยไปมาก) จึงคงลำดับการพบครั้งแรกเหมือนการวนลูปบน list of dict เดิม
+"""
+
+from array import array
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from collections.abc import Sequence as SequenceABC
+
+from UTILS import parse_date, DEFAULT_DATE_FORMATS
+from INFRASTRUCTURE.defect_backend import get_backend
+from INFRASTRUCTURE.records import Defect
+
+# ค่าแทน "ไม่มี key นี้ใน defect" (ต่างจากค่า None ที่มี key อยู่จริง)
+MISSING = object()
+
+# field ที่เป็นข้อความอิสระ ไม่คุ้มที่จะ intern
+TEXT_FIELDS = frozenset(("description", "title", "summary"))
+
+DAY_ORDINAL_FORMATS = ("%Y-%m-%d",)
+
+# field วันที่ที่ถูกแปลงล่วงหน้าตอนโหลด (normalize_dates)
+DATE_FIELDS = (
+    "reportedDate", "reported_date", "createDate", "created_date", "createdDate", "created_at",
+    "closedDate", "closed_date", "resolved_date", "resolvedDate", "updated_date", "updatedDate",
+)
+
+
+class DefectTable:
+    """
+    Column store of defect records with interned categorical codes
+    """
+
+    def __init__(self):
+        """Initialize an empty defect table"""
+        self.size = 0
+        self.skipped = 0
+        self._codes: Dict[str, array] = {}
+        self._categories: Dict[str, List[Any]] = {}
+        self._index: Dict[str, Dict[Any, int]] = {}
+        self._missing_code: Dict[str, int] = {}
+        self._text: Dict[str, List[Any]] = {}
+        self._day_ordinals: Dict[Tuple[str, ...], array] = {}
+        self._dates: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], List[Optional[datetime]]] = {}
+        self._derived: Dict[str, Any] = {}
+
+    @classmethod
+    def from_records(cls, records: Optional[Iterable[Any]]) -> "DefectTable":
+        """
+        Build a table from defect dictionaries (rows that are not dicts are skipped)
+
+        Args:
+            records (Optional[Iterable[Any]]): List or iterator of defects
+
+        Returns:
+            DefectTable: Columnar table
+        """
+        table = cls()
+        for record in records or ():
+            if isinstance(record, dict):
+                table.append(record)
+            else:
+                table.skipped += 1
+        return table
+
+    @classmethod
+    def of(cls, defects: Union["DefectTable", Iterable[Any], None]) -> "DefectTable":
+        """
+        Return ``defects`` as a table, building one if a list was given
+
+        Args:
+            defects (Union[DefectTable, Iterable[Any], None]): Table or defect records
+
+        Returns:
+            DefectTable: Columnar table
+        """
+        if isinstance(defects, cls):
+            return defects
+        return cls.from_records(defects)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _intern(self, key: str, value: Any) -> int:
+        """
+        Return the code of ``value`` in column ``key``, adding a category if needed
+        """
+        index = self._index[key]
+        try:
+            # แยกตาม type ด้วย เพื่อไม่ให้ 1, 1.0 และ True ถูกรวมเป็นค่าเดียวกัน
+            token = (type(value), value)
+            code = index.get(token)
+        except TypeError:
+            # ค่าที่ hash ไม่ได้ (list/dict) ไม่ intern เก็บเป็น category ใหม่ทุกครั้ง
+            token = None
+            code = None
+        if code is None:
+            categories = self._categories[key]
+            code = len(categories)
+            categories.append(value)
+            if token is not None:
+                index[token] = code
+        return code
+
+    def _missing(self, key: str) -> int:
+        """
+        Return the code used for rows that do not have ``key``
+        """
+        code = self._missing_code.get(key)
+        if code is None:
+            categories = self._categories[key]
+            code = len(categories)
+            categories.append(MISSING)
+            self._missing_code[key] = code
+        return code
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Append one defect to the table
+
+        Args:
+            record (Dict[str, Any]): Defect dictionary
+        """
+        row = self.size
+        for key, value in record.items():
+            if key in TEXT_FIELDS:
+                column = self._text.get(key)
+                if column is None:
+                    column = self._text[key] = [MISSING] * row
+                column.append(value)
+                continue
+            codes = self._codes.get(key)
+            if codes is None:
+                self._categories[key] = []
+                self._index[key] = {}
+                codes = self._codes[key] = array('I')
+                if row:
+                    codes.extend([self._missing(key)] * row)
+            codes.append(self._intern(key, value))
+
+        # เติมค่า "ไม่มี key" ให้ column ที่ defect นี้ไม่มี
+        self.size = row + 1
+        for key, codes in self._codes.items():
+            if len(codes) == row:
+                codes.append(self._missing(key))
+        for column in self._text.values():
+            if len(column) == row:
+                column.append(MISSING)
+        self._day_ordinals.clear()
+        self._dates.clear()
+        self._derived.clear()
+
+    def has_column(self, key: str) -> bool:
+        """Return True if any defect has ``key``"""
+        return key in self._codes or key in self._text
+
+    def codes(self, key: str) -> array:
+        """
+        Return the code column of a categorical field
+
+        Args:
+            key (str): Field name
+
+        Returns:
+            array: One code per row (see ``categories``)
+        """
+        codes = self._codes.get(key)
+        if codes is None:
+            # field ที่ไม่มีใน defect ใดเลย: ทุกแถวเป็นรหัส 0 ซึ่งแทน MISSING
+            return array('I', bytes(4 * self.size))
+        return codes
+
+    def categories(self, key: str) -> List[Any]:
+        """
+        Return the interned values of a categorical field, indexed by code
+
+        Rows without the field point to the ``MISSING`` sentinel.
+        """
+        categories = self._categories.get(key)
+        if categories is None:
+            return [MISSING]
+        return categories
+
+    def lookup(self, key: str, func: Callable[[Any], Any], default: Any = None) -> List[Any]:
+        """
+        Apply ``func`` once per distinct value of a categorical field
+
+        Args:
+            key (str): Field name
+            func (Callable[[Any], Any]): Function applied to each value
+            default (Any): Value passed to ``func`` for rows without the field
+
+        Returns:
+            List[Any]: Results indexed by code
+        """
+        return [func(default if value is MISSING else value) for value in self.categories(key)]
+
+    def get(self, row: int, key: str, default: Any = None) -> Any:
+        """
+        Return a field of one row with ``dict.get`` semantics
+        """
+        column = self._text.get(key)
+        if column is not None:
+            value = column[row]
+        else:
+            codes = self._codes.get(key)
+            if codes is None:
+                return default
+            value = self._categories[key][codes[row]]
+        return default if value is MISSING else value
+
+    def values(self, key: str, default: Any = None) -> List[Any]:
+        """
+        Return a field for every row with ``dict.get`` semantics
+        """
+        column = self._text.get(key)
+        if column is not None:
+            return [default if value is MISSING else value for value in column]
+        lut = self.lookup(key, lambda value: value, default)
+        return [lut[code] for code in self.codes(key)]
+
+    def resolve(self, keys: Sequence[str], default: Any = None,
+                func: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+        """
+        Resolve a chain of field aliases for every row
+
+        Equivalent to ``d.get(keys[0], d.get(keys[1], ... default))`` per row,
+        with ``func`` (if given) applied once per distinct value.
+
+        Args:
+            keys (Sequence[str]): Field aliases in priority order
+            default (Any): Value for rows that have none of the fields
+            func (Optional[Callable[[Any], Any]]): Optional function applied to the resolved value
+
+        Returns:
+            List[Any]: One value per row
+        """
+        if func is None:
+            func = lambda value: value
+        fallback = func(default)
+        columns = []
+        for key in keys:
+            if key in self._text:
+                column = self._text[key]
+                columns.append(([MISSING if value is MISSING else func(value) for value in column], None))
+            elif key in self._codes:
+                lut = [MISSING if value is MISSING else func(value) for value in self._categories[key]]
+                columns.append((lut, self._codes[key]))
+
+        result = [fallback] * self.size
+        # วนจาก alias ที่สำคัญน้อยไปมาก ให้ alias ที่สำคัญกว่าเขียนทับ
+        for lut, codes in reversed(columns):
+            if codes is None:
+                for row, value in enumerate(lut):
+                    if value is not MISSING:
+                        result[row] = value
+            else:
+                for row, code in enumerate(codes):
+                    value = lut[code]
+                    if value is not MISSING:
+                        result[row] = value
+        return result
+
+    def count(self, key: str) -> Dict[int, int]:
+        """
+        Count rows per code of a categorical field (with the active backend)
+
+        Returns:
+            Dict[int, int]: code -> number of rows, in first-occurrence order
+        """
+        return get_backend().count(self.codes(key))
+
+    def crosstab(self, keys: Sequence[str]) -> Dict[Tuple[int, ...], int]:
+        """
+        Count rows per distinct combination of codes of several categorical fields
+
+        Args:
+            keys (Sequence[str]): Field names
+
+        Returns:
+            Dict[Tuple[int, ...], int]: tuple of codes (one per key) -> number of rows, in first-occurrence order
+        """
+        return get_backend().combinations([self.codes(key) for key in keys])
+
+    def derive(self, name: str, builder: Callable[["DefectTable"], Any]) -> Any:
+        """
+        Return a value computed from the table, building it once
+
+        The value is dropped when rows are appended.
+
+        Args:
+            name (str): Name of the derived value (e.g. "statistics")
+            builder (Callable[[DefectTable], Any]): Function that computes the value from the table
+
+        Returns:
+            Any: The derived value
+        """
+        if name not in self._derived:
+            self._derived[name] = builder(self)
+        return self._derived[name]
+
+    def day_ordinals(self, keys: Union[str, Sequence[str]]) -> array:
+        """
+        Return "YYYY-MM-DD" dates of a field (or alias chain) as proleptic Gregorian day ordinals
+
+        Rows without the field or with an empty value get 0, values in another
+        format get -1.
+
+        Args:
+            keys (Union[str, Sequence[str]]): Date field name (e.g. "reportedDate") or aliases in priority order
+
+        Returns:
+            array: int32 day ordinal per row
+        """
+        keys = (keys,) if isinstance(keys, str) else tuple(keys)
+        ordinals = self._day_ordinals.get(keys)
+        if ordinals is None:
+            ordinals = self._day_ordinals[keys] = array('i', self.resolve(keys, '', _day_ordinal))
+        return ordinals
+
+    def dates(self, keys: Sequence[str], formats: Tuple[str, ...] = DEFAULT_DATE_FORMATS) -> List[Optional[datetime]]:
+        """
+        Resolve a chain of date field aliases and parse the result for every row
+
+        Each distinct date string is parsed once (see ``UTILS.parse_date``) and
+        the resolved column is kept on the table, so every analyzer that asks
+        for the same aliases and formats reuses it.
+
+        Args:
+            keys (Sequence[str]): Date field aliases in priority order
+            formats (Tuple[str, ...]): Accepted date formats, tried in order
+
+        Returns:
+            List[Optional[datetime]]: Parsed date per row (None if empty or not parseable)
+        """
+        cache_key = (tuple(keys), formats)
+        column = self._dates.get(cache_key)
+        if column is None:
+            column = self._dates[cache_key] = self.resolve(keys, '', lambda value: parse_date(value, formats))
+        return column
+
+    def normalize_dates(self, formats: Tuple[str, ...] = DEFAULT_DATE_FORMATS) -> "DefectTable":
+        """
+        Parse every known date field once, right after loading
+
+        Returns:
+            DefectTable: The table itself
+        """
+        for key in DATE_FIELDS:
+            if self.has_column(key):
+                self.dates([key], formats)
+                self.day_ordinals(key)
+        return self
+
+    def to_columns(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """
+        Return fields as compact, JSON-serializable columns (one array per field)
+
+        column ที่มีค่าซ้ำกันถูกส่งเป็นรายการค่า (categories) และรหัสของแต่ละแถว (codes)
+        ส่วน column ที่ค่าแทบไม่ซ้ำ (เช่น issueId, description) ส่งเป็นค่าของแต่ละแถว (values)
+        ค่าที่ไม่มี key เป็น null และ field ที่ไม่มีใน defect ใดเลยจะไม่ถูกส่ง
+
+        Args:
+            keys (Sequence[str]): Fields to export
+
+        Returns:
+            Dict[str, Any]: {"size": rows, "columns": {field: {"values": [...]} or {"categories": [...], "codes": [...]}}}
+        """
+        columns = {}
+        for key in keys:
+            column = self._text.get(key)
+            if column is not None:
+                columns[key] = {"values": [None if value is MISSING else value for value in column]}
+                continue
+            codes = self._codes.get(key)
+            if codes is None:
+                continue
+            categories = [None if value is MISSING else value for value in self._categories[key]]
+            if len(categories) * 2 > self.size:
+                columns[key] = {"values": [categories[code] for code in codes]}
+            else:
+                columns[key] = {"categories": categories, "codes": codes.tolist()}
+        return {"size": self.size, "columns": columns}
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """
+        Rebuild the dictionary of one defect
+
+        Args:
+            row (int): Row index
+
+        Returns:
+            Dict[str, Any]: Defect fields (new dict)
+        """
+        record = {}
+        for key, codes in self._codes.items():
+            value = self._categories[key][codes[row]]
+            if value is not MISSING:
+                record[key] = value
+        for key, column in self._text.items():
+            value = column[row]
+            if value is not MISSING:
+                record[key] = value
+        return record
+
+    def record(self, row: int) -> Defect:
+        """
+        Decode one defect as a typed record (field aliases resolved once)
+
+        Args:
+            row (int): Row index
+
+        Returns:
+            Defect: Defect record
+        """
+        return Defect.from_dict(self.row(row))
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over rebuilt defect dictionaries"""
+        for row in range(self.size):
+            yield self.row(row)
+
+
+
+class DefectRows(SequenceABC):
+    """
+    Read-only, lazy list of defect dictionaries for templates
+
+    แต่ละแถวถูกสร้างจาก DefectTable ตอนที่ template อ่านถึง และมีเฉพาะ field ที่ระบุ
+    context ของการ render จึงไม่ต้องถือ list ของ dict ดิบทั้งชุด ส่วน ``len`` เป็น O(1)
+    เมื่อถูก pickle (เช่นส่งไป process อื่นตอน render แบบขนาน) จะกลายเป็น list ธรรมดา
+    """
+
+    def __init__(self, table: DefectTable, fields: Optional[Sequence[str]] = None):
+        """
+        Initialize view
+
+        Args:
+            table (DefectTable): Source table
+            fields (Optional[Sequence[str]]): Fields of each row (None = every field)
+        """
+        self.table = table
+        self.fields = tuple(fields) if fields is not None else None
+
+    def __len__(self) -> int:
+        return self.table.size
+
+    def _row(self, row: int) -> Dict[str, Any]:
+        """Rebuild one row with only the selected fields"""
+        if self.fields is None:
+            return self.table.row(row)
+        record = {}
+        for key in self.fields:
+            value = self.table.get(row, key, MISSING)
+            if value is not MISSING:
+                record[key] = value
+        return record
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(index, slice):
+            return [self._row(row) for row in range(*index.indices(self.table.size))]
+        if index < 0:
+            index += self.table.size
+        if not 0 <= index < self.table.size:
+            raise IndexError("defect row index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in range(self.table.size):
+            yield self._row(row)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def _day_ordinal(value: Any) -> int:
+    """
+    Convert a "YYYY-MM-DD" string into a day ordinal (0 if empty, -1 if not parseable)
+    """
+    if not value:
+        return 0
+    if not isinstance(value, str):
+        return -1
+    date = parse_date(value, DAY_ORDINAL_FORMATS)
+    return date.toordinal() if date else -1
@@ -0,0 +1,110 @@
+# INFRASTRUCTURE/defect_top_index.py
+
+"""
+Defect Top-N Index
+Bounded top-N selections over a DefectTable, shared by every defect finder
+
+แต่ละ ranking (เช่น "recent", "highest_priority") ถูกสร้างครั้งเดียวต่อตาราง: เลขแถวที่เป็นตัวเลือก
+และ key ของแต่ละแถว จากนั้นเลือกเฉพาะ N แถวแรกด้วย heap (O(n log N)) แทนการเรียงทั้งหมด
+และไม่คัดลอก defect ทีละแถว
+
+ลำดับผลลัพธ์เหมือน ``sorted(rows, key=..., reverse=largest)[:limit]`` ทุกประการ:
+ค่าที่เท่ากันเรียงตามเลขแถว (ลำดับในข้อมูล) จึงให้ผลเหมือนเดิมทุกครั้ง
+ผลของ limit ที่มากที่สุดที่เคยขอจะถูกเก็บไว้ และ limit ที่น้อยกว่าได้จากการตัดส่วนหน้า
+"""
+
+import heapq
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, Union
+
+from UTILS import get_logger
+from INFRASTRUCTURE.defect_table import DefectTable
+
+# Setup logger
+logger = get_logger("DefectTopIndex")
+
+Ranking = Callable[[], Tuple[Iterable[int], Sequence[Any]]]
+
+
+class _Selection:
+    """
+    Candidate rows, their keys and the best rows selected so far for one ranking
+    """
+
+    __slots__ = ("rows", "keys", "largest", "top", "limit")
+
+    def __init__(self, rows: List[int], keys: Sequence[Any], largest: bool):
+        self.rows = rows
+        self.keys = keys
+        self.largest = largest
+        self.top: List[int] = []
+        self.limit = 0
+
+
+class DefectTopIndex:
+    """
+    Shared top-N index of a defect table
+    """
+
+    def __init__(self, table: DefectTable):
+        """
+        Initialize an empty index for a table
+
+        Args:
+            table (DefectTable): Defect table
+        """
+        self.size = len(table)
+        self._selections: Dict[str, _Selection] = {}
+
+    @classmethod
+    def of(cls, defects: Union[DefectTable, Iterable[Any], None]) -> "DefectTopIndex":
+        """
+        Return the top-N index of ``defects``, shared by everyone who asks for the same table
+
+        Args:
+            defects (Union[DefectTable, Iterable[Any], None]): Table or defect records
+
+        Returns:
+            DefectTopIndex: Index of the table
+        """
+        return DefectTable.of(defects).derive("top_index", cls)
+
+    def top(self, name: str, limit: int, ranking: Ranking, largest: bool = False) -> List[int]:
+        """
+        Return the first ``limit`` rows of a ranking
+
+        Args:
+            name (str): Ranking name, shared by every caller that ranks the same way
+            limit (int): Number of rows wanted
+            ranking (Ranking): Returns (candidate rows in ascending order, key per row indexed by row);
+                called only the first time the ranking is used
+            largest (bool): True to take the largest keys first
+
+        Returns:
+            List[int]: Row indices in ranking order (ties keep row order)
+        """
+        selection = self._selections.get(name)
+        if selection is None:
+            rows, keys = ranking()
+            selection = self._selections[name] = _Selection(list(rows), keys, largest)
+
+        limit = max(0, limit)
+        if limit > selection.limit and len(selection.top) == selection.limit:
+            # heapq.nsmallest / nlargest เทียบเท่า sorted(...)[:limit] รวมถึงลำดับของค่าที่เท่ากัน
+            select = heapq.nlargest if selection.largest else heapq.nsmallest
+            selection.top = select(limit, selection.rows, key=selection.keys.__getitem__)
+            selection.limit = limit
+            logger.debug(f"Top-{limit} '{name}': {len(selection.top)} of {len(selection.rows)} rows")
+        return selection.top[:limit]
+
+    def key(self, name: str, row: int) -> Any:
+        """
+        Return the ranking key of one row (the ranking must have been used already)
+
+        Args:
+            name (str): Ranking name
+            row (int): Row index
+
+        Returns:
+            Any: Key of the row
+        """
+        return self._selections[name].keys[row]
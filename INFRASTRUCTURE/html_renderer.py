@@ -3,53 +3,138 @@ HTML Renderer
 Responsible for rendering HTML reports from templates
 """
 
+import gzip
+import io
 import os
+import re
+import threading
 import jinja2
-from typing import Dict, Any, Optional
+from markupsafe import Markup
+from collections import ChainMap
+from typing import Dict, Any, FrozenSet, Mapping, Optional, Tuple
 from datetime import datetime
 
-from UTILS import get_logger, cache, TemplateUtils
+from UTILS import get_logger, to_script_json, TemplateUtils
+from INFRASTRUCTURE.asset_bundler import AssetBundler
 
 # Setup logger
 logger = get_logger("HTMLRenderer")
 
+# ขนาด buffer ของไฟล์ตอน render แบบ streaming
+STREAM_BUFFER_SIZE = 1 << 16
+
+# ข้อมูลที่เขียนแยกเป็นไฟล์ .js ข้างรายงานเมื่อ ReportConfig.defect_table_mode เป็น "sidecar"
+# (ตัวแปรใน context -> ชื่อต่อท้ายของไฟล์) template ได้ชื่อไฟล์ในตัวแปร <ชื่อตัวแปร>_SRC
+SIDECAR_VARIABLES = {"DEFECT_TABLE_DATA": "defects"}
+
+# object ใน window ที่ไฟล์ sidecar เก็บข้อมูลไว้ (key = ชื่อตัวแปร)
+SIDECAR_GLOBAL = "QA_REPORT_DATA"
+
 class HTMLRenderer:
     """
     Renders HTML reports using Jinja2 templates
     """
     
-    def __init__(self):
-        """Initialize HTML renderer"""
+    # Environment ที่ใช้ร่วมกันต่อ template directory (และ cache directory) ตลอดอายุ process
+    # เพื่อให้ template ที่ compile แล้วถูกใช้ซ้ำ และ bytecode บนดิสก์ใช้ข้าม process ได้
+    _environments: Dict[Tuple[str, Optional[str], Optional[str]], jinja2.Environment] = {}
+    _environments_lock = threading.Lock()
+    
+    def __init__(self, bytecode_cache_dir: Optional[str] = None):
+        """
+        Initialize HTML renderer
+        
+        Args:
+            bytecode_cache_dir (Optional[str]): Directory of the compiled template cache
+                (None = ReportConfig.template_cache_dir, or Jinja's per-user temp directory)
+        """
         self.template_env = None
         self.template_utils = TemplateUtils()
+        self.bytecode_cache_dir = bytecode_cache_dir
         
-    def _setup_environment(self, template_dir: str) -> None:
+    @staticmethod
+    def create_environment(loader: jinja2.BaseLoader, bytecode_cache: Optional[jinja2.BytecodeCache] = None) -> jinja2.Environment:
         """
-        Setup Jinja2 environment with template directory
+        Create a Jinja2 environment with the report settings and custom filters
+        
+        Templates precompiled with ``template_precompiler`` use the same
+        settings, so their output is identical to templates compiled at runtime.
         
         Args:
-            template_dir (str): Directory containing templates
+            loader (jinja2.BaseLoader): Template loader
+            bytecode_cache (Optional[jinja2.BytecodeCache]): Compiled template cache
+        
+        Returns:
+            jinja2.Environment: Configured environment
         """
-        self.template_env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(template_dir),
+        env = jinja2.Environment(
+            loader=loader,
             autoescape=jinja2.select_autoescape(['html', 'xml']),
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            bytecode_cache=bytecode_cache,
+            auto_reload=True
         )
         
         # Add custom filters
-        self.template_env.filters.update({
-            'format_datetime': self.template_utils.format_datetime,
-            'format_date': self.template_utils.format_date,
-            'as_percent': self.template_utils.as_percent,
-            'format_number': self.template_utils.format_number,
-            'to_datetime': self.template_utils.to_datetime,
-            'safe_json': self.template_utils.safe_json_loads,
-            'ensure_dict': self.template_utils.ensure_dict,
-            'default_dict': self.template_utils.default_dict
+        env.filters.update({
+            'format_datetime': TemplateUtils.format_datetime,
+            'format_date': TemplateUtils.format_date,
+            'as_percent': TemplateUtils.as_percent,
+            'format_number': TemplateUtils.format_number,
+            'to_datetime': TemplateUtils.to_datetime,
+            'safe_json': TemplateUtils.safe_json_loads,
+            'ensure_dict': TemplateUtils.ensure_dict,
+            'default_dict': TemplateUtils.default_dict,
+            'count_of': TemplateUtils.count_of,
+            'script_json': TemplateUtils.script_json
         })
+        return env
+        
+    def _setup_environment(self, template_dir: str) -> None:
+        """
+        Setup Jinja2 environment with template directory
+        
+        The environment is created once per template directory and reused;
+        templates are recompiled only when their file changes (auto_reload
+        compares mtimes), and compiled bytecode is kept on disk. When
+        ReportConfig.precompiled_template_dir holds an up-to-date precompiled
+        copy of the directory, templates are imported from it instead of parsed.
+        
+        Args:
+            template_dir (str): Directory containing templates
+        """
+        # import ตอนเรียกใช้ เพราะ INFRASTRUCTURE/__init__ import โมดูลนี้
+        from INFRASTRUCTURE import config
+        cache_dir = self.bytecode_cache_dir
+        if cache_dir is None:
+            cache_dir = config.template_cache_dir
+        precompiled_dir = config.precompiled_template_dir
+        key = (os.path.abspath(template_dir), cache_dir, precompiled_dir)
+        
+        with self._environments_lock:
+            env = self._environments.get(key)
+            if env is None:
+                if cache_dir:
+                    os.makedirs(cache_dir, exist_ok=True)
+                    bytecode_cache = jinja2.FileSystemBytecodeCache(cache_dir)
+                else:
+                    bytecode_cache = jinja2.FileSystemBytecodeCache()
+                
+                loader = jinja2.FileSystemLoader(template_dir)
+                if precompiled_dir:
+                    from INFRASTRUCTURE.template_precompiler import load_precompiled
+                    module_loader = load_precompiled(template_dir, precompiled_dir)
+                    if module_loader is not None:
+                        # template ที่ไม่ได้ precompile (เช่น .js) ยังโหลดจาก source ได้ตามปกติ
+                        loader = jinja2.ChoiceLoader([module_loader, loader])
+                
+                env = self.create_environment(loader, bytecode_cache)
+                self._environments[key] = env
+                logger.debug(f"Created template environment for: {key[0]}")
+        
+        self.template_env = env
 
-    @cache(300)  # Cache for 5 minutes
     def render(self, report_data: Dict[str, Any], output_dir: Optional[str] = None) -> str:
         """
         Render and save HTML report
@@ -69,25 +154,195 @@ class HTMLRenderer:
         template_dir = os.path.dirname(template_path)
         template_file = os.path.basename(template_path)
 
-        self._setup_environment(template_dir)
-
-        template = self.template_env.get_template(template_file)
-
-        html_content = template.render(**report_data)
-
         # Save output
         if output_dir is None:
             output_dir = os.path.join(os.getcwd(), "qa_reports")
         os.makedirs(output_dir, exist_ok=True)
 
         output_file = os.path.join(output_dir, f"qa_report_{self._timestamp()}.html")
-
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        output_file = self.render_report(template_dir, template_file, report_data, output_file)
 
         logger.info(f"QA Report generated at: {output_file}")
         return output_file
 
+    def render_report(self, template_dir: str, template_file: str, context: Mapping[str, Any], output_file: str) -> str:
+        """
+        Render a layout template into a file
+        
+        With ReportConfig.render_workers > 1 the sections included by the
+        layout are rendered in parallel in a process pool and stitched in
+        order, and with ReportConfig.fragment_cache_dir unchanged sections
+        are reused from the fragment cache (see ``SectionRenderer``);
+        otherwise the page is rendered in this process. All produce the same file.
+        With ReportConfig.tailwind_css_file the prebuilt Tailwind CSS replaces
+        the Tailwind CDN script, and with ReportConfig.asset_mode "inline" or
+        "shared" the CDN assets are replaced by vendored copies while the page
+        is written (see ``AssetBundler``).
+        
+        Args:
+            template_dir (str): Directory containing templates
+            template_file (str): Layout template name (e.g. base.html)
+            context (Mapping[str, Any]): Template variables
+            output_file (str): Path of the HTML file
+        
+        Returns:
+            str: Path of the written file
+        """
+        from INFRASTRUCTURE import config
+        self._setup_environment(template_dir)
+        if config.defect_table_mode == "sidecar":
+            context = self.write_sidecars(context, output_file, self.template_variables(template_dir, template_file))
+        if config.tailwind_css_file:
+            context = self.with_tailwind_css(context, template_dir, config.tailwind_css_file)
+        
+        if config.render_workers > 1 or config.fragment_cache_dir:
+            try:
+                from INFRASTRUCTURE.section_renderer import SectionRenderer
+                return SectionRenderer(self, template_dir, config.render_workers).render_to_file(
+                    template_file, context, output_file, bundler=AssetBundler.from_config(template_dir, output_file)
+                )
+            except Exception as e:
+                logger.warning(f"Section rendering failed, rendering the whole page: {str(e)}")
+        
+        template = self.template_env.get_template(template_file)
+        return self.render_to_file(template, context, output_file, bundler=AssetBundler.from_config(template_dir, output_file))
+
+    def template_variables(self, template_dir: str, template_file: str) -> Optional[FrozenSet[str]]:
+        """
+        Return the context variables a layout uses, including the templates it includes
+        
+        Args:
+            template_dir (str): Directory containing templates
+            template_file (str): Layout template name
+        
+        Returns:
+            Optional[FrozenSet[str]]: Variable names, or None if they cannot be
+            determined (dynamic include or unreadable template)
+        """
+        try:
+            from INFRASTRUCTURE.section_renderer import SectionRenderer
+            return SectionRenderer(self, template_dir, 1).variables(template_file)
+        except Exception as e:
+            logger.warning(f"Could not analyze the variables of {template_file}: {str(e)}")
+            return None
+
+    def write_sidecars(self, context: Mapping[str, Any], output_file: str,
+                       used: Optional[FrozenSet[str]] = None) -> Mapping[str, Any]:
+        """
+        Write the large data of ``SIDECAR_VARIABLES`` to .js files next to the report
+        
+        Each file assigns the data to ``window.QA_REPORT_DATA[<variable>]`` and is
+        loaded with a ``<script src>`` tag, which also works when the report is opened
+        from disk (file://), unlike fetching a .json file.
+        
+        Args:
+            context (Mapping[str, Any]): Template variables
+            output_file (str): Path of the HTML file
+            used (Optional[FrozenSet[str]]): Variables the template uses; a variable
+                (or its ``_SRC``) that the template does not reference is not written.
+                None writes every variable
+        
+        Returns:
+            Mapping[str, Any]: Context where each written variable is None and
+            ``<variable>_SRC`` holds the file name relative to the report
+        """
+        overrides = {}
+        base = os.path.splitext(output_file)[0]
+        for variable, suffix in SIDECAR_VARIABLES.items():
+            data = context.get(variable)
+            if data is None:
+                continue
+            if used is not None and variable not in used and f"{variable}_SRC" not in used:
+                continue
+            sidecar_file = f"{base}.{suffix}.js"
+            with open(sidecar_file, 'w', encoding='utf-8', buffering=STREAM_BUFFER_SIZE) as f:
+                f.write(f"(window.{SIDECAR_GLOBAL} = window.{SIDECAR_GLOBAL} || {{}})[{to_script_json(variable)}] = ")
+                f.write(to_script_json(data))
+                f.write(";\n")
+            overrides[variable] = None
+            overrides[f"{variable}_SRC"] = os.path.basename(sidecar_file)
+            logger.info(f"Wrote {variable} to sidecar: {sidecar_file}")
+        return ChainMap(overrides, context) if overrides else context
+
+    def with_tailwind_css(self, context: Mapping[str, Any], template_dir: str, css_file: str) -> Mapping[str, Any]:
+        """
+        Add the prebuilt Tailwind CSS to the context as ``TAILWIND_CSS``
+        
+        The layout then embeds it in a ``<style>`` element instead of loading
+        the Tailwind Play CDN script, which compiles the classes in the browser.
+        
+        Args:
+            context (Mapping[str, Any]): Template variables
+            template_dir (str): Directory containing templates
+            css_file (str): File created by ``tailwind_builder.build_tailwind_css``
+        
+        Returns:
+            Mapping[str, Any]: Context with ``TAILWIND_CSS`` (unchanged if the CSS is missing or out of date)
+        """
+        from INFRASTRUCTURE.tailwind_builder import load_tailwind_css
+        css = load_tailwind_css(template_dir, css_file)
+        if css is None:
+            return context
+        css = re.sub(r"</(style)", r"<\\/\1", css, flags=re.IGNORECASE)
+        return ChainMap({"TAILWIND_CSS": Markup(css)}, context)
+
+    def render_to_file(self, template: jinja2.Template, context: Mapping[str, Any], output_file: str,
+                       compress: Optional[bool] = None, bundler: Optional[AssetBundler] = None) -> str:
+        """
+        Render a template chunk by chunk straight into a file
+        
+        The page is never held in memory as one string: chunks from
+        ``Template.generate`` go to a buffered (optionally gzip) file handle,
+        so peak memory does not grow with the size of the report. Chunks are
+        written to a temporary file in the same directory, which replaces
+        ``output_file`` only once the whole page has rendered, so an error
+        while rendering never leaves a truncated report behind.
+        
+        Args:
+            template (jinja2.Template): Template to render
+            context (Mapping[str, Any]): Template variables
+            output_file (str): Path of the HTML file
+            compress (Optional[bool]): Write gzip and append ".gz" to the path
+                (None = ReportConfig.compress_report)
+            bundler (Optional[AssetBundler]): Rewrites the asset references of the page (None = unchanged)
+        
+        Returns:
+            str: Path of the written file
+        """
+        if compress is None:
+            # import ตอนเรียกใช้ เพราะ INFRASTRUCTURE/__init__ import โมดูลนี้
+            from INFRASTRUCTURE import config
+            compress = config.compress_report
+        
+        if compress:
+            output_file = f"{output_file}.gz"
+        temp_file = f"{output_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if compress:
+                # ชื่อใน header ของ gzip เป็นชื่อไฟล์จริง ไม่ใช่ชื่อไฟล์ชั่วคราว
+                raw = open(temp_file, 'wb', buffering=STREAM_BUFFER_SIZE)
+                f = io.TextIOWrapper(
+                    gzip.GzipFile(os.path.basename(output_file), 'wb', fileobj=raw), encoding='utf-8'
+                )
+            else:
+                raw = None
+                f = open(temp_file, 'w', encoding='utf-8', buffering=STREAM_BUFFER_SIZE)
+            chunks = template.generate(**context)
+            if bundler is not None:
+                chunks = bundler.rewrite(chunks)
+            try:
+                with f:
+                    f.writelines(chunks)
+            finally:
+                if raw is not None:
+                    raw.close()
+            os.replace(temp_file, output_file)
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+        return output_file
+
     def _timestamp(self) -> str:
         """
         Generate timestamp string
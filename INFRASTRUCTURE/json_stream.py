@@ -0,0 +1,172 @@
+# INFRASTRUCTURE/json_stream.py
+
+"""
+JSON Stream
+Incremental JSON tokenizer for walking very large documents element by element
+
+อ่านไฟล์ทีละ chunk และ decode ทีละ element ด้วย json.JSONDecoder.raw_decode
+หน่วยความจำที่ใช้จึงขึ้นกับขนาดของ element ที่ใหญ่ที่สุด ไม่ใช่ขนาดของไฟล์ทั้งหมด
+"""
+
+import json
+from typing import Any, Iterator, TextIO
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+# ตัวอักษรที่อาจต่อท้ายตัวเลขที่ decode ได้แล้ว
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class JsonStream:
+    """
+    Pull-style tokenizer over a text file containing a JSON document
+    """
+
+    def __init__(self, f: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initialize JSON stream
+
+        Args:
+            f (TextIO): File opened in text mode
+            chunk_size (int): Number of characters to read per chunk
+        """
+        self._file = f
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """
+        Read the next chunk into the buffer, dropping the consumed prefix
+
+        Returns:
+            bool: False if the end of the file has been reached
+        """
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Return the next non-whitespace character without consuming it
+
+        Returns:
+            str: Next character, or "" at the end of the document
+        """
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """
+        Consume the next non-whitespace character, which must be ``char``
+
+        Raises:
+            json.JSONDecodeError: If another character is found
+        """
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buf, self._pos)
+        self._pos += 1
+
+    def decode_value(self) -> Any:
+        """
+        Decode and consume the next complete JSON value
+
+        Returns:
+            Any: Decoded value
+
+        Raises:
+            json.JSONDecodeError: If the document is malformed
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # value ที่จบพอดีกับท้าย buffer อาจยังอ่านมาไม่ครบ และตัวเลขที่ถูกตัดกลาง chunk
+                # (เช่น "12." ของ 12.25e3) decode ได้เป็นส่วนต้นของมัน จึงต้องอ่านต่อก่อนรับค่า
+                complete = end < len(self._buf) and not (
+                    isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and self._buf[end] in _NUMBER_CHARS
+                )
+                if complete or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            # value ยังไม่ครบ อ่าน chunk ถัดไปแล้ว decode ใหม่ (ถ้าจบไฟล์แล้วรอบถัดไปจะรายงาน error)
+            self._fill()
+
+    def skip_value(self) -> None:
+        """
+        Consume the next JSON value without materializing containers
+        """
+        char = self.peek()
+        if char == "[":
+            for _ in self.iter_array():
+                self.skip_value()
+        elif char == "{":
+            for _ in self.iter_object():
+                self.skip_value()
+        else:
+            self.decode_value()
+
+    def iter_array(self) -> Iterator[None]:
+        """
+        Walk a JSON array
+
+        Yields once per element, positioned at the element; the caller must
+        consume it with ``decode_value`` or ``skip_value`` before resuming.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self._buf, self._pos - 1)
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Walk a JSON object
+
+        Yields each member key, positioned at its value; the caller must
+        consume the value with ``decode_value`` or ``skip_value`` before resuming.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", self._buf, self._pos)
+            key = self.decode_value()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self._buf, self._pos - 1)
@@ -0,0 +1,186 @@
+# INFRASTRUCTURE/records.py
+
+"""
+Records
+Typed, slotted records decoded once from the dictionaries of the JSON inputs
+
+defect, module และจุดข้อมูลของ trend เคยถูกส่งผ่าน CORE เป็น dict และแต่ละจุดที่ใช้ต้องหา alias
+ของ field เดียวกันซ้ำด้วย ``.get`` ต่อกันหลายชั้น (เช่น closed_date / closedDate, blocked / block)
+module นี้ decode dict เป็น dataclass ที่มี ``__slots__`` เพียงครั้งเดียว: alias ถูก resolve ตามลำดับใน
+*_ALIASES (key แรกที่มีอยู่ใน dict เหมือน ``d.get(a, d.get(b))``) และค่าที่ใช้เทียบถูกแปลงไว้ล่วงหน้า
+(เช่น status ตัวพิมพ์เล็ก) หลังจากนั้นทุกจุดอ่านค่าเป็น attribute ซึ่งเร็วกว่าและใช้หน่วยความจำน้อยกว่า dict
+
+ค่าที่ไม่มีใน dict เป็น None (ยกเว้นจำนวนของ module/trend ซึ่งเป็น 0 ตามค่าเริ่มต้นเดิม)
+ค่าแสดงผลแทนค่าที่ไม่มี (เช่น 'Unknown', 'N/A') ยังเป็นของแต่ละจุดที่ใช้
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+# alias ของแต่ละ field ของ Defect (ลำดับ = ลำดับที่เลือก)
+DEFECT_ALIASES = {
+    "issue_id": ("issueId", "id"),
+    "summary": ("summary", "title"),
+    "description": ("description",),
+    "status": ("status",),
+    "severity": ("severity",),
+    "priority": ("priority",),
+    "module": ("module", "component"),
+    "page": ("page",),
+    "created_date": ("created_date", "createdDate", "createDate", "created_at"),
+    "reported_date": ("reportedDate", "reported_date"),
+    "closed_date": ("closed_date", "closedDate", "resolved_date", "resolvedDate"),
+    "updated_date": ("updated_date", "updatedDate"),
+    "resolution": ("resolution",),
+}
+
+# alias ของจำนวน test case ใน ``testCases`` ของแต่ละ module
+MODULE_CASE_ALIASES = {
+    "total": ("total",),
+    "passed": ("passed",),
+    "failed": ("failed",),
+    "blocked": ("blocked", "block"),
+    "in_progress": ("inProgress", "in_progress"),
+    "not_started": ("notStarted", "not_started"),
+}
+
+# key ของแต่ละจุดใน ``TREND_ANALYSIS.DATA``
+TREND_POINT_KEYS = {
+    "date": "DATE",
+    "executed": "TEST_CASES_EXECUTED",
+    "passed": "TEST_CASES_PASSED",
+    "failed": "TEST_CASES_FAILED",
+    "blocked": "TEST_CASES_BLOCKED",
+    "in_progress": "TEST_CASES_IN_PROGRESS",
+    "not_started": "TEST_CASES_NOT_STARTED",
+    "coverage": "TEST_COVERAGE",
+}
+_TREND_COUNT_KEYS = tuple(TREND_POINT_KEYS.values())[1:]
+
+
+def first_of(record: Dict[str, Any], keys: Sequence[str], default: Any = None) -> Any:
+    """
+    Return the value of the first key present in a dictionary
+
+    Args:
+        record (Dict[str, Any]): Source dictionary
+        keys (Sequence[str]): Aliases in order of preference
+        default (Any): Value if no alias is present
+
+    Returns:
+        Any: Value of the first present alias (even if it is None or empty)
+    """
+    for key in keys:
+        if key in record:
+            return record[key]
+    return default
+
+
+@dataclass
+class Defect:
+    """
+    One defect with its field aliases resolved
+    """
+
+    __slots__ = tuple(DEFECT_ALIASES) + ("status_key",)
+
+    issue_id: Any
+    summary: Any
+    description: Any
+    status: Any
+    severity: Any
+    priority: Any
+    module: Any
+    page: Any
+    created_date: Any
+    reported_date: Any
+    closed_date: Any
+    updated_date: Any
+    resolution: Any
+    status_key: str
+
+    @classmethod
+    def from_dict(cls, record: Dict[str, Any]) -> "Defect":
+        """
+        Decode a defect dictionary
+
+        Args:
+            record (Dict[str, Any]): Defect fields as found in DEFECT.json
+
+        Returns:
+            Defect: Record (``status_key`` = status in lower case, '' if missing)
+        """
+        values = [first_of(record, keys) for keys in DEFECT_ALIASES.values()]
+        status = values[3]
+        return cls(*values, status_key=str(status).lower() if status is not None else '')
+
+
+@dataclass
+class TestModule:
+    """
+    Test case counts of one module
+    """
+
+    __slots__ = ("name", "description", "remark") + tuple(MODULE_CASE_ALIASES)
+
+    name: Any
+    description: Any
+    remark: Any
+    total: int
+    passed: int
+    failed: int
+    blocked: int
+    in_progress: int
+    not_started: int
+
+    @classmethod
+    def from_dict(cls, module: Dict[str, Any]) -> "TestModule":
+        """
+        Decode a module of ``modules`` in the test data
+
+        Args:
+            module (Dict[str, Any]): Module with ``name`` and ``testCases`` counts
+
+        Returns:
+            TestModule: Record (``not_started`` defaults to the cases not in another state)
+        """
+        cases = module.get('testCases', {})
+        total, passed, failed, blocked, in_progress = (
+            int(first_of(cases, MODULE_CASE_ALIASES[key], 0))
+            for key in ("total", "passed", "failed", "blocked", "in_progress")
+        )
+        not_started = int(first_of(cases, MODULE_CASE_ALIASES["not_started"],
+                                   total - passed - failed - blocked - in_progress))
+        return cls(module.get('name', 'Unknown Module'), module.get('description'), module.get('remark'),
+                   total, passed, failed, blocked, in_progress, not_started)
+
+
+@dataclass
+class TrendPoint:
+    """
+    Test execution counts of one day of the test trend
+    """
+
+    __slots__ = tuple(TREND_POINT_KEYS)
+
+    date: Optional[str]
+    executed: Any
+    passed: Any
+    failed: Any
+    blocked: Any
+    in_progress: Any
+    not_started: Any
+    coverage: Any
+
+    @classmethod
+    def from_dict(cls, item: Dict[str, Any]) -> "TrendPoint":
+        """
+        Decode one entry of ``TREND_ANALYSIS.DATA``
+
+        Args:
+            item (Dict[str, Any]): Daily counts
+
+        Returns:
+            TrendPoint: Record (missing counts are 0, a missing date is None)
+        """
+        return cls(item.get("DATE"), *(item.get(key, 0) for key in _TREND_COUNT_KEYS))
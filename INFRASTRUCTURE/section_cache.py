@@ -0,0 +1,269 @@
+# INFRASTRUCTURE/section_cache.py
+
+"""
+Section Cache
+Content-addressed on-disk cache for the output of the prepare_* functions
+
+ผลลัพธ์ของแต่ละ section (เช่น Test Summary, Defect Distribution) ถูกเก็บเป็นไฟล์ใน cache directory
+ชื่อไฟล์คือ hash ของ: ชื่อ section + hash ของเนื้อหาไฟล์ข้อมูลที่ใช้ + พารามิเตอร์ + เวอร์ชันของโค้ด
+(hash ของ source ใน CORE / INFRASTRUCTURE / UTILS และ QAReportLibrary2.py) + ค่าใน ReportConfig ที่เปลี่ยนผลลัพธ์
+(OUTPUT_CONFIG_FIELDS)
+จึงไม่ต้องสั่ง invalidate เอง:
+ข้อมูลหรือโค้ดที่เปลี่ยนจะได้ key ใหม่ ส่วน section ที่ไม่เปลี่ยนโหลดจากดิสก์ได้ข้ามการรัน (เช่นใน CI)
+
+ผลลัพธ์ว่างและค่าแทนที่ prepare คืนเมื่อเกิดข้อผิดพลาด (SectionFallback) ไม่ถูกเก็บ
+ข้อผิดพลาดชั่วคราวจึงไม่ถูกส่งต่อไปยังการรันครั้งถัดไป
+
+SectionRenderer ใช้ cache เดียวกันนี้เก็บ HTML ของ section ที่ render แล้ว (fragment)
+
+ข้อมูลถูกเก็บด้วย pickle (binary) และบีบอัดด้วย zlib เขียนผ่านไฟล์ชั่วคราวแล้ว rename
+เพื่อไม่ให้ process อื่นอ่านไฟล์ที่เขียนไม่เสร็จ
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import zlib
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from UTILS import get_logger
+from INFRASTRUCTURE.dataset_cache import DatasetCache, FileSignature
+
+# Setup logger
+logger = get_logger("SectionCache")
+
+# เปลี่ยนเมื่อรูปแบบไฟล์ cache เปลี่ยน
+SECTION_CACHE_VERSION = "1"
+
+# package ที่ผลลัพธ์ของ prepare_* ขึ้นอยู่กับ
+SOURCE_PACKAGES = ("CORE", "INFRASTRUCTURE", "UTILS")
+
+# ไฟล์ที่ root ของโปรเจกต์ที่กำหนดรูปแบบผลลัพธ์ของ section (keyword เรียก prepare_* และประกอบผลลัพธ์)
+SOURCE_FILES = ("QAReportLibrary2.py",)
+
+# ค่าใน ReportConfig ที่เปลี่ยนผลลัพธ์ของ prepare_* (เช่นคำศัพท์ของสถานะเปลี่ยนจำนวน open/closed)
+OUTPUT_CONFIG_FIELDS = ("status_vocabulary", "severity_vocabulary", "chart_delta_encoding")
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SectionFallback(dict):
+    """
+    Placeholder section data returned after an error (never stored in the cache)
+    """
+
+
+class SectionCache:
+    """
+    Disk cache of prepared report sections keyed by input content and code version
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize section cache
+
+        Args:
+            cache_dir (Optional[str]): Cache directory (None = caching disabled)
+        """
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._file_hashes: Dict[FileSignature, str] = {}
+        self._code_version: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        """True if a cache directory is configured"""
+        return bool(self.cache_dir)
+
+    def code_version(self) -> str:
+        """
+        Return the hash of the library source (computed once per process)
+
+        Returns:
+            str: Hex digest of every .py file in ``SOURCE_PACKAGES`` and of ``SOURCE_FILES``
+        """
+        if self._code_version is None:
+            digest = hashlib.sha256(SECTION_CACHE_VERSION.encode())
+            for package in SOURCE_PACKAGES:
+                package_dir = os.path.join(_PROJECT_ROOT, package)
+                for name in sorted(os.listdir(package_dir)):
+                    if name.endswith(".py"):
+                        digest.update(f"{package}/{name}".encode())
+                        with open(os.path.join(package_dir, name), 'rb') as f:
+                            digest.update(f.read())
+            for name in SOURCE_FILES:
+                digest.update(name.encode())
+                with open(os.path.join(_PROJECT_ROOT, name), 'rb') as f:
+                    digest.update(f.read())
+            self._code_version = digest.hexdigest()
+        return self._code_version
+
+    @staticmethod
+    def config_version() -> str:
+        """
+        Return the current values of the ReportConfig fields that change section output
+
+        Returns:
+            str: repr of ``OUTPUT_CONFIG_FIELDS`` values (read on every call, config may change between keywords)
+        """
+        from INFRASTRUCTURE import config
+        return repr(tuple(getattr(config, name) for name in OUTPUT_CONFIG_FIELDS))
+
+    def file_hash(self, file_path: str) -> str:
+        """
+        Return the content hash of a file (hashed once per path, mtime and size)
+
+        Args:
+            file_path (str): Path to input file
+
+        Returns:
+            str: Hex digest of the file content
+        """
+        sig = DatasetCache.signature(file_path)
+        with self._lock:
+            digest = self._file_hashes.get(sig)
+            if digest is None:
+                hasher = hashlib.sha256()
+                with open(sig[0], 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        hasher.update(chunk)
+                digest = self._file_hashes[sig] = hasher.hexdigest()
+            return digest
+
+    def key(self, section: str, input_files: Sequence[str], params: Tuple[Any, ...] = ()) -> str:
+        """
+        Build the cache key of a section
+
+        Args:
+            section (str): Section name (e.g. "defect_distribution")
+            input_files (Sequence[str]): Data files the section is computed from
+            params (Tuple[Any, ...]): Other arguments that change the output (e.g. limit)
+
+        Returns:
+            str: Hex digest used as the cache file name
+        """
+        digest = hashlib.sha256()
+        digest.update(self.code_version().encode())
+        digest.update(self.config_version().encode())
+        digest.update(section.encode())
+        for file_path in input_files:
+            digest.update(self.file_hash(file_path).encode())
+        digest.update(repr(params).encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        """Return the file path of a cache key"""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pkl.z")
+
+    def path(self, section: str, input_files: Sequence[str], params: Tuple[Any, ...] = ()) -> str:
+        """
+        Return the cache file of a section
+
+        Args:
+            section (str): Section name
+            input_files (Sequence[str]): Files the section is computed from
+            params (Tuple[Any, ...]): Other arguments that change the output
+
+        Returns:
+            str: Path of the cache file
+        """
+        return self._path(self.key(section, input_files, params))
+
+    def load(self, path: str) -> Any:
+        """
+        Read a cached value
+
+        Args:
+            path (str): Cache file from ``path``
+
+        Returns:
+            Any: Cached value, or None if not cached or unreadable
+        """
+        try:
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    result = pickle.loads(zlib.decompress(f.read()))
+                self.hits += 1
+                return result
+        except Exception as e:
+            logger.warning(f"Cannot read section cache {path}: {str(e)}")
+        self.misses += 1
+        return None
+
+    def store(self, path: str, value: Any) -> None:
+        """
+        Write a value to the cache (atomically, through a temporary file)
+
+        Args:
+            path (str): Cache file from ``path``
+            value (Any): Value to store
+        """
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)))
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"Cannot write section cache {path}: {str(e)}")
+
+    def get_or_compute(self, section: str, input_files: Sequence[Optional[str]], compute: Callable[[], Any],
+                       params: Tuple[Any, ...] = ()) -> Any:
+        """
+        Return the cached output of a section, computing and storing it on a miss
+
+        Sections with a missing input file, and every section when the cache is
+        disabled, are computed directly. Empty results and ``SectionFallback``
+        data (returned by a prepare that failed) are not stored.
+
+        Args:
+            section (str): Section name
+            input_files (Sequence[Optional[str]]): Data files the section is computed from
+            compute (Callable[[], Any]): Function that prepares the section
+            params (Tuple[Any, ...]): Other arguments that change the output
+
+        Returns:
+            Any: Section data
+        """
+        if not self.enabled or not input_files or not all(f and os.path.isfile(f) for f in input_files):
+            return compute()
+
+        try:
+            path = self.path(section, input_files, params)
+        except Exception as e:
+            logger.warning(f"Cannot build section cache key for {section}: {str(e)}")
+            return compute()
+
+        result = self.load(path)
+        if result is not None:
+            logger.info(f"Section cache hit: {section}")
+            return result
+
+        result = compute()
+        if isinstance(result, SectionFallback):
+            logger.warning(f"Section {section} failed, not stored in the section cache")
+        elif result:
+            self.store(path, result)
+            logger.info(f"Section cache stored: {section}")
+        return result
+
+    def clear(self) -> int:
+        """
+        Delete every cached section
+
+        Returns:
+            int: Number of files removed
+        """
+        removed = 0
+        if not self.enabled or not os.path.isdir(self.cache_dir):
+            return removed
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".pkl.z"):
+                    os.remove(os.path.join(root, name))
+                    removed += 1
+        logger.info(f"Section cache cleared: {removed} files")
+        return removed
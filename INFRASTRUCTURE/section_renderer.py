@@ -0,0 +1,292 @@
+# INFRASTRUCTURE/section_renderer.py
+
+"""
+Section Renderer
+Parallel rendering of the report sections in a process pool, with a fragment cache
+
+แต่ละ section ที่ layout (เช่น base.html) include ไว้ที่ระดับบนสุด (test_summary.html, test_trend_analysis.html ฯลฯ)
+ถูก render แยกกันใน process pool โดยส่งไปเฉพาะตัวแปรที่ section นั้น (รวม template ที่มัน include ต่อ) ใช้จริง
+จากนั้น layout ถูก render ด้วย environment ที่แทน include ของแต่ละ section ด้วย HTML ที่ render ไว้แล้ว
+ตามลำดับเดิม ผลลัพธ์จึงเหมือนการ render ทั้งหน้าใน process เดียวทุกประการ
+
+section ถูก render ด้วย context ชุดเดียวกับ layout (layout ไม่ได้ set ตัวแปรก่อน include)
+
+เมื่อตั้ง ReportConfig.fragment_cache_dir HTML ของแต่ละ section ถูกเก็บใน SectionCache โดยมี fingerprint คือ
+hash ของ source ของ section (รวม template ที่ include ต่อ) และ hash ของค่าตัวแปรที่ section ใช้
+section ที่ทั้ง template และข้อมูลไม่เปลี่ยน (เช่น Test Summary เมื่อเปลี่ยนเฉพาะข้อมูล defect) จึงไม่ต้อง render ใหม่
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
+
+import jinja2
+from jinja2 import meta
+
+from UTILS import get_logger
+from INFRASTRUCTURE.asset_bundler import AssetBundler
+from INFRASTRUCTURE.html_renderer import HTMLRenderer
+from INFRASTRUCTURE.section_cache import SectionCache
+
+# Setup logger
+logger = get_logger("SectionRenderer")
+
+# include ที่ระบุชื่อ template ตรงๆ ใน layout
+SECTION_INCLUDE = re.compile(r"""\{%-?\s*include\s+(["'])([^"']+)\1""")
+
+# ตัวแปรใน context ของ layout ที่เก็บ HTML ของแต่ละ section
+SECTIONS_VARIABLE = "_RENDERED_SECTIONS"
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+# environment สำหรับประกอบ layout (ต่อ environment หลัก) และชื่อ section ที่ถูกแทนด้วย HTML
+_stitch_environments: Dict[int, Tuple[jinja2.Environment, Set[str]]] = {}
+# ตัวแปรที่แต่ละ template ใช้ และ template ที่มัน include (key = ชื่อ template, hash ของ source)
+_template_info: Dict[Tuple[str, str], Tuple[Optional[FrozenSet[str]], Optional[Tuple[str, ...]]]] = {}
+
+# fragment cache ต่อ directory (ใช้ร่วมกันเพื่อให้ hash ของไฟล์และโค้ดถูกคำนวณครั้งเดียว)
+_fragment_caches: Dict[str, SectionCache] = {}
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Return the shared process pool, (re)creating it for another number of workers
+    """
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(max_workers=workers)
+            _executor_workers = workers
+        return _executor
+
+
+def _reset_executor() -> None:
+    """Drop a broken process pool"""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
+        _executor_workers = 0
+
+
+def _render_section(settings: Tuple[str, Optional[str], Optional[str]], name: str, context: Dict[str, Any]) -> str:
+    """
+    Render one section in a worker process
+
+    Args:
+        settings (Tuple[str, Optional[str], Optional[str]]): (template dir, bytecode cache dir, precompiled template dir)
+        name (str): Section template name
+        context (Dict[str, Any]): Variables used by the section
+
+    Returns:
+        str: Rendered HTML of the section
+    """
+    template_dir, cache_dir, precompiled_dir = settings
+    from INFRASTRUCTURE import config
+    config.template_cache_dir = cache_dir
+    config.precompiled_template_dir = precompiled_dir
+    renderer = HTMLRenderer()
+    renderer._setup_environment(template_dir)
+    return renderer.template_env.get_template(name).render(**context)
+
+
+class SectionRenderer:
+    """
+    Renders the top-level sections of a layout in parallel and stitches them in order
+    """
+
+    def __init__(self, renderer: HTMLRenderer, template_dir: str, workers: int):
+        """
+        Initialize section renderer
+
+        Args:
+            renderer (HTMLRenderer): Renderer whose environment is set up for ``template_dir``
+            template_dir (str): Directory containing templates
+            workers (int): Number of worker processes
+        """
+        from INFRASTRUCTURE import config
+        self.renderer = renderer
+        self.env = renderer.template_env
+        self.workers = workers
+        self.settings = (template_dir, config.template_cache_dir, config.precompiled_template_dir)
+        # อ่าน source จากไฟล์โดยตรง (ModuleLoader ของ template ที่ precompile ไม่มี source)
+        self.source_loader = jinja2.FileSystemLoader(template_dir)
+
+    def _source(self, name: str) -> str:
+        """Return the source of a template"""
+        return self.source_loader.get_source(self.env, name)[0]
+
+    def sections(self, template_file: str) -> List[str]:
+        """
+        Return the templates included at the top level of a layout, in order
+
+        Args:
+            template_file (str): Layout template name (e.g. base.html)
+
+        Returns:
+            List[str]: Distinct section template names
+        """
+        names = []
+        for match in SECTION_INCLUDE.finditer(self._source(template_file)):
+            if match.group(2) not in names:
+                names.append(match.group(2))
+        return names
+
+    def _analyze(self, name: str) -> Tuple[Optional[FrozenSet[str]], Optional[Tuple[str, ...]]]:
+        """
+        Return the context variables a template uses and the templates it depends on,
+        including the templates it includes (None when an include is dynamic)
+        """
+        source = self._source(name)
+        key = (name, hashlib.sha1(source.encode('utf-8')).hexdigest())
+        if key not in _template_info:
+            ast = self.env.parse(source)
+            names: Optional[Set[str]] = set(meta.find_undeclared_variables(ast))
+            dependencies: Optional[List[str]] = [name]
+            for child in meta.find_referenced_templates(ast):
+                child_names, child_dependencies = self._analyze(child) if child is not None else (None, None)
+                if child_names is None or child_dependencies is None:
+                    names = dependencies = None
+                    break
+                names |= child_names
+                dependencies.extend(dep for dep in child_dependencies if dep not in dependencies)
+            _template_info[key] = (
+                frozenset(names) if names is not None else None,
+                tuple(dependencies) if dependencies is not None else None,
+            )
+        return _template_info[key]
+
+    def variables(self, name: str) -> Optional[FrozenSet[str]]:
+        """
+        Return the context variables a template uses, including the templates it includes
+
+        Args:
+            name (str): Template name
+
+        Returns:
+            Optional[FrozenSet[str]]: Variable names, or None if an include is dynamic
+        """
+        return self._analyze(name)[0]
+
+    def dependencies(self, name: str) -> Optional[Tuple[str, ...]]:
+        """
+        Return a template and every template it includes
+
+        Args:
+            name (str): Template name
+
+        Returns:
+            Optional[Tuple[str, ...]]: Template names, or None if an include is dynamic
+        """
+        return self._analyze(name)[1]
+
+    def _stitch_environment(self, sections: List[str]) -> jinja2.Environment:
+        """
+        Return an overlay of the environment where each section include renders its precomputed HTML
+        """
+        entry = _stitch_environments.get(id(self.env))
+        if entry is None:
+            stubbed: Set[str] = set()
+
+            def load_stub(name: str):
+                if name not in stubbed:
+                    return None
+                source = "{{ %s[%r]|safe }}" % (SECTIONS_VARIABLE, name)
+                return source, None, lambda: True
+
+            stitch_env = self.env.overlay(loader=jinja2.ChoiceLoader([jinja2.FunctionLoader(load_stub), self.env.loader]))
+            entry = _stitch_environments[id(self.env)] = (stitch_env, stubbed)
+        stitch_env, stubbed = entry
+        if not stubbed.issuperset(sections):
+            stubbed.update(sections)
+            stitch_env.cache.clear()
+        return stitch_env
+
+    def _fragment_cache(self) -> Optional[SectionCache]:
+        """Return the fragment cache of ReportConfig.fragment_cache_dir (None if disabled)"""
+        from INFRASTRUCTURE import config
+        cache_dir = config.fragment_cache_dir
+        if not cache_dir:
+            return None
+        cache = _fragment_caches.get(cache_dir)
+        if cache is None:
+            cache = _fragment_caches[cache_dir] = SectionCache(cache_dir)
+        return cache
+
+    def _render_section(self, name: str, context: Mapping[str, Any], section_context: Dict[str, Any]):
+        """
+        Start rendering one section: in the process pool (returns a Future) or in this process (returns the HTML)
+        """
+        if self.workers > 1:
+            return _get_executor(self.workers).submit(_render_section, self.settings, name, section_context)
+        return self.env.get_template(name).render(**context)
+
+    def render_to_file(self, template_file: str, context: Mapping[str, Any], output_file: str,
+                       bundler: Optional[AssetBundler] = None) -> str:
+        """
+        Render the sections of a layout (reusing cached fragments), then stream the stitched page to a file
+
+        Args:
+            template_file (str): Layout template name
+            context (Mapping[str, Any]): Template variables
+            output_file (str): Path of the HTML file
+            bundler (Optional[AssetBundler]): Rewrites the asset references of the stitched page
+
+        Returns:
+            str: Path of the written file
+        """
+        sections = self.sections(template_file)
+        fragment_cache = self._fragment_cache()
+        template_dir = self.settings[0]
+
+        pending = {}
+        rendered: Dict[str, str] = {}
+        keys: Dict[str, Tuple[List[str], Tuple[str]]] = {}
+        for name in sections:
+            names = self.variables(name)
+            section_context = context if names is None else {key: context[key] for key in names if key in context}
+
+            dependencies = self.dependencies(name)
+            if fragment_cache is not None and names is not None and dependencies is not None:
+                try:
+                    # fingerprint ของข้อมูล: ค่าตัวแปรที่ section ใช้ (เรียงตามชื่อ)
+                    data = pickle.dumps(sorted(section_context.items()), protocol=4)
+                    input_files = [os.path.join(template_dir, *dep.split("/")) for dep in dependencies]
+                    keys[name] = (input_files, (hashlib.sha256(data).hexdigest(),))
+                    path = fragment_cache.path(f"fragment:{name}", *keys[name])
+                    html = fragment_cache.load(path)
+                    if html is not None:
+                        rendered[name] = html
+                        continue
+                except Exception as e:
+                    logger.debug(f"Section {name} is not cacheable: {str(e)}")
+                    keys.pop(name, None)
+
+            pending[name] = self._render_section(name, context, section_context)
+
+        try:
+            for name, result in pending.items():
+                rendered[name] = result.result() if self.workers > 1 else result
+        except Exception:
+            if self.workers > 1:
+                _reset_executor()
+            raise
+        logger.debug(f"Sections: {len(pending)} rendered, {len(sections) - len(pending)} from fragment cache")
+
+        if fragment_cache is not None:
+            for name in pending:
+                if name in keys:
+                    fragment_cache.store(fragment_cache.path(f"fragment:{name}", *keys[name]), rendered[name])
+
+        template = self._stitch_environment(sections).get_template(template_file)
+        return self.renderer.render_to_file(template, dict(context, **{SECTIONS_VARIABLE: rendered}), output_file,
+                                          bundler=bundler)
@@ -0,0 +1,259 @@
+# INFRASTRUCTURE/tailwind_builder.py
+
+"""
+Tailwind Builder
+Build-time Tailwind CSS for the report instead of the Play CDN JIT script
+
+โดยปกติรายงานโหลด https://cdn.tailwindcss.com ซึ่ง compile Tailwind ใน browser ทุกครั้งที่เปิดรายงาน
+(สแกน DOM ทั้งหน้าและใช้ ``tailwind.config`` ใน head_scripts.html) ทำให้หน้าแรกแสดงช้า
+ขั้นตอน build นี้เรียก Tailwind CLI (v3 เวอร์ชันเดียวกับ Play CDN) โดยใช้ config จาก head_scripts.html
+และสแกน class จาก template (**/*.html), assets/js และโค้ด Python ที่สร้างชื่อ class (เช่น PROGRESS_STATUS_COLOR)
+ได้ CSS แบบ minify ที่มีเฉพาะ class ที่ใช้จริง
+
+เมื่อตั้ง ReportConfig.tailwind_css_file CSS นี้ถูกใส่ใน <style> ของรายงานผ่านตัวแปร TAILWIND_CSS
+และ template ไม่โหลด script ของ Tailwind อีก บรรทัดแรกของไฟล์เก็บ hash ของไฟล์ที่สแกน
+ถ้า template หรือโค้ดเปลี่ยนหลัง build (class ใหม่อาจไม่มีใน CSS) รายงานกลับไปใช้ Play CDN พร้อม warning
+
+วิธีใช้ (จาก root ของโปรเจกต์ ต้องมี tailwindcss standalone CLI หรือ npx):
+    python -m INFRASTRUCTURE.tailwind_builder TEMPLATES build/tailwind.css
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from UTILS import get_logger, json_dumps
+
+# Setup logger
+logger = get_logger("TailwindBuilder")
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# template ที่มี ``tailwind.config = {...}`` ที่ Play CDN ใช้
+TAILWIND_CONFIG_TEMPLATE = "partials/head_scripts.html"
+
+# ไฟล์ที่ Tailwind สแกนหา class (pattern ภายใน template directory และภายในโปรเจกต์)
+TEMPLATE_CONTENT = ("**/*.html", "assets/js/**/*.js")
+PROJECT_CONTENT = ("CORE/**/*.py", "QAReportLibrary2.py")
+
+# เวอร์ชันของ Tailwind เมื่อเรียกผ่าน npx (Play CDN คือ Tailwind v3)
+TAILWIND_PACKAGE = "tailwindcss@3"
+
+TAILWIND_INPUT = "@tailwind base;\n@tailwind components;\n@tailwind utilities;\n"
+
+# บรรทัดแรกของ CSS ที่ build แล้ว: hash ของไฟล์ที่สแกน
+SOURCES_HEADER = "/*! qa-report tailwind sources: {digest} */\n"
+SOURCES_HEADER_PATTERN = re.compile(r"/\*! qa-report tailwind sources: ([0-9a-f]+) \*/")
+
+# hash ของไฟล์ที่สแกน (key = path, mtime และขนาดของทุกไฟล์) และ CSS ที่โหลดแล้ว (key = path, mtime)
+_digests: Dict[Tuple[Tuple[str, float, int], ...], str] = {}
+_stylesheets: Dict[Tuple[str, float], Tuple[str, str]] = {}
+_lock = threading.Lock()
+
+
+def content_files(template_dir: str) -> List[str]:
+    """
+    Return the files Tailwind scans for class names
+
+    Args:
+        template_dir (str): Directory containing templates
+
+    Returns:
+        List[str]: Sorted absolute paths
+    """
+    files = set()
+    for root, patterns in ((template_dir, TEMPLATE_CONTENT), (_PROJECT_ROOT, PROJECT_CONTENT)):
+        for pattern in patterns:
+            files.update(os.path.abspath(path) for path in glob.glob(os.path.join(root, pattern), recursive=True))
+    return sorted(path for path in files if os.path.isfile(path))
+
+
+def sources_digest(template_dir: str) -> str:
+    """
+    Return the hash of the files Tailwind scans (rehashed only when a file changes)
+
+    Args:
+        template_dir (str): Directory containing templates
+
+    Returns:
+        str: Hex digest of the file names and contents
+    """
+    files = content_files(template_dir)
+    signature = tuple((path, os.path.getmtime(path), os.path.getsize(path)) for path in files)
+    with _lock:
+        digest = _digests.get(signature)
+    if digest is None:
+        hasher = hashlib.sha256()
+        for path in files:
+            hasher.update(os.path.relpath(path, _PROJECT_ROOT).replace(os.sep, "/").encode())
+            with open(path, 'rb') as f:
+                hasher.update(hashlib.sha256(f.read()).digest())
+        digest = hasher.hexdigest()
+        with _lock:
+            _digests[signature] = digest
+    return digest
+
+
+def extract_tailwind_config(template_dir: str) -> str:
+    """
+    Return the ``tailwind.config`` object literal of the templates
+
+    Args:
+        template_dir (str): Directory containing templates
+
+    Returns:
+        str: JavaScript object literal (``{}`` if the template has none)
+    """
+    path = os.path.join(template_dir, *TAILWIND_CONFIG_TEMPLATE.split("/"))
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    match = re.search(r"tailwind\.config\s*=\s*\{", source)
+    if match is None:
+        logger.warning(f"No tailwind.config in {path}, using the default theme")
+        return "{}"
+
+    # หา } ที่ปิด object (ข้ามวงเล็บที่อยู่ใน string)
+    start = match.end() - 1
+    depth, quote = 0, None
+    for index in range(start, len(source)):
+        char = source[index]
+        if quote:
+            if char == quote and source[index - 1] != "\\":
+                quote = None
+        elif char in "'\"`":
+            quote = char
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return source[start:index + 1]
+    raise ValueError(f"Unterminated tailwind.config in {path}")
+
+
+def _tailwind_command(cli: Optional[str]) -> List[str]:
+    """Return the command that runs the Tailwind CLI"""
+    if cli:
+        return [cli]
+    standalone = shutil.which("tailwindcss")
+    if standalone:
+        return [standalone]
+    npx = shutil.which("npx")
+    if npx:
+        return [npx, "--yes", TAILWIND_PACKAGE]
+    raise FileNotFoundError("Tailwind CLI not found: install the tailwindcss standalone CLI or Node.js (npx)")
+
+
+def build_tailwind_css(template_dir: str, output_file: str, cli: Optional[str] = None) -> str:
+    """
+    Generate the minified Tailwind CSS of the classes used by the templates
+
+    Args:
+        template_dir (str): Directory containing templates (e.g. TEMPLATES)
+        output_file (str): Path of the CSS file
+        cli (Optional[str]): Tailwind CLI executable (None = ``tailwindcss`` on PATH, else npx)
+
+    Returns:
+        str: Path of the written file
+    """
+    files = content_files(template_dir)
+    digest = sources_digest(template_dir)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        config_file = os.path.join(work_dir, "tailwind.config.js")
+        with open(config_file, 'w', encoding='utf-8') as f:
+            f.write(f"const config = {extract_tailwind_config(template_dir)};\n")
+            f.write(f"config.content = {json_dumps(files)};\n")
+            f.write("module.exports = config;\n")
+        input_file = os.path.join(work_dir, "input.css")
+        with open(input_file, 'w', encoding='utf-8') as f:
+            f.write(TAILWIND_INPUT)
+        css_file = os.path.join(work_dir, "tailwind.css")
+
+        command = _tailwind_command(cli) + ["-c", config_file, "-i", input_file, "-o", css_file, "--minify"]
+        logger.debug(f"Running: {' '.join(command)}")
+        subprocess.run(command, check=True, cwd=work_dir, capture_output=True)
+
+        with open(css_file, 'r', encoding='utf-8') as f:
+            css = f.read()
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(SOURCES_HEADER.format(digest=digest))
+        f.write(css)
+
+    logger.info(f"Built Tailwind CSS from {len(files)} files into {output_file} ({len(css)} bytes)")
+    return output_file
+
+
+def load_tailwind_css(template_dir: str, css_file: str) -> Optional[str]:
+    """
+    Return the built Tailwind CSS if it matches the current templates
+
+    Args:
+        template_dir (str): Directory containing templates
+        css_file (str): File created by ``build_tailwind_css``
+
+    Returns:
+        Optional[str]: CSS, or None if missing or out of date
+    """
+    try:
+        key = (os.path.abspath(css_file), os.path.getmtime(css_file))
+        with _lock:
+            stylesheet = _stylesheets.get(key)
+        if stylesheet is None:
+            with open(css_file, 'r', encoding='utf-8') as f:
+                css = f.read()
+            match = SOURCES_HEADER_PATTERN.match(css)
+            stylesheet = (match.group(1) if match else "", css)
+            with _lock:
+                _stylesheets[key] = stylesheet
+    except Exception as e:
+        logger.warning(f"Tailwind CSS not available in {css_file}: {str(e)}")
+        return None
+
+    built_digest, css = stylesheet
+    if built_digest != sources_digest(template_dir):
+        logger.warning(f"Templates changed since {css_file} was built, using the Tailwind CDN script")
+        return None
+    return css
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Command line entry point
+
+    Args:
+        argv (Optional[Sequence[str]]): Arguments (default: sys.argv[1:])
+
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(description="Build the Tailwind CSS used by the QA report templates")
+    parser.add_argument("template_dir", help="Directory containing templates (e.g. TEMPLATES)")
+    parser.add_argument("output_file", help="Path of the CSS file")
+    parser.add_argument("--cli", help="Tailwind CLI executable (default: tailwindcss on PATH, else npx)")
+    args = parser.parse_args(argv)
+
+    try:
+        build_tailwind_css(args.template_dir, args.output_file, args.cli)
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Tailwind CLI failed: {e.stderr.decode('utf-8', errors='replace') if e.stderr else str(e)}")
+        return 1
+    except Exception as e:
+        logger.error(f"Failed to build Tailwind CSS: {str(e)}")
+        return 1
+    print(f"Built Tailwind CSS into {args.output_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
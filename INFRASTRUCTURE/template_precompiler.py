@@ -0,0 +1,145 @@
+# INFRASTRUCTURE/template_precompiler.py
+
+"""
+Template Precompiler
+Ahead-of-time compilation of the report templates into Python modules
+
+template ทั้งหมดใน TEMPLATES/ (base.html, partials/*.html และ assets/css/styles.css ที่ถูก include)
+ถูก compile ล่วงหน้าเป็น Python module ด้วย ``Environment.compile_templates`` และโหลดกลับด้วย
+``jinja2.ModuleLoader`` ตอนสร้างรายงานจึงไม่ต้องเรียก parser/compiler ของ Jinja เลย
+
+ไฟล์ manifest.json เก็บ hash ของ source ทุกไฟล์และเวอร์ชันของ Jinja ถ้า template เปลี่ยน
+หลัง precompile (หรือ Jinja เปลี่ยนเวอร์ชัน) ผลที่ precompile ไว้จะไม่ถูกใช้ และ template ถูก compile จาก source ตามปกติ
+
+วิธีใช้ (จาก root ของโปรเจกต์):
+    python -m INFRASTRUCTURE.template_precompiler TEMPLATES build/templates
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+from typing import Dict, Optional, Sequence
+
+import jinja2
+
+from UTILS import get_logger, json_load_file, json_dump_file
+from INFRASTRUCTURE.html_renderer import HTMLRenderer
+
+# Setup logger
+logger = get_logger("TemplatePrecompiler")
+
+# นามสกุลของไฟล์ที่เป็น template (assets/js ถูกโหลดเป็นไฟล์ธรรมดา ไม่ได้ผ่าน Jinja)
+PRECOMPILE_EXTENSIONS = ("html", "css")
+
+MANIFEST_NAME = "manifest.json"
+
+
+def template_sources(template_dir: str, extensions: Sequence[str] = PRECOMPILE_EXTENSIONS) -> Dict[str, str]:
+    """
+    Return the templates of a directory with the hash of their source
+
+    Args:
+        template_dir (str): Directory containing templates
+        extensions (Sequence[str]): Template file extensions
+
+    Returns:
+        Dict[str, str]: template name -> SHA-256 of the file content
+    """
+    sources = {}
+    for name in jinja2.FileSystemLoader(template_dir).list_templates():
+        if name.rsplit(".", 1)[-1] in extensions:
+            with open(os.path.join(template_dir, *name.split("/")), 'rb') as f:
+                sources[name] = hashlib.sha256(f.read()).hexdigest()
+    return sources
+
+
+def precompile_templates(template_dir: str, target_dir: str) -> int:
+    """
+    Compile every template of a directory into Python modules
+
+    Args:
+        template_dir (str): Directory containing templates (e.g. TEMPLATES)
+        target_dir (str): Output directory for the compiled modules (previous modules are replaced)
+
+    Returns:
+        int: Number of compiled templates
+    """
+    sources = template_sources(template_dir)
+    env = HTMLRenderer.create_environment(jinja2.FileSystemLoader(template_dir))
+
+    # ลบเฉพาะ module ที่ compile ไว้ครั้งก่อน (ไม่ลบไฟล์อื่นใน target_dir)
+    os.makedirs(target_dir, exist_ok=True)
+    for name in os.listdir(target_dir):
+        if name.startswith("tmpl_") and name.endswith(".py"):
+            os.remove(os.path.join(target_dir, name))
+    env.compile_templates(
+        target_dir,
+        extensions=PRECOMPILE_EXTENSIONS,
+        zip=None,
+        ignore_errors=False,
+        log_function=logger.debug
+    )
+
+    manifest = {"jinja2": jinja2.__version__, "sources": sources}
+    json_dump_file(manifest, os.path.join(target_dir, MANIFEST_NAME), pretty=True)
+
+    logger.info(f"Precompiled {len(sources)} templates from {template_dir} into {target_dir}")
+    return len(sources)
+
+
+def load_precompiled(template_dir: str, target_dir: str) -> Optional[jinja2.ModuleLoader]:
+    """
+    Return a loader for precompiled templates if they match the current sources
+
+    Args:
+        template_dir (str): Directory containing template sources
+        target_dir (str): Directory created by ``precompile_templates``
+
+    Returns:
+        Optional[jinja2.ModuleLoader]: Module loader, or None if missing or out of date
+    """
+    manifest_path = os.path.join(target_dir, MANIFEST_NAME)
+    try:
+        manifest = json_load_file(manifest_path)
+    except Exception as e:
+        logger.warning(f"Precompiled templates not available in {target_dir}: {str(e)}")
+        return None
+
+    if manifest.get("jinja2") != jinja2.__version__:
+        logger.warning(f"Precompiled templates were built with Jinja {manifest.get('jinja2')}, compiling from source")
+        return None
+    if manifest.get("sources") != template_sources(template_dir):
+        logger.warning(f"Templates changed since precompilation ({target_dir}), compiling from source")
+        return None
+
+    logger.info(f"Using precompiled templates from: {target_dir}")
+    return jinja2.ModuleLoader(target_dir)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Command line entry point
+
+    Args:
+        argv (Optional[Sequence[str]]): Arguments (default: sys.argv[1:])
+
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(description="Precompile QA report templates into Python modules")
+    parser.add_argument("template_dir", help="Directory containing templates (e.g. TEMPLATES)")
+    parser.add_argument("target_dir", help="Output directory for the compiled templates")
+    args = parser.parse_args(argv)
+
+    try:
+        count = precompile_templates(args.template_dir, args.target_dir)
+    except Exception as e:
+        logger.error(f"Failed to precompile templates: {str(e)}")
+        return 1
+    print(f"Precompiled {count} templates into {args.target_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,11 @@ Test Data Loader
 Responsible for loading test result JSON data
 """
 
-import json
 import os
 from typing import Optional, Dict, Any
 
-from UTILS import get_logger
+from UTILS import get_logger, JSONDecodeError
+from INFRASTRUCTURE.dataset_cache import dataset_cache
 
 # Setup logger
 logger = get_logger("TestDataLoader")
@@ -34,9 +34,9 @@ class TestDataLoader:
             return None
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                logger.info(f"Test data loaded successfully from: {file_path}")
+            # parse ไฟล์เพียงครั้งเดียวต่อ (path, mtime, size) และใช้ผลลัพธ์ร่วมกันทุก keyword
+            data = dataset_cache.read_json(file_path)
+            logger.info(f"Test data loaded successfully from: {file_path}")
 
             # (Optional) Validate required fields
             if "dashboard" not in data or "testCases" not in data:
@@ -45,7 +45,7 @@ class TestDataLoader:
 
             return data
 
-        except json.JSONDecodeError as e:
+        except JSONDecodeError as e:
             logger.error(f"Failed to parse JSON from {file_path}: {str(e)}")
             return None
         except Exception as e:
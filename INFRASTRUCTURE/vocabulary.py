@@ -0,0 +1,208 @@
+# INFRASTRUCTURE/vocabulary.py
+
+"""
+Status Vocabulary
+Central vocabulary of defect statuses and severities with precomputed lookup tables
+
+เดิมแต่ละ analyzer มี list ของสถานะเปิด/ปิดของตัวเอง (ไม่ตรงกัน เช่นบางที่นับเฉพาะ "closed")
+และทุกแถวต้อง ``.lower()`` แล้วค้นใน list ทุกครั้ง module นี้รวมคำศัพท์ไว้ที่เดียว:
+ค่าดิบแต่ละค่าถูกแปลงครั้งเดียว (ตัดช่องว่าง ตัวพิมพ์เล็ก) เป็นรหัสมาตรฐานที่ intern ไว้พร้อม flag
+open / in review / closed (สถานะ) หรือ rank (ความรุนแรง) แล้วเก็บใน lookup table ตามค่าดิบ
+ทุก analyzer จึงได้คำตอบด้วย dict lookup ครั้งเดียว และนับได้ตรงกันทุกส่วนของรายงาน
+
+สถานะ in review (เช่น "ready to test") ยังไม่ปิด จึงนับเป็น open ด้วย
+สถานะที่ไม่อยู่ในคำศัพท์ไม่นับเป็นทั้ง open และ closed (รหัสคือค่าดิบตัวพิมพ์เล็ก)
+
+ปรับคำศัพท์ได้ที่ ReportConfig.status_vocabulary / ReportConfig.severity_vocabulary
+"""
+
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+from UTILS import get_logger
+
+# Setup logger
+logger = get_logger("Vocabulary")
+
+# หมวดของสถานะ -> ค่าดิบที่อยู่ในหมวดนั้น (ไม่สนตัวพิมพ์)
+DEFAULT_STATUS_VOCABULARY: Dict[str, Tuple[str, ...]] = {
+    # "ready to dav" คือค่าที่สะกดผิดใน export ของ issue tracker (เช่น DATA/DEFECT.json) ของ "ready to dev"
+    "open": ("open", "new", "reopen", "reopened", "in progress", "active", "to do", "backlog", "ready to dev", "ready to dav"),
+    "in_review": ("ready to test", "in review", "implementation complete"),
+    "closed": ("closed", "fixed", "resolved", "completed", "done", "verified", "delivered", "released"),
+}
+
+# ระดับความรุนแรง -> ค่าดิบที่อยู่ในระดับนั้น (ไม่สนตัวพิมพ์) เรียงจากรุนแรงที่สุด
+DEFAULT_SEVERITY_VOCABULARY: Dict[str, Tuple[str, ...]] = {
+    "critical": ("critical", "blocker", "p1", "1"),
+    "high": ("high", "major", "p2", "2"),
+    "medium": ("medium", "moderate", "normal", "p3", "3"),
+    "low": ("low", "minor", "p4", "4"),
+    "trivial": ("trivial", "p5", "5"),
+}
+
+# rank ของความรุนแรงที่ไม่อยู่ในคำศัพท์ (เท่ากับ medium)
+DEFAULT_SEVERITY_RANK = 3
+
+
+@dataclass(frozen=True)
+class StatusTerm:
+    """
+    Canonical form of one raw status
+    """
+
+    __slots__ = ("code", "open", "in_review", "closed")
+
+    code: str
+    open: bool
+    in_review: bool
+    closed: bool
+
+
+@dataclass(frozen=True)
+class SeverityTerm:
+    """
+    Canonical form of one raw severity
+    """
+
+    __slots__ = ("code", "rank", "known")
+
+    code: str
+    rank: int
+    known: bool
+
+
+def _normalize(value: Any) -> str:
+    """Return the lookup key of a raw value (stripped, lower case, '' for None)"""
+    return str(value).strip().lower() if value is not None else ''
+
+
+class Vocabulary:
+    """
+    Lookup tables from raw status/severity values to interned canonical terms
+    """
+
+    def __init__(self, statuses: Optional[Mapping[str, Sequence[str]]] = None,
+                 severities: Optional[Mapping[str, Sequence[str]]] = None):
+        """
+        Build the vocabulary
+
+        Args:
+            statuses (Optional[Mapping[str, Sequence[str]]]): "open" / "in_review" / "closed" -> raw statuses
+                (None = DEFAULT_STATUS_VOCABULARY)
+            severities (Optional[Mapping[str, Sequence[str]]]): Level -> raw severities, most severe first
+                (None = DEFAULT_SEVERITY_VOCABULARY)
+        """
+        statuses = DEFAULT_STATUS_VOCABULARY if statuses is None else statuses
+        severities = DEFAULT_SEVERITY_VOCABULARY if severities is None else severities
+        unknown = set(statuses) - set(DEFAULT_STATUS_VOCABULARY)
+        if unknown:
+            raise ValueError(f"Unknown status categories: {sorted(unknown)}")
+
+        self._status_categories: Dict[str, str] = {}
+        for category, values in statuses.items():
+            for value in values:
+                self._status_categories.setdefault(_normalize(value), category)
+        self._severity_levels: Dict[str, Tuple[str, int]] = {}
+        for rank, (level, values) in enumerate(severities.items(), 1):
+            for value in (level,) + tuple(values):
+                self._severity_levels.setdefault(_normalize(value), (sys.intern(level), rank))
+
+        # lookup table: ค่าดิบ -> term (สร้างครั้งแรกที่พบค่านั้น)
+        self._statuses: Dict[Any, StatusTerm] = {}
+        self._severities: Dict[Any, SeverityTerm] = {}
+        self._lock = threading.Lock()
+
+    def status(self, value: Any) -> StatusTerm:
+        """
+        Return the canonical term of a raw status
+
+        Args:
+            value (Any): Status as found in the data (any case, None if missing)
+
+        Returns:
+            StatusTerm: Interned code and open / in review / closed flags
+        """
+        term = self._statuses.get(value)
+        if term is None:
+            key = _normalize(value)
+            category = self._status_categories.get(key)
+            term = StatusTerm(
+                sys.intern(key), category in ("open", "in_review"), category == "in_review", category == "closed"
+            )
+            with self._lock:
+                self._statuses[value] = term
+        return term
+
+    def severity(self, value: Any) -> SeverityTerm:
+        """
+        Return the canonical term of a raw severity
+
+        Args:
+            value (Any): Severity or priority as found in the data (any case, None if missing)
+
+        Returns:
+            SeverityTerm: Interned level (the raw value in lower case if unknown) and rank (1 = most severe)
+        """
+        term = self._severities.get(value)
+        if term is None:
+            key = _normalize(value)
+            level = self._severity_levels.get(key)
+            if level is None:
+                term = SeverityTerm(sys.intern(key), DEFAULT_SEVERITY_RANK, False)
+            else:
+                term = SeverityTerm(level[0], level[1], True)
+            with self._lock:
+                self._severities[value] = term
+        return term
+
+    def is_open(self, status: Any) -> bool:
+        """Return True if a raw status is not closed yet (including in review)"""
+        return self.status(status).open
+
+    def is_in_review(self, status: Any) -> bool:
+        """Return True if a raw status is waiting for review or retest"""
+        return self.status(status).in_review
+
+    def is_closed(self, status: Any) -> bool:
+        """Return True if a raw status is closed"""
+        return self.status(status).closed
+
+    def severity_rank(self, severity: Any) -> int:
+        """Return the rank of a raw severity (1 = most severe)"""
+        return self.severity(severity).rank
+
+    def is_critical(self, severity: Any) -> bool:
+        """Return True if a raw severity is at the most severe level"""
+        term = self.severity(severity)
+        return term.known and term.rank == 1
+
+
+_vocabulary: Optional[Vocabulary] = None
+_vocabulary_key: Any = None
+_vocabulary_lock = threading.Lock()
+
+
+def _freeze(mapping: Optional[Mapping[str, Sequence[str]]]) -> Any:
+    """Return a comparable snapshot of a configured vocabulary"""
+    return None if mapping is None else tuple((key, tuple(values)) for key, values in mapping.items())
+
+
+def get_vocabulary() -> Vocabulary:
+    """
+    Return the shared vocabulary of ReportConfig (rebuilt when the configured vocabulary changes)
+
+    Returns:
+        Vocabulary: Shared vocabulary
+    """
+    global _vocabulary, _vocabulary_key
+    from INFRASTRUCTURE import config
+    key = (_freeze(config.status_vocabulary), _freeze(config.severity_vocabulary))
+    with _vocabulary_lock:
+        if _vocabulary is None or key != _vocabulary_key:
+            _vocabulary = Vocabulary(config.status_vocabulary, config.severity_vocabulary)
+            _vocabulary_key = key
+            logger.debug("Built status/severity vocabulary")
+        return _vocabulary
@@ -1,17 +1,18 @@
 from robot.api import logger
 from robot.api.deco import keyword
 import os
-import json
 from datetime import datetime
+from collections import ChainMap
+from typing import Optional
 import sys
 import platform
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import core modules
-from CORE.report_service import ReportService
+from CORE.report_service import ReportService, DEFECT_ROW_FIELDS
 from CORE.metrics_calculator import calculate_test_metrics, calculate_defect_metrics
-from CORE.defect_analyzer import analyze_defects, prepare_defect_analysis_data, calculate_sla_metrics, get_defect_trends
+from CORE.defect_analyzer import analyze_defects, prepare_defect_analysis_data, prepare_defect_count_maps, calculate_sla_metrics, get_defect_trends
 from CORE.test_summary_prepare import prepare_test_summary_data, determine_risk_level, generate_risk_recommendation
 from CORE.defect_trend_prepare import prepare_defect_trend_analysis_data
 from CORE.test_trend_prepare import prepare_test_trend_analysis_data
@@ -24,6 +25,15 @@ from CORE.recent_defects_prepare import prepare_recent_defects_data
 from INFRASTRUCTURE.test_data_loader import TestDataLoader
 from INFRASTRUCTURE.defect_data_loader import DefectDataLoader
 from INFRASTRUCTURE.html_renderer import HTMLRenderer
+from INFRASTRUCTURE.dataset_cache import dataset_cache
+from INFRASTRUCTURE.defect_table import DefectTable, DefectRows
+from INFRASTRUCTURE.defect_snapshot import DefectSnapshot
+from INFRASTRUCTURE.section_cache import SectionCache
+from INFRASTRUCTURE.template_precompiler import precompile_templates
+from INFRASTRUCTURE.asset_bundler import BUNDLE_MODES, vendor_assets
+from INFRASTRUCTURE.tailwind_builder import build_tailwind_css
+from INFRASTRUCTURE.batch_generator import generate_reports
+from INFRASTRUCTURE import config
 
 # Import utilities
 from UTILS.utils import get_logger, setup_logging
@@ -38,7 +48,7 @@ class QAReportLibrary2:
     """
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
     
-    def __init__(self):
+    def __init__(self, section_cache_dir: str = None):
         self.data_cache = {}
         self.defect_cache = {}
         self.template_cache = {}
@@ -70,7 +80,12 @@ class QAReportLibrary2:
         self.defects_file = None 
         self.output_dir = None
         self.test_data = None
-        self.defects_data = []
+        self.defect_table = None
+        
+        # cache ของ section บนดิสก์ (ใช้ข้ามการรัน) เปิดใช้เมื่อระบุ directory
+        self.section_cache = SectionCache(section_cache_dir or config.section_cache_dir)
+        self._test_data_file = None
+        self._defects_data_file = None
 
     def setup_logging(self, log_level: str = "INFO", log_to_file: bool = True) -> None:
         log_dir = os.path.join(os.path.dirname(self.library_path), "LOG")
@@ -128,8 +143,8 @@ class QAReportLibrary2:
         
         # 6. โหลดข้อมูล Test
         try:
-            with open(data_file, 'r', encoding='utf-8') as f:
-                self.test_data = json.load(f)
+            self.test_data = dataset_cache.read_json(data_file)
+            self._test_data_file = data_file
             logger.info("Test data loaded successfully")
         except Exception as e:
             logger.error(f"[ERROR] Failed to load test data: {str(e)}")
@@ -138,22 +153,13 @@ class QAReportLibrary2:
         
         # 7. โหลดข้อมูล Defect (ถ้ามี)
         if defects_file:
-            try:
-                with open(defects_file, 'r', encoding='utf-8') as f:
-                    defects_content = json.load(f)
-                    
-                # ตรวจสอบรูปแบบข้อมูล defects
-                if isinstance(defects_content, dict) and "defects" in defects_content:
-                    self.defects_data = defects_content["defects"]
-                elif isinstance(defects_content, list):
-                    self.defects_data = defects_content
-                else:
-                    self.defects_data = []
-                    
-                logger.info(f"Defects data loaded successfully. Total: {len(self.defects_data)} defects")
-            except Exception as e:
-                logger.error(f"[ERROR] Failed to load defects data: {str(e)}")
-                self.defects_data = []
+            # เก็บเฉพาะ DefectTable (ไม่เก็บ list ของ dict ดิบ) และใช้ร่วมกันทุก keyword
+            self.defect_table = self._load_defect_table(defects_file)
+            if self.defect_table is None:
+                logger.error(f"[ERROR] Failed to load defects data: {defects_file}")
+            else:
+                self._defects_data_file = defects_file
+                logger.info(f"Defects data loaded successfully. Total: {len(self.defect_table)} defects")
         
         # 8. ตั้งค่าข้อมูลสำหรับ report
         self.report_data = {
@@ -194,8 +200,8 @@ class QAReportLibrary2:
         
         if not self.test_data:
             try:
-                with open(data_file, 'r', encoding='utf-8') as f:
-                    self.test_data = json.load(f)
+                self.test_data = dataset_cache.read_json(data_file)
+                self._test_data_file = data_file
                 logger.info(f"Test data loaded successfully from: {data_file}")
             except Exception as e:
                 logger.error(f"Failed to load test data: {str(e)}")
@@ -203,7 +209,12 @@ class QAReportLibrary2:
         
         try:
             # เก็บข้อมูลใน self.report_data_test_summary แทนที่ self.report_data
-            self.report_data_test_summary = prepare_test_summary_data(self.test_data, data_file)
+            # จำนวนวันของ sprint และระดับความเสี่ยงคำนวณจากวันที่ปัจจุบัน จึงใช้วันที่เป็นส่วนหนึ่งของ key
+            self.report_data_test_summary = self.section_cache.get_or_compute(
+                "test_summary", [self._test_data_file],
+                lambda: prepare_test_summary_data(self.test_data, data_file),
+                params=(datetime.now().strftime("%Y-%m-%d"),)
+            )
             
             # อัพเดทข้อมูลสำหรับ report โดยรวม (ยังคงความเข้ากันได้กับโค้ดเดิม)
             self.report_data.update(self.report_data_test_summary)
@@ -252,28 +263,24 @@ class QAReportLibrary2:
             return {}
         
         # โหลดข้อมูลถ้ายังไม่มี
-        if not self.defects_data:
-            try:
-                with open(defects_file, 'r', encoding='utf-8') as f:
-                    defects_content = json.load(f)
-                    
-                # ตรวจสอบรูปแบบข้อมูล defects
-                if isinstance(defects_content, dict) and "defects" in defects_content:
-                    self.defects_data = defects_content["defects"]
-                elif isinstance(defects_content, list):
-                    self.defects_data = defects_content
-                else:
-                    self.defects_data = []
-                    
-                logger.info(f"Defects data loaded successfully from: {defects_file} ({len(self.defects_data)} defects)")
-            except Exception as e:
-                logger.error(f"Failed to load defects data: {str(e)}")
+        if not self.defect_table:
+            defect_table = self._load_defect_table(defects_file)
+            if defect_table is None:
+                logger.error(f"Failed to load defects data: {defects_file}")
                 return {}
+            self.defect_table = defect_table
+            self._defects_data_file = defects_file
+            logger.info(f"Defects data loaded successfully from: {defects_file} ({len(self.defect_table)} defects)")
         
         # เตรียมข้อมูล Defect Trend
         try:
             # เก็บข้อมูลในตัวแปรเฉพาะ
-            self.report_data_defect_trend = prepare_defect_trend_analysis_data(self.defects_data)
+            # อายุของ defect คำนวณจากวันที่ปัจจุบัน จึงใช้วันที่เป็นส่วนหนึ่งของ key
+            self.report_data_defect_trend = self.section_cache.get_or_compute(
+                "defect_trend", [self._defects_data_file],
+                lambda: prepare_defect_trend_analysis_data(self._get_defect_table(), chart_delta=config.chart_delta_encoding),
+                params=(datetime.now().strftime("%Y-%m-%d"), config.chart_delta_encoding)
+            )
             
             # บันทึกข้อมูลลงใน report_data (ยังคงความเข้ากันได้กับโค้ดเดิม)
             self.report_data.update(self.report_data_defect_trend)
@@ -307,15 +314,22 @@ class QAReportLibrary2:
         if not self.test_data or test_data_path != self.data_file:
             self.test_data = self.test_data_loader.load(test_data_path)
             self.data_file = test_data_path
+            self._test_data_file = test_data_path
             logger.info(f"Test data loaded successfully from: {test_data_path}")
             
         defects_data = None
         if defect_data_path:
-            defects_data = self.defect_data_loader.load(defect_data_path)
+            # ตารางจาก dataset cache: สถิติรวมถูกสร้างครั้งเดียวต่อเวอร์ชันของไฟล์
+            defects_data = self._load_defect_table(defect_data_path)
             logger.info(f"Defect data loaded successfully for Test Trend Analysis")
 
         try:
-            self.report_data_test_trend = prepare_test_trend_analysis_data(self.test_data, defects_data)
+            input_files = [self._test_data_file] + ([defect_data_path] if defect_data_path else [])
+            self.report_data_test_trend = self.section_cache.get_or_compute(
+                "test_trend", input_files,
+                lambda: prepare_test_trend_analysis_data(self.test_data, defects_data, chart_delta=config.chart_delta_encoding),
+                params=(config.chart_delta_encoding,)
+            )
 
             self.report_data.update(self.report_data_test_trend)
             
@@ -352,7 +366,10 @@ class QAReportLibrary2:
                     return {}
                     
             # เรียกใช้ฟังก์ชันจาก CORE/module_testing_prepare.py
-            module_status_data = prepare_module_testing_status_data(self.test_data)
+            module_status_data = self.section_cache.get_or_compute(
+                "module_testing_status", [self._test_data_file],
+                lambda: prepare_module_testing_status_data(self.test_data)
+            )
             
             # อัพเดท report_data
             self.report_data.update(module_status_data)
@@ -383,13 +400,16 @@ class QAReportLibrary2:
         | *`Tassana Khrueawan`* |
         """
         try:
-            if not self.defects_data:
+            if not self.defect_table:
                  logger.warning("⚠️ Defects data not loaded. Calling Prepare Defect Trend Analysis Data first.")
                  trend_result = self.prepare_defect_trend_analysis_data(defects_file)
-                 # ไม่จำเป็นต้องเช็คผลลัพธ์ เพราะ prepare_defect_trend_analysis_data จะสร้าง self.defects_data = [] ถ้าโหลดไม่ได้
+                 # ไม่จำเป็นต้องเช็คผลลัพธ์ เพราะ _get_defect_table คืนตารางว่างถ้าโหลดไม่ได้
             
             # เรียกใช้ฟังก์ชันจาก CORE/defect_distribution_prepare.py
-            defect_distribution_data = prepare_defect_distribution_data(self.defects_data)
+            defect_distribution_data = self.section_cache.get_or_compute(
+                "defect_distribution", [self._defects_data_file],
+                lambda: prepare_defect_distribution_data(self._get_defect_table())
+            )
             
             # อัพเดท report_data
             self.report_data.update(defect_distribution_data)
@@ -420,12 +440,15 @@ class QAReportLibrary2:
         | *`Tassana Khrueawan`* |
         """
         try:
-            if not self.defects_data:
+            if not self.defect_table:
                 logger.warning("⚠️ Defects data not loaded. Calling Prepare Defect Trend Analysis Data first.")
                 self.prepare_defect_trend_analysis_data(defects_file)
 
             # เรียกใช้ฟังก์ชันจาก CORE/defect_resolution_prepare.py
-            resolution_time_data = prepare_defect_resolution_time_data(self.defects_data)
+            resolution_time_data = self.section_cache.get_or_compute(
+                "defect_resolution_time", [self._defects_data_file],
+                lambda: prepare_defect_resolution_time_data(self._get_defect_table())
+            )
             
             # อัพเดท report_data
             self.report_data.update(resolution_time_data)
@@ -456,13 +479,17 @@ class QAReportLibrary2:
         | *`Tassana Khrueawan`* |
         """
         try:
-            if not self.defects_data:
+            if not self.defect_table:
                 logger.warning("⚠️ Defects data not loaded. Calling Prepare Defect Trend Analysis Data first.")
                 self.prepare_defect_trend_analysis_data(defects_file)
 
-            # เรียกใช้ฟังก์ชันจาก CORE/recent_defects_prepare.py ใช้ limit = len(self.defects_data) เพื่อโชว์ทั้งหมด
-            limit = len(self.defects_data) if self.defects_data else 0
-            recent_defects_data = prepare_recent_defects_data(self.defects_data, limit=limit)
+            # เรียกใช้ฟังก์ชันจาก CORE/recent_defects_prepare.py ใช้ limit = จำนวน defect ทั้งหมดเพื่อโชว์ทั้งหมด
+            limit = len(self.defect_table) if self.defect_table else 0
+            recent_defects_data = self.section_cache.get_or_compute(
+                "recent_defects", [self._defects_data_file],
+                lambda: prepare_recent_defects_data(self._get_defect_table(), limit=limit),
+                params=(limit,)
+            )
             
             # อัพเดท report_data
             self.report_data.update(recent_defects_data)
@@ -538,6 +565,38 @@ class QAReportLibrary2:
 
         return self.report_data
 
+    def _load_defect_table(self, defects_file: str) -> Optional[DefectTable]:
+        """
+        โหลด DefectTable ผ่าน DefectDataLoader.load_table (None ถ้าโหลดไม่ได้)
+        เมื่อตั้ง config.defect_snapshot_file สถิติรวมของตารางที่ทุก defect prepare ใช้ร่วมกัน
+        จะถูกปรับจาก snapshot ด้วย delta ของ export นี้แทนการนับใหม่ทั้งหมด
+        """
+        table = self.defect_data_loader.load_table(defects_file)
+        if table is not None and config.defect_snapshot_file:
+            DefectSnapshot(config.defect_snapshot_file).attach(table)
+        return table
+
+    def _get_defect_table(self) -> DefectTable:
+        """
+        คืน DefectTable ที่โหลดไว้ผ่าน DefectDataLoader.load_table (ตารางว่างถ้ายังไม่ได้โหลดหรือโหลดไม่ได้)
+        """
+        return self.defect_table if self.defect_table is not None else DefectTable()
+
+    def _defect_template_data(self) -> dict:
+        """
+        ข้อมูล defect ที่ template ใช้ร่วมกันหลาย section (รายการ defect และ count map ตาม status/severity/module/page)
+        สร้างจาก DefectTable และสถิติรวม (DefectStatistics) ชุดเดียวกับที่ defect prepare ใช้ เหมือน ReportService._process_defects_data
+        """
+        if self.defect_table is None:
+            return {}
+        # รายการ defect เป็น view แบบ lazy ที่มีเฉพาะ field ที่ template ใช้
+        data = {"DEFECT_ROWS": DefectRows(self.defect_table, DEFECT_ROW_FIELDS)}
+        if config.defect_table_mode in ("inline", "sidecar"):
+            # ตารางรายการ defect ถูกสร้างใน browser จากข้อมูลแบบ column แทนการ render ทุกแถวเป็น HTML
+            data["DEFECT_TABLE_DATA"] = self.defect_table.to_columns(DEFECT_ROW_FIELDS)
+        data.update(prepare_defect_count_maps(self.defect_table))
+        return data
+
     def _generate_with_html_renderer(self, output_file: str) -> str:
         logger = get_logger("QAReportLibrary.HTMLRenderer")
         
@@ -545,37 +604,29 @@ class QAReportLibrary2:
         template_dir = os.path.dirname(self.template_name)
         template_file = os.path.basename(self.template_name)
         
-        # Setup HTML Renderer
-        self.html_renderer._setup_environment(template_dir)
-        
-        # เตรียมข้อมูลทั้งหมดสำหรับเทมเพลต
-        template_data = self.report_data.copy()
+        # เตรียมข้อมูลทั้งหมดสำหรับเทมเพลต: ซ้อนข้อมูลเฉพาะส่วนไว้บน report_data ด้วย ChainMap
+        # (ไม่คัดลอกหรือ merge dict; ค่าที่ตั้งเพิ่มด้านล่างถูกเขียนลง dict แรกเท่านั้น ไม่แก้ report_data)
+        section_data = [
+            ("test_summary.html", self.report_data_test_summary),
+            ("test_trend_analysis.html", self.report_data_test_trend),
+            ("defect_distribution.html", self.report_data_defect_distribution),
+            ("defect_resolution_time_analysis.html", self.report_data_resolution_time),
+            ("defect_recent_defects.html", self.report_data_recent_defects),
+            ("module_testing_status.html", self.report_data_module_status),
+        ]
+        layers = []
+        for template_name, data in section_data:
+            if data:
+                logger.info(f"ใช้ข้อมูลเฉพาะสำหรับ {template_name} ({len(data)} keys)")
+                # section ที่อยู่ท้ายรายการมีลำดับความสำคัญสูงกว่า (เหมือน dict.update ตามลำดับ)
+                layers.insert(0, data)
+        template_data = ChainMap({}, *layers, self._defect_template_data(), self.report_data)
         
         # แสดงข้อมูลสำคัญก่อนการ render
         logger.info(f"🔍 ตรวจสอบข้อมูลก่อนการ render:")
         logger.info(f"  TOTAL_TEST_CASES: {template_data.get('TOTAL_TEST_CASES')}")
         logger.info(f"  PASSED_TEST_CASES: {template_data.get('PASSED_TEST_CASES')}")
         
-        # เพิ่มข้อมูลเฉพาะส่วนเข้าไปใน template_data เพื่อให้แน่ใจว่ามีข้อมูลล่าสุด
-        if self.report_data_test_summary:
-            logger.info(f"ใช้ข้อมูลเฉพาะสำหรับ test_summary.html ({len(self.report_data_test_summary)} keys)")
-            template_data.update(self.report_data_test_summary)
-        if self.report_data_test_trend:
-            logger.info(f"ใช้ข้อมูลเฉพาะสำหรับ test_trend_analysis.html ({len(self.report_data_test_trend)} keys)")
-            template_data.update(self.report_data_test_trend)
-        if self.report_data_defect_distribution:
-            logger.info(f"ใช้ข้อมูลเฉพาะสำหรับ defect_distribution.html ({len(self.report_data_defect_distribution)} keys)")
-            template_data.update(self.report_data_defect_distribution)
-        if self.report_data_resolution_time:
-            logger.info(f"ใช้ข้อมูลเฉพาะสำหรับ defect_resolution_time_analysis.html ({len(self.report_data_resolution_time)} keys)")
-            template_data.update(self.report_data_resolution_time)
-        if self.report_data_recent_defects:
-            logger.info(f"ใช้ข้อมูลเฉพาะสำหรับ defect_recent_defects.html ({len(self.report_data_recent_defects)} keys)")
-            template_data.update(self.report_data_recent_defects)
-        if self.report_data_module_status:
-            logger.info(f"ใช้ข้อมูลเฉพาะสำหรับ module_testing_status.html ({len(self.report_data_module_status)} keys)")
-            template_data.update(self.report_data_module_status)
-        
         # ตรวจสอบและเตรียมข้อมูล TREND_ANALYSIS ที่จำเป็น
         if 'TREND_ANALYSIS' not in template_data:
             logger.warn("⚠️ ไม่พบข้อมูล TREND_ANALYSIS ในรายงาน กำลังใช้ข้อมูลจาก test_data")
@@ -588,7 +639,7 @@ class QAReportLibrary2:
                 logger.info("🔍 กำลังลองเรียก prepare_test_trend_analysis_data อีกครั้งเพื่อดึงข้อมูล TREND_ANALYSIS")
                 try:
                     from CORE.test_trend_prepare import prepare_test_trend_analysis_data
-                    trend_data = prepare_test_trend_analysis_data(self.test_data or {})
+                    trend_data = prepare_test_trend_analysis_data(self.test_data or {}, chart_delta=config.chart_delta_encoding)
                     if trend_data and 'TREND_ANALYSIS' in trend_data:
                         template_data.update(trend_data)
                         logger.info("✅ เตรียมข้อมูล TREND_ANALYSIS เรียบร้อย")
@@ -613,12 +664,8 @@ class QAReportLibrary2:
         logger.info(f"🔍 ข้อมูลหลังการอัพเดทก่อนการ render:")
         logger.info(f"  TOTAL_TEST_CASES: {template_data.get('TOTAL_TEST_CASES')}")
         
-        # Render HTML
-        html_content = self.html_renderer.template_env.get_template(template_file).render(**template_data)
-        
-        # Save output
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Render HTML แบบ streaming ลงไฟล์โดยตรง (section ถูก render แบบขนานเมื่อตั้ง config.render_workers)
+        output_file = self.html_renderer.render_report(template_dir, template_file, template_data, output_file)
         
         logger.info(f"สร้างรายงานเสร็จสมบูรณ์: {output_file}")
         return output_file
@@ -720,19 +767,145 @@ class QAReportLibrary2:
             
             # ล้างข้อมูลอื่นๆ
             self.test_data = None
-            self.defects_data = []
+            self.defect_table = None
             
             # ล้าง cache ของ UTILS
             clear_cache()
             
+            # ล้างข้อมูลไฟล์ที่ parse ไว้แล้ว
+            dataset_cache.invalidate()
+            
             # ล้างตัวแปรอื่นๆ ที่ต้องการรีเซ็ต
             self.data_file = None
             self.defects_file = None
+            self._test_data_file = None
+            self._defects_data_file = None
             
             logger.info("Cache ถูกล้างเรียบร้อยแล้ว")
         except Exception as e:
             logger.error(f"เกิดข้อผิดพลาดในการล้าง Cache: {str(e)}")
     
+    @keyword("Precompile QA Report Templates")
+    def precompile_qa_report_templates(self, template_dir: str, target_dir: str) -> int:
+        """
+        ***| Description |***
+        - Compile template ทั้งหมด (base.html, partials, assets/css) ล่วงหน้าเป็น Python module
+        - ตั้งค่า ``config.precompiled_template_dir`` ให้ชี้ไปที่ target_dir เพื่อให้การสร้างรายงานโหลด template จาก module โดยไม่ต้อง parse
+
+        ***| Example |***
+        | ${count}= | *`Precompile QA Report Templates`* | template_dir=TEMPLATES | target_dir=build/templates |
+
+        ***| Parameters |***
+        - **`template_dir`** (`str`): Directory ที่เก็บ template
+        - **`target_dir`** (`str`): Directory ที่จะเก็บ template ที่ compile แล้ว
+
+        ***| Returns |***
+        - **`int`**: จำนวน template ที่ compile
+        """
+        logger = get_logger("QAReportLibrary.Templates")
+        count = precompile_templates(template_dir, target_dir)
+        config.precompiled_template_dir = os.path.abspath(target_dir)
+        logger.info(f"Precompiled {count} templates: {config.precompiled_template_dir}")
+        return count
+    
+    @keyword("Build QA Report Tailwind CSS")
+    def build_qa_report_tailwind_css(self, template_dir: str, output_file: str) -> str:
+        """
+        ***| Description |***
+        - สร้าง Tailwind CSS (minify) ที่มีเฉพาะ class ที่ template, assets/js และโค้ดใช้จริง ด้วย Tailwind CLI
+        - ตั้งค่า ``config.tailwind_css_file`` เพื่อให้รายงานใส่ CSS นี้แทนการโหลด Tailwind CDN script ที่ compile ใน browser
+
+        ***| Example |***
+        | ${css}= | *`Build QA Report Tailwind CSS`* | template_dir=TEMPLATES | output_file=build/tailwind.css |
+
+        ***| Parameters |***
+        - **`template_dir`** (`str`): Directory ที่เก็บ template
+        - **`output_file`** (`str`): ไฟล์ CSS ที่จะสร้าง
+
+        ***| Returns |***
+        - **`str`**: Path ของไฟล์ CSS
+        """
+        logger = get_logger("QAReportLibrary.Templates")
+        build_tailwind_css(template_dir, output_file)
+        config.tailwind_css_file = os.path.abspath(output_file)
+        logger.info(f"Built Tailwind CSS: {config.tailwind_css_file}")
+        return config.tailwind_css_file
+    
+    @keyword("Vendor QA Report Assets")
+    def vendor_qa_report_assets(self, vendor_dir: str, asset_mode: str = "inline") -> int:
+        """
+        ***| Description |***
+        - ดาวน์โหลด asset จาก CDN ที่ template ใช้ (Tailwind, Alpine, Chart.js, icon font, font) มาเก็บใน vendor_dir (ต้องต่อ internet)
+        - ตั้งค่า ``config.asset_vendor_dir`` และ ``config.asset_mode`` เพื่อให้รายงานที่สร้างหลังจากนี้เปิดได้โดยไม่ต้องต่อ internet
+        - ``inline`` ฝัง asset ลงในไฟล์รายงาน, ``shared`` เก็บ asset ชุดเดียวใน assets/ ข้างรายงานและใช้ร่วมกันทุกไฟล์
+
+        ***| Example |***
+        | ${count}= | *`Vendor QA Report Assets`* | vendor_dir=build/vendor | asset_mode=shared |
+
+        ***| Parameters |***
+        - **`vendor_dir`** (`str`): Directory ที่จะเก็บ asset
+        - **`asset_mode`** (`str`): ``inline`` หรือ ``shared``
+
+        ***| Returns |***
+        - **`int`**: จำนวนไฟล์ที่ดาวน์โหลด
+        """
+        logger = get_logger("QAReportLibrary.Assets")
+        if asset_mode not in BUNDLE_MODES:
+            raise ValueError(f"asset_mode must be one of {BUNDLE_MODES}: {asset_mode}")
+        count = vendor_assets(vendor_dir)
+        config.asset_vendor_dir = os.path.abspath(vendor_dir)
+        config.asset_mode = asset_mode
+        logger.info(f"Vendored {count} assets ({asset_mode}): {config.asset_vendor_dir}")
+        return count
+    
+    @keyword("Generate QA Reports")
+    def generate_qa_reports(self, manifest, template_path: str = None, workers: int = None) -> list:
+        """
+        ***| Description |***
+        - สร้างรายงาน QA ของหลายโปรเจกต์ในครั้งเดียวจาก manifest ของงาน (test data, defect data, output directory)
+        - งานถูกรันขนานใน process pool โดย template ถูก precompile ครั้งเดียวและใช้ร่วมกันทุก worker
+        - งานที่ล้มเหลวไม่กระทบงานอื่น (ดูผลของแต่ละงานจาก ``status`` และ ``error``)
+        - ไม่เปลี่ยนข้อมูลที่ตั้งไว้ด้วย Setup QA Report ของ instance นี้
+
+        ***| Example |***
+        | ${results}= | *`Generate QA Reports`* | manifest=projects.json | template_path=TEMPLATES/base.html | workers=8 |
+
+        ***| Parameters |***
+        - **`manifest`** (`str` หรือ `list`): Path ไปยังไฟล์ JSON ของงาน หรือ list ของงาน
+          (object ที่มี ``data_file``, ``defects_file``, ``output_dir``, ``name``, ``template`` หรือ ``[data_file, defects_file, output_dir]``)
+        - **`template_path`** (`str`, optional): Template ของงานที่ไม่ได้ระบุ (ค่าเริ่มต้น TEMPLATES/base.html)
+        - **`workers`** (`int`, optional): จำนวน worker process (ค่าเริ่มต้น ``config.batch_workers``, 0 = จำนวน CPU)
+
+        ***| Returns |***
+        - **`list`**: ผลของแต่ละงานตามลำดับใน manifest (name, status, report, error, seconds)
+        """
+        logger = get_logger("QAReportLibrary.Batch")
+        results = generate_reports(manifest, template_path, int(workers) if workers is not None else None)
+        failed = [result["name"] for result in results if result["status"] != "success"]
+        if failed:
+            logger.warning(f"Failed reports: {', '.join(failed)}")
+        return results
+    
+    @keyword("Clear QA Report Section Cache")
+    def clear_qa_report_section_cache(self) -> int:
+        """
+        ***| Description |***
+        - ลบผลลัพธ์ของ section ที่เก็บไว้บนดิสก์ (section cache) ทั้งหมด
+        - ปกติไม่จำเป็น เพราะ key ของ cache เปลี่ยนเองเมื่อไฟล์ข้อมูลหรือโค้ดเปลี่ยน
+
+        ***| Example |***
+        | ${removed}= | *`Clear QA Report Section Cache`* |
+
+        ***| Returns |***
+        - **`int`**: จำนวนไฟล์ที่ถูกลบ
+        """
+        logger = get_logger("QAReportLibrary.Cache")
+        try:
+            return self.section_cache.clear()
+        except Exception as e:
+            logger.error(f"เกิดข้อผิดพลาดในการล้าง Section Cache: {str(e)}")
+            return 0
+    
     @keyword("Load Test Data")
     def Load_Test_Data(self):
         return self.report_data
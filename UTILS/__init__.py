@@ -4,20 +4,42 @@ Contains utility modules for QAreportLibrary
 
 from UTILS.utils import (
     get_logger,
-    cache,
     clear_cache,
     format_datetime_thai,
     calculate_sprint_days,
+    parse_date,
+    DEFAULT_DATE_FORMATS,
     setup_logging,
+    to_script_json,
+    chart_payload,
+    JSON_BACKENDS,
+    JSONDecodeError,
+    json_backend,
+    json_loads,
+    json_dumps,
+    json_load_file,
+    json_dump_file,
+    json_decode_records,
     TemplateUtils
 )
 
 __all__ = [
     "get_logger",
-    "cache",
     "clear_cache",
     "format_datetime_thai",
     "calculate_sprint_days",
+    "parse_date",
+    "DEFAULT_DATE_FORMATS",
     "setup_logging",
+    "to_script_json",
+    "chart_payload",
+    "JSON_BACKENDS",
+    "JSONDecodeError",
+    "json_backend",
+    "json_loads",
+    "json_dumps",
+    "json_load_file",
+    "json_dump_file",
+    "json_decode_records",
     "TemplateUtils"
 ] 
\ No newline at end of file
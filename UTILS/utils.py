@@ -3,10 +3,13 @@ import pytz
 from datetime import datetime, timedelta
 import os
 import logging
-from typing import Dict, Any, Optional, List, Union, Tuple, Callable
+from typing import Dict, Any, Optional, List, Sequence, Union, Tuple, Callable
 import functools
 import time
+import importlib
 import json
+import re
+from markupsafe import Markup
 from robot.api import logger 
 import logging.handlers
 
@@ -16,6 +19,18 @@ DEFAULT_LOG_LEVEL = "INFO"
 DEFAULT_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 DEFAULT_ENABLE_CACHING = True
 DEFAULT_CACHE_DURATION = 300
+DEFAULT_DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y")
+DATE_PARSE_CACHE_SIZE = 65536
+
+# อักขระที่ต้อง escape เมื่อฝัง JSON ไว้ใน <script> ของหน้า HTML (แบบเดียวกับ filter tojson ของ Jinja)
+SCRIPT_JSON_ESCAPES = {ord('<'): '\\u003c', ord('>'): '\\u003e', ord('&'): '\\u0026', ord("'"): '\\u0027'}
+
+# backend ของ JSON ที่ลองตามลำดับเมื่อ ReportConfig.json_backend = "auto" (json = stdlib ใช้ได้เสมอ)
+JSON_BACKENDS = ("orjson", "msgspec", "ujson", "json")
+DEFAULT_JSON_BACKEND = "auto"
+
+# error ของการ decode ทุก backend (error ของ backend อื่นถูกแปลงเป็น type นี้)
+JSONDecodeError = json.JSONDecodeError
 
 # เพิ่มตัวแปรเพื่อติดตามว่าได้ตั้งค่า logging ไปแล้วหรือยัง
 _logging_initialized = False
@@ -135,7 +150,7 @@ def get_logger(name: str = None) -> logging.Logger:
                 msg = msg % args
             except Exception:
                 msg = f"{msg} (error formatting message with args: {args})"
-        logger.error(msg)
+        logger.original_error(msg, **kwargs)
     
     # แทนที่ฟังก์ชัน error ด้วย safe_error
     logger.original_error = logger.error
@@ -147,46 +162,36 @@ def get_logger(name: str = None) -> logging.Logger:
     return logger
 
 
-_cache: Dict[str, Tuple[Any, float]] = {}
-_cache_times: Dict[str, float] = {}
+@functools.lru_cache(maxsize=DATE_PARSE_CACHE_SIZE)
+def _parse_date_cached(date_str: str, formats: Tuple[str, ...]) -> Optional[datetime]:
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return None
 
-def cache(duration: int = DEFAULT_CACHE_DURATION):
+def parse_date(date_str: Any, formats: Tuple[str, ...] = DEFAULT_DATE_FORMATS) -> Optional[datetime]:
     """
-    Caching decorator for functions
+    แปลงข้อความวันที่โดยลองทีละรูปแบบตามลำดับใน formats
+    ผลลัพธ์ถูก memoize ต่อ (ข้อความ, formats) ข้อความวันที่เดิมจึงถูก strptime เพียงครั้งเดียว
     
     Args:
-        duration (int): Cache duration in seconds
-    
+        date_str (Any): ข้อความวันที่
+        formats (Tuple[str, ...]): รูปแบบวันที่ที่รองรับ (ลองตามลำดับ)
+        
     Returns:
-        Callable: Decorated function with caching
-    """
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            # Create cache key
-            key = f"{func.__name__}_{str(args)}_{str(kwargs)}"
-            now = time.time()
-            
-            # Check if cached result exists and is valid
-            if key in _cache and (now - _cache_times.get(key, 0)) < duration:
-                return _cache[key]
-            
-            # Execute function and cache result
-            result = func(*args, **kwargs)
-            _cache[key] = result
-            _cache_times[key] = now
-            
-            return result
-        return wrapper
-    return decorator
+        Optional[datetime]: วันที่ที่แปลงได้ หรือ None ถ้าว่างหรือไม่ตรงรูปแบบใดเลย
+    """
+    if not date_str:
+        return None
+    return _parse_date_cached(date_str, formats)
 
 def clear_cache() -> None:
     """
     Clear all cached data.
     """
-    global _cache
-    _cache = {}
-    _cache_times = {}
+    _parse_date_cached.cache_clear()
     log.info("Cache cleared")
 
 
@@ -290,6 +295,243 @@ def calculate_sprint_days(start_date_str: str, end_date_str: str, now: Optional[
         return 0, 0, 0, 0.0
 
 
+_json_modules: Dict[str, Any] = {}
+_json_unavailable_warned = set()
+_record_types: Dict[Tuple[Tuple[str, ...], Optional[str]], Any] = {}
+_JSON_FIRST_TOKEN = re.compile(rb"[ \t\r\n]*(\S)")
+
+
+def _json_module(name: str) -> Any:
+    """
+    Return the module of a JSON backend (None if it is not installed)
+    """
+    if name not in _json_modules:
+        try:
+            _json_modules[name] = importlib.import_module("msgspec.json" if name == "msgspec" else name)
+        except ImportError:
+            _json_modules[name] = None
+    return _json_modules[name]
+
+
+def json_backend() -> str:
+    """
+    Return the JSON backend used by ``json_loads`` / ``json_dumps``
+
+    อ่าน ReportConfig.json_backend (import ตอนเรียกใช้ เพราะ INFRASTRUCTURE import UTILS)
+    ถ้า backend ที่ระบุไม่ได้ติดตั้งไว้ จะเลือกแบบ "auto" (ตัวแรกของ JSON_BACKENDS ที่ติดตั้งไว้)
+
+    Returns:
+        str: "orjson", "msgspec", "ujson" or "json"
+    """
+    try:
+        from INFRASTRUCTURE import config
+        requested = config.json_backend
+    except Exception:
+        requested = DEFAULT_JSON_BACKEND
+    if requested != DEFAULT_JSON_BACKEND:
+        if requested in JSON_BACKENDS and _json_module(requested) is not None:
+            return requested
+        if requested not in _json_unavailable_warned:
+            _json_unavailable_warned.add(requested)
+            log.warning(f"JSON backend '{requested}' is not available, using the fastest installed backend")
+    return next(name for name in JSON_BACKENDS if _json_module(name) is not None)
+
+
+def json_loads(data: Union[str, bytes, bytearray]) -> Any:
+    """
+    Parse a JSON document with the configured backend
+
+    เอกสารที่ backend เร็วปฏิเสธ (เช่น NaN หรือจำนวนเต็มเกิน 64 bit ที่ stdlib ยอมรับ) จะถูก parse ซ้ำด้วย stdlib
+    ผลลัพธ์และ error จึงเหมือน ``json.loads`` ทุกประการ
+
+    Args:
+        data (Union[str, bytes, bytearray]): JSON text (bytes are decoded as UTF-8/16/32)
+
+    Returns:
+        Any: Parsed document
+
+    Raises:
+        JSONDecodeError: If the document is not valid JSON
+    """
+    backend = json_backend()
+    if backend != "json":
+        module = _json_module(backend)
+        try:
+            return module.decode(data) if backend == "msgspec" else module.loads(data)
+        except (ValueError, TypeError):
+            pass
+    return json.loads(data)
+
+
+def json_dumps(value: Any, pretty: bool = False) -> str:
+    """
+    Serialize a value as JSON with the configured backend
+
+    ค่าที่ backend เร็ว serialize ไม่ได้ (เช่น key ที่ไม่ใช่ str หรือจำนวนเต็มเกิน 64 bit) จะใช้ stdlib แทน
+
+    Args:
+        value (Any): JSON-serializable value
+        pretty (bool): Indent by 2 spaces and sort the keys (for manifests); otherwise compact
+
+    Returns:
+        str: JSON text (non-ASCII characters are not escaped)
+    """
+    backend = json_backend()
+    module = _json_module(backend)
+    try:
+        if backend == "orjson":
+            option = module.OPT_NON_STR_KEYS | (module.OPT_INDENT_2 | module.OPT_SORT_KEYS if pretty else 0)
+            return module.dumps(value, option=option).decode('utf-8')
+        if backend == "msgspec":
+            if pretty:
+                return module.format(module.encode(value, order="sorted"), indent=2).decode('utf-8')
+            return module.encode(value).decode('utf-8')
+        if backend == "ujson":
+            return module.dumps(value, ensure_ascii=False, escape_forward_slashes=False,
+                                indent=2 if pretty else 0, sort_keys=pretty)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    if pretty:
+        return json.dumps(value, ensure_ascii=False, indent=2, sort_keys=True)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def json_load_file(file_path: str) -> Any:
+    """
+    Read and parse a JSON file with the configured backend
+
+    Args:
+        file_path (str): Path to JSON file
+
+    Returns:
+        Any: Parsed document
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        JSONDecodeError: If the file is not valid JSON
+    """
+    with open(file_path, 'rb') as f:
+        return json_loads(f.read())
+
+
+def json_dump_file(value: Any, file_path: str, pretty: bool = False) -> None:
+    """
+    Write a value to a JSON file with the configured backend
+
+    Args:
+        value (Any): JSON-serializable value
+        file_path (str): Path of the file
+        pretty (bool): Indent by 2 spaces and sort the keys
+    """
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(json_dumps(value, pretty))
+
+
+def _record_type(fields: Tuple[str, ...], key: Optional[str]) -> Any:
+    """
+    Return the msgspec type of an array of records with ``fields`` (wrapped in an object under ``key``)
+    """
+    type_key = (fields, key)
+    if type_key not in _record_types:
+        import msgspec
+        record = msgspec.defstruct("Record", [(name, Any, msgspec.UNSET) for name in fields])
+        records = List[record]
+        if key is not None:
+            records = msgspec.defstruct("Records", [(key, records, msgspec.UNSET)])
+        _record_types[type_key] = records
+    return _record_types[type_key]
+
+
+def json_decode_records(data: bytes, fields: Sequence[str], key: Optional[str] = None) -> Optional[List[Any]]:
+    """
+    Decode an array of records keeping only ``fields`` (schema-typed decode)
+
+    เมื่อติดตั้ง msgspec ไว้ field อื่นของแต่ละ record ถูกข้ามตอน parse โดยไม่สร้าง object ของค่าเหล่านั้นเลย
+    ถ้าไม่มี msgspec เอกสารถูก parse ด้วย ``json_loads`` แล้วเก็บเฉพาะ field ที่ระบุ
+    (record ที่ไม่ใช่ object ถูกเก็บไว้ตามเดิม)
+
+    Args:
+        data (bytes): JSON document
+        fields (Sequence[str]): Fields to keep in each record
+        key (Optional[str]): Key of the array when the document is an object (None = the document is the array)
+
+    Returns:
+        Optional[List[Any]]: Records, or None if the document has another layout
+
+    Raises:
+        JSONDecodeError: If the document is not valid JSON
+    """
+    fields = tuple(fields)
+    match = _JSON_FIRST_TOKEN.match(data)
+    first = match.group(1) if match else b""
+    if first == b"[" or (first == b"{" and key is not None):
+        if _json_module("msgspec") is not None:
+            import msgspec
+            try:
+                decoded = msgspec.json.decode(data, type=_record_type(fields, None if first == b"[" else key))
+            except (msgspec.ValidationError, msgspec.DecodeError):
+                # layout อื่นหรือเอกสารที่ msgspec ไม่รับ: decode เต็มด้านล่าง
+                decoded = None
+            if decoded is not None and first == b"{":
+                decoded = getattr(decoded, key)
+            if decoded is not None and decoded is not msgspec.UNSET:
+                unset = msgspec.UNSET
+                astuple = msgspec.structs.astuple
+                return [{name: value for name, value in zip(fields, astuple(record)) if value is not unset}
+                        for record in decoded]
+
+    document = json_loads(data)
+    if isinstance(document, dict) and key is not None:
+        document = document.get(key)
+    if not isinstance(document, list):
+        return None
+    wanted = frozenset(fields)
+    return [{name: value for name, value in record.items() if name in wanted} if isinstance(record, dict) else record
+            for record in document]
+
+
+def to_script_json(value: Any) -> str:
+    """
+    Serialize a value as compact JSON that is safe inside an HTML ``<script>`` element
+
+    Args:
+        value (Any): JSON-serializable value
+
+    Returns:
+        str: JSON text with ``< > & '`` escaped
+    """
+    return json_dumps(value).translate(SCRIPT_JSON_ESCAPES)
+
+
+def chart_payload(axis: Sequence[Any], series: Dict[str, Sequence[Any]], delta: bool = False) -> Dict[str, Any]:
+    """
+    Build the columnar data of a chart: one shared axis and one array per series
+
+    The result is serialized once into a ``<script type="application/json">``
+    element and read in the browser with ``readChartData`` (head_scripts.html).
+
+    Args:
+        axis (Sequence[Any]): Labels of the x axis (e.g. dates)
+        series (Dict[str, Sequence[Any]]): Series name -> values, one per label
+        delta (bool): Store integer series as differences from the previous value
+            (listed under ``"delta"`` so the browser restores them)
+
+    Returns:
+        Dict[str, Any]: ``{"axis": [...], "series": {name: [...]}, "delta": [names]}``
+    """
+    payload = {"axis": list(axis), "series": {}}
+    delta_series = []
+    for name, values in series.items():
+        values = list(values)
+        if delta and len(values) > 1 and all(type(value) is int for value in values):
+            values = values[:1] + [current - previous for previous, current in zip(values, values[1:])]
+            delta_series.append(name)
+        payload["series"][name] = values
+    if delta_series:
+        payload["delta"] = delta_series
+    return payload
+
+
 class TemplateUtils:
     @staticmethod
     def to_datetime(date_str: str) -> Optional[datetime]:
@@ -341,8 +583,8 @@ class TemplateUtils:
         if not json_str:
             return default or {}
         try:
-            return json.loads(json_str)
-        except (json.JSONDecodeError, TypeError) as e:
+            return json_loads(json_str)
+        except (JSONDecodeError, TypeError) as e:
             log.warning(f"Could not parse JSON string: {json_str[:50]}... Error: {e}")
             return default or {}
     
@@ -364,14 +606,44 @@ class TemplateUtils:
             
         if isinstance(value, str):
             try:
-                result = json.loads(value)
+                result = json_loads(value)
                 if isinstance(result, dict):
                     return result
-            except (json.JSONDecodeError, ValueError):
+            except (JSONDecodeError, ValueError):
                 pass
                 
         return {}
     
+    @staticmethod
+    def script_json(value: Any) -> Markup:
+        """
+        แปลงค่าเป็น JSON แบบกระชับ (ไม่มีช่องว่าง) สำหรับฝังใน ``<script>`` ของหน้า HTML
+        
+        Args:
+            value (Any): ค่าที่แปลงเป็น JSON ได้
+            
+        Returns:
+            Markup: JSON ที่ escape ``< > & '`` แล้ว
+        """
+        return Markup(to_script_json(value))
+    
+    @staticmethod
+    def count_of(counts: Any, *values: Any) -> int:
+        """
+        ดึงจำนวนจาก count map ที่คำนวณไว้ล่วงหน้า (เช่น DEFECT_STATUS_COUNTS) แทนการนับด้วย
+        ``selectattr(...)|list|length`` บน list ทั้งหมดใน template
+        
+        Args:
+            counts (Any): dictionary ค่า -> จำนวน (ถ้าไม่ใช่ dictionary หรือไม่ได้ส่งมาจะได้ 0)
+            *values (Any): ค่าที่ต้องการนับ (หลายค่าจะถูกรวมกัน)
+            
+        Returns:
+            int: ผลรวมจำนวนของทุกค่า
+        """
+        if not isinstance(counts, dict):
+            return 0
+        return sum(counts.get(value, 0) for value in values)
+    
     @staticmethod
     def default_dict(value: Any, default: Dict[str, Any] = None) -> Dict[str, Any]:
         """
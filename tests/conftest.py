@@ -0,0 +1,7 @@
+import os
+import sys
+
+# ให้ import QAReportLibrary2, CORE, INFRASTRUCTURE, UTILS ได้จาก root ของ repository
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
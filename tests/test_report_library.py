@@ -0,0 +1,67 @@
+import json
+import os
+import re
+
+import pytest
+
+from INFRASTRUCTURE import config
+from QAReportLibrary2 import QAReportLibrary2
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_DATA_FILE = os.path.join(ROOT, "DATA", "TEST_SUMERY.json")
+TEMPLATE_FILE = os.path.join(ROOT, "TEMPLATES", "base.html")
+
+DEFECTS = [
+    {"issueId": "QA-1", "module": "BE", "page": "Login", "description": "a", "severity": "High",
+     "status": "Fixed", "reportedDate": "2025-02-01", "closedDate": "2025-02-03"},
+    {"issueId": "QA-2", "module": "BE", "page": "Login", "description": "b", "severity": "Critical",
+     "status": "Fixed", "reportedDate": "2025-02-02", "closedDate": "2025-02-05"},
+    {"issueId": "QA-3", "module": "FE", "page": "Profile", "description": "c", "severity": "Low",
+     "status": "Open", "reportedDate": "2025-02-04", "closedDate": None},
+]
+
+
+def generate_report(tmp_path, template_file=TEMPLATE_FILE):
+    """Render a template through the Robot keyword flow with a small defect export"""
+    defects_file = tmp_path / "defects.json"
+    defects_file.write_text(json.dumps({"defects": DEFECTS}), encoding="utf-8")
+    output_dir = tmp_path / "out"
+
+    library = QAReportLibrary2()
+    library.setup_qa_report(TEST_DATA_FILE, template_file, str(output_dir), str(defects_file))
+    library.prepare_report_data()
+    return library.generate_report(str(output_dir))
+
+
+@pytest.fixture
+def report_html(tmp_path):
+    with open(generate_report(tmp_path), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_generate_report_counts_fixed_defects(report_html):
+    fixed = re.search(r'>(\d+)/(\d+)</div>\s*<div class="text-xs text-gray-400">Fixed Defects', report_html)
+    assert fixed is not None
+    assert int(fixed.group(1)) == 2
+
+
+def test_generate_report_lists_defect_rows(report_html):
+    fixed = re.search(r'>(\d+)/(\d+)</div>\s*<div class="text-xs text-gray-400">Fixed Defects', report_html)
+    assert fixed is not None
+    assert int(fixed.group(2)) == len(DEFECTS)
+
+
+def test_sidecar_skipped_when_layout_has_no_defect_table(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "defect_table_mode", "sidecar")
+    output_file = generate_report(tmp_path)
+    assert not os.path.exists(os.path.splitext(output_file)[0] + ".defects.js")
+
+
+def test_sidecar_written_for_defect_table(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "defect_table_mode", "sidecar")
+    output_file = generate_report(tmp_path, os.path.join(ROOT, "TEMPLATES", "partials", "defect_recent_defects.html"))
+    sidecar_file = os.path.splitext(output_file)[0] + ".defects.js"
+    with open(sidecar_file, encoding="utf-8") as f:
+        assert "QA-3" in f.read()
+    with open(output_file, encoding="utf-8") as f:
+        assert '<script src="%s">' % os.path.basename(sidecar_file) in f.read()
@@ -0,0 +1,33 @@
+import json
+import os
+
+from CORE.metrics_calculator import calculate_defect_metrics
+from INFRASTRUCTURE.vocabulary import get_vocabulary
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFECTS_FILE = os.path.join(ROOT, "DATA", "DEFECT.json")
+
+
+def load_defects():
+    with open(DEFECTS_FILE, encoding="utf-8") as f:
+        return json.load(f)["defects"]
+
+
+def test_every_sample_status_is_open_or_closed():
+    vocabulary = get_vocabulary()
+    for status in {defect["status"] for defect in load_defects()}:
+        assert vocabulary.is_open(status) != vocabulary.is_closed(status), status
+
+
+def test_sample_open_and_closed_add_up_to_total():
+    metrics = calculate_defect_metrics(load_defects())
+    assert metrics["open_defects"] + metrics["closed_defects"] == metrics["total_defects"]
+
+
+def test_defect_trend_counts_match_defect_metrics():
+    from CORE.defect_trend_prepare import prepare_defect_trend_analysis_data
+
+    data = prepare_defect_trend_analysis_data(load_defects())
+    metrics = calculate_defect_metrics(load_defects())
+    assert data["TOTAL_DEFECTS_OPEN"] == metrics["open_defects"]
+    assert data["TOTAL_DEFECTS_CLOSED"] == metrics["closed_defects"]